@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the compiler phases over the stories of tests/e2e which compile:
+`Story.parse`, `Lowering.process`, `Semantics.process` and
+`JSONCompiler.compile`. Reports the median and p95 time of every phase over
+all stories and runs, and the peak memory allocated by every phase.
+
+    python -m benchmarks.corpus [--runs N] [--warmup N] [--filter TEXT]
+                                [--save FILE] [--compare FILE]
+
+With `--compare`, the results are compared with a file written by `--save`
+and the exit code is 1 if a phase got slower than `--threshold`.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from glob import glob
+
+from storyscript.Features import Features
+from storyscript.Story import Story
+from storyscript.Version import get_version
+from storyscript.compiler.json.JSONCompiler import JSONCompiler
+from storyscript.compiler.lowering.Lowering import Lowering
+from storyscript.compiler.semantics.Semantics import Semantics
+
+
+e2e_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                       'tests', 'e2e')
+
+phases = ['parse', 'lower', 'semantics', 'compile']
+
+# the features of tests/e2e, which can be changed with `# FEAT` lines
+default_features = {'globals': True}
+
+
+def story_features(source):
+    """
+    Returns the features of an e2e story.
+    """
+    features = default_features.copy()
+    for line in source.splitlines():
+        if line.startswith('# FEAT') or line.startswith('#FEAT'):
+            for item in line.split(':')[1].split():
+                k, v = item.split('=')
+                features[k] = v.lower() in ('1', 'true', 'yes', 'on')
+    return Features(features)
+
+
+def corpus(text_filter=None):
+    """
+    Returns the (name, source, features) of all e2e stories which compile,
+    i.e. have an expected JSON output.
+    """
+    stories = []
+    paths = glob(os.path.join(e2e_dir, '**', '*.story'), recursive=True)
+    for path in sorted(paths):
+        name = os.path.relpath(path, e2e_dir)
+        if not os.path.isfile(os.path.splitext(path)[0] + '.json'):
+            continue
+        if text_filter is not None and text_filter not in name:
+            continue
+        source = Story.read(path)
+        stories.append((name, source, story_features(source)))
+    return stories
+
+
+def run_phases(source, features, parser=None):
+    """
+    Yields the names of the phases while compiling `source` with them.
+    """
+    story = Story(source, features)
+    yield 'parse'
+    story.parse(parser=parser)
+    yield 'lower'
+    tree = Lowering(parser=story.tree.parser,
+                    features=features).process(story.tree)
+    yield 'semantics'
+    tree = Semantics(features=features).process(tree)
+    yield 'compile'
+    JSONCompiler(story).compile(tree)
+
+
+def time_phases(source, features):
+    """
+    Returns the time of every phase for compiling `source`.
+    """
+    timings = {}
+    phase = None
+    start = time.perf_counter()
+    for next_phase in run_phases(source, features):
+        now = time.perf_counter()
+        if phase is not None:
+            timings[phase] = now - start
+        phase, start = next_phase, now
+    timings[phase] = time.perf_counter() - start
+    return timings
+
+
+def trace_phases(source, features):
+    """
+    Returns the peak memory allocated by every phase for compiling `source`.
+    Memory allocated by a previous phase (e.g. the tree) isn't counted.
+    """
+    peaks = {}
+    phase = None
+    for next_phase in run_phases(source, features):
+        if phase is not None:
+            peaks[phase] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        phase = next_phase
+        tracemalloc.start()
+    peaks[phase] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peaks
+
+
+def percentile(values, p):
+    """
+    Returns the `p`th percentile of `values` (nearest rank).
+    """
+    values = sorted(values)
+    index = max(0, -(-len(values) * p // 100) - 1)
+    return values[int(index)]
+
+
+def measure(stories, runs, warmup):
+    """
+    Returns the median and p95 time (in seconds) and the peak memory
+    (in bytes) of every phase over `stories`.
+    """
+    for i in range(warmup):
+        for name, source, features in stories:
+            time_phases(source, features)
+
+    timings = {phase: [] for phase in phases}
+    totals = []
+    for i in range(runs):
+        for name, source, features in stories:
+            story_timings = time_phases(source, features)
+            for phase in phases:
+                timings[phase].append(story_timings[phase])
+            totals.append(sum(story_timings.values()))
+
+    peaks = {phase: 0 for phase in phases}
+    for name, source, features in stories:
+        for phase, peak in trace_phases(source, features).items():
+            peaks[phase] = max(peaks[phase], peak)
+
+    results = {}
+    for phase in phases:
+        results[phase] = {
+            'median': percentile(timings[phase], 50),
+            'p95': percentile(timings[phase], 95),
+            'peak_memory': peaks[phase],
+        }
+    results['total'] = {
+        'median': percentile(totals, 50),
+        'p95': percentile(totals, 95),
+        'peak_memory': max(peaks.values()),
+    }
+    return results
+
+
+def report(results):
+    print(f'{"phase":>10} {"median":>10} {"p95":>10} {"peak memory":>12}')
+    for phase, result in results.items():
+        print(f'{phase:>10} {result["median"] * 1000:8.3f}ms '
+              f'{result["p95"] * 1000:8.3f}ms '
+              f'{result["peak_memory"] / 1024:10.1f}KB')
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the change of every phase against `baseline`.
+    Returns the phases whose median got slower by more than `threshold`.
+    """
+    regressions = []
+    print(f'{"phase":>10} {"baseline":>10} {"current":>10} {"change":>8}')
+    for phase, result in results.items():
+        if phase not in baseline:
+            continue
+        before = baseline[phase]['median']
+        after = result['median']
+        change = (after - before) / before if before else 0
+        mark = ''
+        if change > threshold:
+            regressions.append(phase)
+            mark = '  regression'
+        print(f'{phase:>10} {before * 1000:8.3f}ms {after * 1000:8.3f}ms '
+              f'{change:+8.1%}{mark}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.corpus',
+        description='Benchmarks the compiler phases over tests/e2e.')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Measured compilations of every story')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='Compilations of every story before measuring')
+    parser.add_argument('--filter', default=None,
+                        help='Only use stories whose path contains this')
+    parser.add_argument('--save', default=None,
+                        help='Write the results to this JSON file')
+    parser.add_argument('--compare', default=None,
+                        help='Compare the results with this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown of a median reported as '
+                             'regression')
+    args = parser.parse_args(argv)
+
+    stories = corpus(args.filter)
+    results = measure(stories, runs=args.runs, warmup=args.warmup)
+    print(f'{len(stories)} stories, {args.runs} runs, '
+          f'storyscript {get_version()}')
+    report(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'version': get_version(),
+                'python': sys.version.split()[0],
+                'filter': args.filter,
+                'stories': len(stories),
+                'runs': args.runs,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
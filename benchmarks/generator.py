@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Generates large synthetic stories which compile, for stress testing the
+compiler.
+
+    python -m benchmarks.generator [--lines N] [--depth N] [--functions N]
+                                   [--inline RATIO] [--templates RATIO]
+"""
+import argparse
+import random
+
+
+class Generator:
+    """
+    Generates a story of `lines` statements.
+    Blocks of `block_size` statements are nested up to `depth` levels deep
+    into if statements. `functions` functions are declared before the
+    statements. The ratios `inline` and `templates` are the share of the
+    statements which call a function in an inline expression or assign a
+    string template.
+    """
+
+    block_size = 5
+
+    def __init__(self, lines=100, depth=0, functions=0, inline=0,
+                 templates=0, seed=0):
+        self.lines = lines
+        self.depth = depth
+        self.functions = functions
+        if inline > 0 and functions == 0:
+            # inline expressions call the functions
+            self.functions = 1
+        self.inline = inline
+        self.templates = templates
+        self.random = random.Random(seed)
+        self.output = []
+        # the number of statements generated so far
+        self.count = 0
+
+    def emit(self, level, line):
+        self.output.append('    ' * level + line)
+
+    def function(self, i):
+        self.emit(0, f'function f{i} x:int returns int')
+        self.emit(1, f'y = x + {i}')
+        self.emit(1, 'return y')
+        self.emit(0, '')
+
+    def statement(self, level, scope):
+        """
+        Generates a statement, which only uses the int variables of `scope`.
+        """
+        i = self.count
+        self.count += 1
+        a = self.random.choice(scope)
+        b = self.random.choice(scope)
+        kind = self.random.random()
+        if kind < self.inline:
+            f = self.random.randrange(self.functions)
+            self.emit(level, f'v{i} = f{f}(x: {a}) + {b}')
+        elif kind < self.inline + self.templates:
+            # strings aren't added to the scope of int variables
+            self.emit(level, f's{i} = "{{{a}}} and {{{b} + {i}}}"')
+            return
+        else:
+            self.emit(level, f'v{i} = {a} + {b} * {i}')
+        scope.append(f'v{i}')
+
+    def block(self, level, scope):
+        """
+        Generates a block of statements at `level`, followed by a nested
+        block. The top-level block continues until the story has enough
+        statements.
+        """
+        scope = list(scope)
+        while self.count < self.lines:
+            for i in range(self.block_size):
+                if self.count >= self.lines:
+                    return
+                self.statement(level, scope)
+            if level < self.depth and self.count < self.lines:
+                a = self.random.choice(scope)
+                self.emit(level, f'if {a} > {self.count}')
+                self.block(level + 1, scope)
+            if level > 0:
+                return
+
+    def generate(self):
+        for i in range(self.functions):
+            self.function(i)
+        self.emit(0, 'v = 1')
+        self.block(0, ['v'])
+        return '\n'.join(self.output) + '\n'
+
+
+def generate(**kwargs):
+    """
+    Returns a synthetic story (see Generator).
+    """
+    return Generator(**kwargs).generate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.generator',
+        description='Prints a synthetic story.')
+    parser.add_argument('--lines', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=0)
+    parser.add_argument('--functions', type=int, default=0)
+    parser.add_argument('--inline', type=float, default=0)
+    parser.add_argument('--templates', type=float, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    print(generate(**vars(args)), end='')
+
+
+if __name__ == '__main__':
+    main()
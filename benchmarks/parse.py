@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the parser (with the Transformer) over the stories of tests/e2e
+which compile or over a synthetic story (see benchmarks.generator).
+Reports the best total parse time, the peak memory allocated while parsing
+and the peak RSS of the process. The RSS includes the parser itself, thus
+the benchmark should run in a new process for each measurement.
+
+    python -m benchmarks.parse [--runs N] [--filter TEXT] [--lines N]
+"""
+import argparse
+import resource
+import sys
+import time
+import tracemalloc
+
+from storyscript.parser import Parser
+
+from .corpus import corpus
+from .generator import generate
+
+
+def parse_all(sources, parser):
+    """
+    Returns the time for parsing all `sources`.
+    """
+    start = time.perf_counter()
+    for source in sources:
+        parser.parse(source)
+    return time.perf_counter() - start
+
+
+def peak_memory(sources, parser):
+    """
+    Returns the largest peak memory allocated for parsing one of `sources`.
+    """
+    peak = 0
+    for source in sources:
+        tracemalloc.start()
+        parser.parse(source)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the process in bytes.
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform != 'darwin':
+        rss *= 1024
+    return rss
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.parse',
+        description='Benchmarks the parser over tests/e2e or a synthetic '
+                    'story.')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Parses of every story (best is used)')
+    parser.add_argument('--filter', default=None,
+                        help='Only use stories whose path contains this')
+    parser.add_argument('--lines', type=int, default=None,
+                        help='Parse a synthetic story with this many '
+                             'statements instead')
+    args = parser.parse_args(argv)
+
+    if args.lines is None:
+        sources = [source for name, source, features in corpus(args.filter)]
+    else:
+        sources = [generate(lines=args.lines, depth=4, functions=10)]
+    story_parser = Parser()
+    # loads the parser tables
+    parse_all(sources, story_parser)
+    elapsed = min(parse_all(sources, story_parser) for i in range(args.runs))
+    peak = peak_memory(sources, story_parser)
+
+    print(f'{len(sources)} stories, {args.runs} runs')
+    print(f'{"parse time":>16}: {elapsed * 1000:10.1f}ms')
+    print(f'{"peak memory":>16}: {peak / 1024:10.1f}KB')
+    print(f'{"peak rss":>16}: {peak_rss() / 1024 / 1024:10.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
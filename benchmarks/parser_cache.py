@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the construction time of a Parser with a cold and a warm parser
+table cache.
+
+    python -m benchmarks.parser_cache
+"""
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from storyscript.parser import Parser, ParserCache
+
+
+def construct(directory, cache=True):
+    """
+    Returns the time required to construct a new Parser.
+    """
+    with mock.patch.object(ParserCache, 'default_directory',
+                           return_value=directory):
+        start = time.perf_counter()
+        Parser(cache=cache)
+        return time.perf_counter() - start
+
+
+def main(runs=5):
+    uncached = []
+    cold = []
+    warm = []
+    for i in range(runs):
+        directory = tempfile.mkdtemp()
+        try:
+            uncached.append(construct(directory, cache=False))
+            cold.append(construct(directory))
+            warm.append(construct(directory))
+        finally:
+            shutil.rmtree(directory)
+
+    for name, timings in (('uncached', uncached), ('cold', cold),
+                          ('warm', warm)):
+        best = min(timings) * 1000
+        print(f'{name:>10}: {best:8.1f}ms (best of {runs})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how the time of each compiler phase grows with the size of
+synthetic stories (see benchmarks.generator). For every scenario, the
+stories are doubled in size and the growth of each phase is fitted as
+`time ~ size^k`. An exponent `k` clearly above 1 is superlinear growth.
+
+    python -m benchmarks.scaling [--sizes N ...] [--runs N]
+                                 [--scenario NAME ...]
+"""
+import argparse
+import math
+
+from storyscript.Features import Features
+
+from .corpus import phases, time_phases
+from .generator import generate
+
+
+# the keyword arguments of the generator for a story with `n` statements
+scenarios = {
+    'lines': lambda n: {'lines': n},
+    'nesting': lambda n: {'lines': n, 'depth': 8},
+    'functions': lambda n: {'lines': n, 'functions': n // 10},
+    'inline': lambda n: {'lines': n, 'functions': 5, 'inline': 0.5},
+    'templates': lambda n: {'lines': n, 'templates': 0.5},
+}
+
+# exponents above this are reported as superlinear
+superlinear = 1.3
+
+
+def best_timings(source, features, runs):
+    """
+    Returns the best time of every phase over `runs` compilations.
+    """
+    best = {}
+    for i in range(runs):
+        for phase, elapsed in time_phases(source, features).items():
+            best[phase] = min(best.get(phase, elapsed), elapsed)
+    return best
+
+
+def fit_exponent(sizes, timings):
+    """
+    Returns the exponent `k` of `time ~ size^k`, fitted by least squares
+    on a log-log scale.
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(elapsed, 1e-9)) for elapsed in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def measure(scenario, sizes, runs):
+    """
+    Returns the best time of every phase for each size of a scenario.
+    """
+    features = Features(None)
+    # loads the parser and the Hub mutations
+    time_phases(generate(lines=10), features)
+    results = {phase: [] for phase in phases}
+    for size in sizes:
+        source = generate(**scenarios[scenario](size))
+        timings = best_timings(source, features, runs)
+        for phase in phases:
+            results[phase].append(timings[phase])
+    return results
+
+
+def report(scenario, sizes, results):
+    sizes_header = ''.join(f'{size:>10}' for size in sizes)
+    print(f'{scenario}:')
+    print(f'{"phase":>10}{sizes_header}  exponent')
+    for phase, timings in results.items():
+        times = ''.join(f'{elapsed * 1000:8.1f}ms' for elapsed in timings)
+        exponent = fit_exponent(sizes, timings)
+        mark = '  superlinear' if exponent > superlinear else ''
+        print(f'{phase:>10}{times}  {exponent:8.2f}{mark}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.scaling',
+        description='Fits the growth of the compiler phases with the size '
+                    'of synthetic stories.')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[250, 500, 1000, 2000],
+                        help='Statements of the generated stories')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Compilations of every story (best is used)')
+    parser.add_argument('--scenario', nargs='+', choices=list(scenarios),
+                        default=list(scenarios))
+    args = parser.parse_args(argv)
+
+    for scenario in args.scenario:
+        results = measure(scenario, args.sizes, args.runs)
+        report(scenario, args.sizes, results)
+
+
+if __name__ == '__main__':
+    main()
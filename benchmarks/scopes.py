@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the type checking of synthetic stories (see benchmarks.generator)
+with the same number of statements, but nested into blocks of increasing
+depth. Every statement resolves its variables in the scope of its block,
+thus the time per statement should not grow with the depth.
+
+    python -m benchmarks.scopes [--lines N] [--depths N ...] [--runs N]
+"""
+import argparse
+
+from storyscript.Api import Api
+
+from .generator import generate
+
+
+def type_check_time(source, runs):
+    """
+    Returns the best time of the TypeResolver for `source`.
+    """
+    best = None
+    for i in range(runs):
+        result = Api.loads(source, stats=True)
+        result.check_success()
+        elapsed = result.stats().timings['TypeResolver']
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.scopes',
+        description='Benchmarks the type checking of deeply nested blocks.')
+    parser.add_argument('--lines', type=int, default=2000,
+                        help='Statements of the generated stories')
+    parser.add_argument('--depths', type=int, nargs='+',
+                        default=[1, 10, 50, 100],
+                        help='Nesting depths of the generated stories')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Compilations of every story (best is used)')
+    args = parser.parse_args(argv)
+
+    # loads the parser and the Hub mutations
+    type_check_time(generate(lines=10), runs=1)
+    print(f'{"depth":>8} {"TypeResolver":>14} {"per statement":>14}')
+    for depth in args.depths:
+        source = generate(lines=args.lines, depth=depth)
+        elapsed = type_check_time(source, args.runs)
+        per_statement = elapsed / args.lines * 1e6
+        print(f'{depth:>8} {elapsed * 1000:12.1f}ms {per_statement:12.1f}us')
+
+
+if __name__ == '__main__':
+    main()
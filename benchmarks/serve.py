@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the latency of compiling a story with a new `storyscript compile`
+process against a request to a running `storyscript serve` process.
+
+    python -m benchmarks.serve [story]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+default_story = 'a = 1\nb = a + 2\nif b > 2\n    c = "{a} and {b}"\n'
+
+
+def one_shot(path, runs):
+    """
+    Returns the latencies of compiling `path` with a new process.
+    """
+    timings = []
+    for i in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'storyscript', 'compile',
+                        '--no-cache', '-j', path],
+                       stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def server(source, runs):
+    """
+    Returns the latencies of compiling `source` with a running server.
+    """
+    process = subprocess.Popen([sys.executable, '-m', 'storyscript', 'serve'],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               encoding='utf8')
+    timings = []
+    try:
+        for i in range(runs):
+            request = {'id': i, 'method': 'loads',
+                       'params': {'source': source}}
+            start = time.perf_counter()
+            process.stdin.write(json.dumps(request) + '\n')
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            timings.append(time.perf_counter() - start)
+            assert response['errors'] == [], response['errors']
+    finally:
+        process.stdin.close()
+        process.wait()
+    return timings
+
+
+def main(runs=10):
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            source = f.read()
+    else:
+        source = default_story
+
+    fd, path = tempfile.mkstemp(suffix='.story')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(source)
+        results = (('one-shot', one_shot(path, runs)),
+                   ('serve', server(source, runs)))
+    finally:
+        os.remove(path)
+
+    for name, timings in results:
+        timings.sort()
+        median = timings[len(timings) // 2] * 1000
+        print(f'{name:>10}: {median:8.1f}ms (median of {runs})')
+
+
+if __name__ == '__main__':
+    main()
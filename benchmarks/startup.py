@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the startup time of Storyscript in new processes: the time to
+import it, the time of the first compilation (which loads the parser and
+the Hub mutations) and the slowest modules of `python -X importtime`
+(Python 3.7+).
+
+    python -m benchmarks.startup
+"""
+import subprocess
+import sys
+
+
+import_code = ('import time\n'
+               'start = time.perf_counter()\n'
+               'import storyscript\n'
+               'print(time.perf_counter() - start)\n')
+
+compile_code = ('import time\n'
+                'from storyscript.Api import Api\n'
+                'start = time.perf_counter()\n'
+                'Api.loads("a = 1.increment()").check_success()\n'
+                'print(time.perf_counter() - start)\n')
+
+
+def measure(code, runs):
+    """
+    Returns the timings that `code` prints in new processes.
+    """
+    timings = []
+    for i in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         encoding='utf8')
+        timings.append(float(output))
+    return timings
+
+
+def slowest_imports(count):
+    """
+    Returns the modules with the highest cumulative import time.
+    """
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             'import storyscript'],
+                            stderr=subprocess.PIPE, encoding='utf8').stderr
+    modules = []
+    for line in output.splitlines()[1:]:
+        self_time, cumulative, name = line.split('|')
+        modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def main(runs=5):
+    for name, code in (('import', import_code),
+                       ('first compile', compile_code)):
+        best = min(measure(code, runs)) * 1000
+        print(f'{name:>14}: {best:8.1f}ms (best of {runs})')
+    # -X importtime is available since Python 3.7
+    if sys.version_info < (3, 7):
+        return
+    print('slowest imports (cumulative):')
+    for cumulative, name in slowest_imports(10):
+        print(f'{cumulative / 1000:8.1f}ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Compares how child trees are found by their name (e.g. `tree.path`) over
+the syntax trees of the stories in tests/e2e:
+
+- scan: Tree, which scans the children
+- indexed: a dict from names to children, kept by every tree until its
+  number of children changes
+- rebuilt: the same dict, built again for every lookup, as if every lookup
+  followed a change of the tree
+
+All of them are measured through attribute access, like the compiler does.
+
+    python -m benchmarks.tree_lookup
+"""
+import os
+import time
+from glob import glob
+
+from storyscript.Story import Story
+from storyscript.exceptions import StoryError
+from storyscript.parser import Tree
+
+
+e2e_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                       'tests', 'e2e')
+
+
+def index(tree):
+    """
+    Returns a mapping of the names of the child trees to the first child
+    tree with that name.
+    """
+    children = {}
+    for item in tree.children:
+        if isinstance(item, Tree):
+            children.setdefault(item.data, item)
+    return children
+
+
+class IndexedTree(Tree):
+    """
+    Looks up children in an index, which is rebuilt when the number of
+    children changes.
+    """
+
+    @staticmethod
+    def walk(tree, path):
+        memo = tree.__dict__.get('_index')
+        if memo is None or memo[0] != len(tree.children):
+            memo = (len(tree.children), index(tree))
+            tree._index = memo
+        return memo[1].get(path)
+
+
+class RebuiltTree(Tree):
+    """
+    Looks up children in an index, which is rebuilt for every lookup.
+    """
+
+    @staticmethod
+    def walk(tree, path):
+        return index(tree).get(path)
+
+
+def lookups():
+    """
+    Returns all (tree, name) pairs of child lookups over the e2e corpus.
+    """
+    pairs = []
+    for path in glob(os.path.join(e2e_dir, '**', '*.story'), recursive=True):
+        story = Story.from_file(path, features=None)
+        try:
+            story.parse(parser=None, lower=True)
+        except StoryError:
+            continue
+        for tree in story.tree.iter_subtrees():
+            for child in tree.children:
+                if isinstance(child, Tree):
+                    pairs.append((tree, child.data))
+            # lookups of missing children are common too
+            pairs.append((tree, 'missing'))
+    return pairs
+
+
+def measure(pairs, cls, repeat):
+    for tree, name in pairs:
+        tree.__class__ = cls
+    start = time.perf_counter()
+    for i in range(repeat):
+        for tree, name in pairs:
+            getattr(tree, name)
+    return time.perf_counter() - start
+
+
+def main(repeat=20):
+    pairs = lookups()
+    count = len(pairs) * repeat
+    children = sum(len(tree.children) for tree, name in pairs) / len(pairs)
+    print(f'{len(pairs)} lookups in trees with {children:.1f} children '
+          'on average')
+    for name, cls in (('scan', Tree), ('indexed', IndexedTree),
+                      ('rebuilt', RebuiltTree)):
+        elapsed = measure(pairs, cls, repeat)
+        per_lookup = elapsed / count * 1e9
+        print(f'{name:>10}: {elapsed * 1000:8.1f}ms '
+              f'({per_lookup:.0f}ns per lookup, {count} lookups)')
+
+
+if __name__ == '__main__':
+    main()
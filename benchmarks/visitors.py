@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the tree visitors over the stories of tests/e2e which compile:
+the Transformer of the parser, the FunctionResolver and TypeResolver of the
+semantic analysis and the JSONCompiler. These visitors dispatch every tree
+to the method for its `data`. Reports the median time of every visitor per
+story and the total over all stories.
+
+    python -m benchmarks.visitors [--runs N] [--filter TEXT]
+"""
+import argparse
+
+from storyscript.Stats import Stats
+from storyscript.Story import Story
+
+from .corpus import corpus, percentile
+
+
+visitors = ['Transformer', 'FunctionResolver', 'TypeResolver', 'JSONCompiler']
+
+
+def visitor_timings(source, features):
+    """
+    Returns the time of every visitor for compiling `source`.
+    """
+    story = Story(source, features)
+    story.stats = Stats()
+    story.process()
+    return {visitor: story.stats.timings.get(visitor, 0)
+            for visitor in visitors}
+
+
+def measure(stories, runs):
+    """
+    Returns the median time of every visitor per story and its total time
+    over all stories (best of `runs`).
+    """
+    # loads the parser and the Hub mutations
+    for name, source, features in stories:
+        visitor_timings(source, features)
+
+    timings = {visitor: [] for visitor in visitors}
+    totals = {visitor: [] for visitor in visitors}
+    for i in range(runs):
+        run = {visitor: 0 for visitor in visitors}
+        for name, source, features in stories:
+            for visitor, elapsed in visitor_timings(source, features).items():
+                timings[visitor].append(elapsed)
+                run[visitor] += elapsed
+        for visitor, elapsed in run.items():
+            totals[visitor].append(elapsed)
+
+    return {visitor: {'median': percentile(timings[visitor], 50),
+                      'total': min(totals[visitor])}
+            for visitor in visitors}
+
+
+def report(results):
+    print(f'{"visitor":>16} {"median":>10} {"total":>10}')
+    for visitor, result in results.items():
+        print(f'{visitor:>16} {result["median"] * 1000:8.3f}ms '
+              f'{result["total"] * 1000:8.1f}ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.visitors',
+        description='Benchmarks the tree visitors over tests/e2e.')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Measured compilations of every story')
+    parser.add_argument('--filter', default=None,
+                        help='Only use stories whose path contains this')
+    args = parser.parse_args(argv)
+
+    stories = corpus(args.filter)
+    print(f'{len(stories)} stories, {args.runs} runs')
+    report(measure(stories, args.runs))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,8 +25,8 @@ release_version = None
 try:
     result = {'__file__': path.join(root_dir, name, 'Version.py')}
     exec(read(path.join(name, 'Version.py')), result)
-    version = result['version']
-    release_version = result['release_version']
+    version = result['get_version']()
+    release_version = result['get_release_version']()
 except FileNotFoundError:
     pass
 
@@ -134,7 +134,8 @@ setup(name=name,
       author_email='support@asyncy.com',
       url='http://storyscript.org',
       license='MIT',
-      packages=find_packages(exclude=('build.*', 'tests', 'tests.*')),
+      packages=find_packages(exclude=('build.*', 'tests', 'tests.*',
+                                      'benchmarks', 'benchmarks.*')),
       include_package_data=True,
       zip_safe=True,
       install_requires=requirements,
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from .Bundle import Bundle
 from .Features import Features
+from .Stats import Stats
 from .Story import Story
 from .exceptions import StoryError
 
@@ -11,25 +12,26 @@ class StoryscriptCompilationResult:
     Contains the compiled story or a list of compilation errors.
     """
 
-    def __init__(self, result, errors):
+    def __init__(self, result, errors, stats=None):
         self._result = result
         self._errors = errors
         self._deprecations = []
         self._warnings = []
+        self._stats = stats
 
     @classmethod
-    def from_result(cls, story):
+    def from_result(cls, story, stats=None):
         """
         Creates a CompilationResult from a result.
         """
-        return cls(story, errors=[])
+        return cls(story, errors=[], stats=stats)
 
     @classmethod
-    def from_error(cls, error):
+    def from_error(cls, error, stats=None):
         """
         Creates a CompilationResult from a single error.
         """
-        return cls(None, errors=[error])
+        return cls(None, errors=[error], stats=stats)
 
     def result(self):
         """
@@ -49,6 +51,14 @@ class StoryscriptCompilationResult:
         """
         return self._warnings
 
+    def stats(self):
+        """
+        Returns the timings and counters of the compilation if they were
+        requested: a Stats object for a single story or a dict of the Stats
+        of each compiled story.
+        """
+        return self._stats
+
     def deprecations(self):
         """
         Returns a list of all deprecations emitted by the Storyscript compiler.
@@ -74,56 +84,70 @@ class Api:
     Exposes functionalities for external use
     """
     @staticmethod
-    def loads(string, features=None):
+    def loads(string, features=None, stats=False):
         """
         Load story from a string.
+        With `stats`, the timings and counters of the compilation are
+        recorded.
         """
         features = Features(features)
+        stats = Stats() if stats else None
         try:
-            s = Story(string, features).process()
-            return StoryscriptCompilationResult.from_result(s)
+            story = Story(string, features)
+            story.stats = stats
+            s = story.process()
+            return StoryscriptCompilationResult.from_result(s, stats=stats)
         except StoryError as e:
-            return StoryscriptCompilationResult.from_error(e)
+            return StoryscriptCompilationResult.from_error(e, stats=stats)
         except Exception as e:
             if features.debug:
                 raise e
             else:
                 e = StoryError.internal_error(e)
-                return StoryscriptCompilationResult.from_error(e)
+                return StoryscriptCompilationResult.from_error(e, stats=stats)
 
     @staticmethod
-    def load(stream, features=None):
+    def load(stream, features=None, stats=False):
         """
         Load story from a file stream.
+        With `stats`, the timings and counters of the compilation are
+        recorded.
         """
         features = Features(features)
+        stats = Stats() if stats else None
         try:
-            story = Story.from_stream(stream, features).process()
+            story = Story.from_stream(stream, features)
+            story.stats = stats
+            story = story.process()
             s = {stream.name: story, 'services': story['services']}
-            return StoryscriptCompilationResult.from_result(s)
+            return StoryscriptCompilationResult.from_result(s, stats=stats)
         except StoryError as e:
-            return StoryscriptCompilationResult.from_error(e)
+            return StoryscriptCompilationResult.from_error(e, stats=stats)
         except Exception as e:
             if features.debug:
                 raise e
             else:
                 e = StoryError.internal_error(e)
-                return StoryscriptCompilationResult.from_error(e)
+                return StoryscriptCompilationResult.from_error(e, stats=stats)
 
     @staticmethod
-    def load_map(files, features=None):
+    def load_map(files, features=None, workers=None, stats=False):
         """
-        Load multiple stories from a file mapping
+        Load multiple stories from a file mapping.
+        More than one `workers` compiles the stories in parallel processes.
+        With `stats`, the timings and counters of each story are recorded.
         """
         features = Features(features)
+        stats = {} if stats else None
         try:
-            s = Bundle(story_files=files, features=features).bundle()
-            return StoryscriptCompilationResult.from_result(s)
+            s = Bundle(story_files=files, features=features) \
+                .bundle(workers=workers, stats=stats)
+            return StoryscriptCompilationResult.from_result(s, stats=stats)
         except StoryError as e:
-            return StoryscriptCompilationResult.from_error(e)
+            return StoryscriptCompilationResult.from_error(e, stats=stats)
         except Exception as e:
             if features.debug:
                 raise e
             else:
                 e = StoryError.internal_error(e)
-                return StoryscriptCompilationResult.from_error(e)
+                return StoryscriptCompilationResult.from_error(e, stats=stats)
@@ -22,13 +22,16 @@ class App:
 
     @staticmethod
     def compile(path, ignored_path=None, ebnf=None, concise=False,
-                first=False, features=None):
+                first=False, features=None, workers=None, cache=None,
+                stats=None):
         """
-        Parses and compiles stories found in path, returning JSON
+        Parses and compiles stories found in path, returning JSON.
+        The Stats of each compiled story are added to the `stats` dict.
         """
         bundle = Bundle.from_path(path, ignored_path=ignored_path,
                                   features=features)
-        result = bundle.bundle(ebnf=ebnf)
+        result = bundle.bundle(ebnf=ebnf, workers=workers, cache=cache,
+                               stats=stats)
         if concise:
             result = _clean_dict(result)
         if first:
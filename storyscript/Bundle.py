@@ -1,10 +1,47 @@
 # -*- coding: utf-8 -*-
 import os
-import subprocess
 
 from .Features import Features
+from .Stats import Stats
 from .Story import Story
-from .parser import Parser
+from .exceptions import StoryError
+
+
+# state of a compilation worker process (see Bundle.compile_parallel)
+_worker = {}
+
+
+def _init_worker(features, ebnf):
+    """
+    Prepares a worker process for the options of a story. Its parser is kept
+    for all stories compiled by this worker with the same options.
+    """
+    if _worker.get('options') == (features, ebnf):
+        return
+    _worker['options'] = (features, ebnf)
+    _worker['features'] = Features(features)
+    _worker['parser'] = None
+    if ebnf is not None:
+        from .parser import Parser
+        _worker['parser'] = Parser(ebnf=ebnf)
+
+
+def _compile_story(source, features, ebnf, stats=False):
+    """
+    Compiles a story inside a worker process.
+    Returns the compiled story and its stats (if requested) or `None` if the
+    story couldn't be compiled.
+    """
+    try:
+        _init_worker(features, ebnf)
+        story = Story(source, features=_worker['features'])
+        if stats:
+            story.stats = Stats()
+        story.parse(parser=_worker['parser'])
+        story.compile()
+        return story.compiled, story.stats
+    except Exception:
+        return None
 
 
 class Bundle:
@@ -27,6 +64,7 @@ class Bundle:
         """
         Get the list of files ignored by git
         """
+        import subprocess
         command = ['git', 'ls-files', '--others', '--ignored',
                    '--exclude-standard']
         try:
@@ -62,14 +100,24 @@ class Bundle:
         return None
 
     @classmethod
-    def parse_directory(cls, directory, ignored_path=None):
+    def find_ignores(cls, ignored_path=None):
         """
-        Parse a directory to find stories.
+        Get the list of files ignored by git or by `ignored_path`
         """
-        paths = []
         ignores = cls.gitignores()
         if ignored_path:
             ignores = ignores + cls.ignores(ignored_path)
+        return ignores
+
+    @classmethod
+    def parse_directory(cls, directory, ignored_path=None, ignores=None):
+        """
+        Parse a directory to find stories.
+        A previously found list of `ignores` can be reused.
+        """
+        paths = []
+        if ignores is None:
+            ignores = cls.find_ignores(ignored_path)
         for root, subdirs, files in os.walk(directory):
             for file in files:
                 path = cls.filter_path(root, file, ignores)
@@ -116,6 +164,7 @@ class Bundle:
 
     def parser(self, ebnf):
         if ebnf is not None:
+            from .parser import Parser
             return Parser(ebnf=ebnf)
         return None
 
@@ -128,23 +177,130 @@ class Bundle:
             story.parse(parser=parser, lower=lower)
             self.stories[storypath] = story.tree
 
-    def compile(self, stories, parser):
+    def compile(self, stories, parser, cache=None, stats=None):
         """
         Reads, parses and compiles the story.
+        Stories found in the `cache` aren't compiled again.
+        The Stats of each compiled story are added to the `stats` dict.
         """
         for storypath in stories:
             story = self.load_story(storypath)
+            if cache is not None:
+                key = cache.key(story.story, self.features)
+                compiled = cache.load(key)
+                if compiled is not None:
+                    self.stories[storypath] = compiled
+                    continue
+            if stats is not None:
+                story.stats = stats[storypath] = Stats()
             story.parse(parser=parser)
             story.compile()
             self.stories[storypath] = story.compiled
+            if cache is not None:
+                cache.save(key, story.compiled)
+
+    @staticmethod
+    def worker_result(future):
+        """
+        Returns the compiled story and its stats of a worker or `None` if the
+        worker failed.
+        """
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:  # e.g. a worker process died
+            return None
+
+    def submit(self, executor, stories, options, cache):
+        """
+        Submits the stories which aren't found in the `cache` to the workers
+        with the compile `options` of `_compile_story`.
+        Returns a (storypath, key, future, cached) tuple for each story.
+        """
+        pending = []
+        for storypath in stories:
+            try:
+                source = self.load_story(storypath).story
+            except StoryError:
+                # raised by the fallback compilation, in order
+                pending.append((storypath, None, None, None))
+                continue
+            key = None
+            if cache is not None:
+                key = cache.key(source, self.features)
+                cached = cache.load(key)
+                if cached is not None:
+                    pending.append((storypath, None, None, cached))
+                    continue
+            future = executor.submit(_compile_story, source, *options)
+            pending.append((storypath, key, future, None))
+        return pending
 
-    def bundle(self, ebnf=None):
+    def collect(self, pending, ebnf, cache, stats):
+        """
+        Collects the results of the submitted stories in order. Stories that
+        failed are compiled again in this process and the remaining stories
+        are cancelled on the first error.
         """
-        Makes the bundle
+        parser = None
+        for storypath, key, future, cached in pending:
+            if cached is not None:
+                self.stories[storypath] = cached
+                continue
+            result = self.worker_result(future)
+            if result is not None:
+                compiled, story_stats = result
+                self.stories[storypath] = compiled
+                if stats is not None:
+                    stats[storypath] = story_stats
+                if key is not None:
+                    cache.save(key, compiled)
+                continue
+            if parser is None:
+                parser = self.parser(ebnf)
+            try:
+                self.compile([storypath], parser=parser, stats=stats)
+            except Exception:
+                for _, _, f, _ in pending:
+                    if f is not None:
+                        f.cancel()
+                raise
+
+    def compile_parallel(self, stories, ebnf, workers, cache=None,
+                         stats=None):
         """
+        Reads, parses and compiles the stories in a pool of worker processes.
+        Stories that failed are compiled again in this process, s.t. the
+        first error is raised in the same way as with `compile`.
+        Stories found in the `cache` aren't submitted to the workers.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        # sent with every story, as the initializer of the pool requires
+        # Python 3.7
+        options = (self.features.features, ebnf, stats is not None)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = self.submit(executor, stories, options, cache)
+            self.collect(pending, ebnf, cache, stats)
+
+    def bundle(self, ebnf=None, workers=None, cache=None, stats=None):
+        """
+        Makes the bundle. Stories are compiled by a pool of `workers`
+        processes if more than one worker is requested.
+        Compiled stories are looked up in and added to `cache` (a
+        CompileCache), unless a custom grammar is used.
+        The Stats of each story are added to the `stats` dict, thus all
+        stories are compiled without the cache then.
+        """
+        if ebnf is not None or stats is not None:
+            cache = None
         entrypoint = self.find_stories()
-        parser = self.parser(ebnf)
-        self.compile(entrypoint, parser=parser)
+        if workers is not None and workers > 1 and len(entrypoint) > 1:
+            self.compile_parallel(entrypoint, ebnf=ebnf, workers=workers,
+                                  cache=cache, stats=stats)
+        else:
+            parser = self.parser(ebnf)
+            self.compile(entrypoint, parser=parser, cache=cache, stats=stats)
         return {'stories': self.stories, 'services': self.services(),
                 'entrypoint': entrypoint}
 
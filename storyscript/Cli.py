@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 import io
 import os
+import sys
 
 import click
 
 from click_alias import ClickAliasedGroup
 
 from .App import App
+from .CompileCache import CompileCache
 from .Features import Features
 from .Project import Project
-from .Version import version as app_version
+from .Server import Server
+from .Version import get_version
+from .Watcher import Watcher
 from .exceptions import StoryError
 
 
@@ -41,12 +45,30 @@ def preview_cb(ctx, param, values):
     return features
 
 
+def check_watch(options):
+    """
+    Rejects the options of `compile` which don't apply to --watch. The
+    watcher prints the compilation of each changed story and its errors
+    instead of the results.
+    """
+    used = [name for name, value in options.items() if value]
+    if used:
+        raise click.UsageError(
+            '--watch can not be used with {}'.format(', '.join(used)))
+
+
 class Cli:
 
     version_help = 'Prints Storyscript version'
     silent_help = 'Silent mode. Return syntax errors only.'
     ebnf_help = 'Load the grammar from a file. Useful for development'
     preview_help = 'Activate upcoming Storyscript features'
+    jobs_help = 'Number of processes used to compile stories'
+    no_cache_help = 'Compile all stories, ignoring previous results'
+    cache_dir_help = 'Directory in which compiled stories are cached'
+    cache_stats_help = 'Prints the cache hits and misses'
+    watch_help = 'Recompiles stories whenever they change'
+    timings_help = 'Prints the time of each compiler phase per story'
 
     @click.group(invoke_without_command=True, cls=ClickAliasedGroup)
     @click.option('--version', '-v', is_flag=True, help=version_help)
@@ -57,7 +79,7 @@ class Cli:
         """
         if version:
             message = 'StoryScript {} - http://storyscript.org'
-            click.echo(message.format(app_version))
+            click.echo(message.format(get_version()))
             exit()
 
         if context.invoked_subcommand is None:
@@ -114,15 +136,44 @@ class Cli:
                   help='Specify path of ignored files')
     @click.option('--preview', callback=preview_cb, is_eager=True,
                   multiple=True, help=preview_help)
+    @click.option('--jobs', default=1, type=click.IntRange(min=1),
+                  help=jobs_help)
+    @click.option('--no-cache', is_flag=True, help=no_cache_help)
+    @click.option('--cache-dir', default=None, help=cache_dir_help)
+    @click.option('--cache-stats', is_flag=True, help=cache_stats_help)
+    @click.option('--watch', '-w', is_flag=True, help=watch_help)
+    @click.option('--timings', is_flag=True, help=timings_help)
     def compile(path, output, json, silent, debug, ebnf, ignore, concise,
-                first, preview):
+                first, preview, jobs, no_cache, cache_dir, cache_stats,
+                watch, timings):
         """
         Compiles stories and validates syntax
         """
+        cache = None
+        if not no_cache:
+            cache = CompileCache(directory=cache_dir)
+        if watch:
+            check_watch({'OUTPUT': output, '--json': json,
+                         '--silent': silent, '--debug': debug,
+                         '--concise': concise, '--first': first,
+                         '--jobs': jobs != 1, '--cache-stats': cache_stats,
+                         '--timings': timings})
+            Watcher(path, ignored_path=ignore, ebnf=ebnf, features=preview,
+                    cache=cache).watch()
+            return
+        stats = None
+        if timings:
+            stats = {}
         try:
             results = App.compile(path, ignored_path=ignore,
                                   ebnf=ebnf, concise=concise, first=first,
-                                  features=preview)
+                                  features=preview, workers=jobs,
+                                  cache=cache, stats=stats)
+            if cache_stats and cache is not None:
+                click.echo(cache.stats(), err=True)
+            if timings:
+                for story, story_stats in stats.items():
+                    click.echo(f'{story}:\n{story_stats}', err=True)
             if not silent:
                 if json:
                     if output:
@@ -176,6 +227,16 @@ class Cli:
                 StoryError.internal_error(e).echo()
                 exit(1)
 
+    @staticmethod
+    @main.command()
+    @click.option('--preview', callback=preview_cb, is_eager=True,
+                  multiple=True, help=preview_help)
+    def serve(preview):
+        """
+        Compiles stories received as JSON requests on stdin
+        """
+        Server(sys.stdin, sys.stdout, features=preview).serve()
+
     @staticmethod
     @main.command(aliases=['g'])
     def grammar():
@@ -208,4 +269,4 @@ class Cli:
         """
         Prints the current version
         """
-        click.echo(app_version)
+        click.echo(get_version())
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import io
+import json
+import os
+from functools import lru_cache
+
+from .Version import get_version
+from .parser import ParserCache
+
+
+class CompileCache:
+    """
+    Content-addressed cache of compiled stories.
+    A story is only compiled again if its source, the compiler version, the
+    sources of the compiler or the compiler features have changed.
+    """
+
+    # the directory of the compiler sources
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = ParserCache.default_directory()
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def fingerprint(directory):
+        """
+        Computes a hash of the files in `directory`, e.g. the compiler and
+        its grammar. Development checkouts may keep the same version while
+        the compiler is edited.
+        The sources don't change over the program lifetime, thus they are
+        only hashed once.
+        """
+        h = hashlib.sha256()
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                h.update(os.path.relpath(path, directory).encode('utf8'))
+                with io.open(path, 'rb') as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+        return h.hexdigest()
+
+    @classmethod
+    def key(cls, source, features):
+        """
+        Computes the cache key of a story.
+        """
+        options = ','.join(f'{k}={v}'
+                           for k, v in sorted(features.features.items()))
+        fingerprint = cls.fingerprint(cls.package_dir)
+        h = hashlib.sha256()
+        h.update(f'{get_version()}:{fingerprint}:{options}:'.encode('utf8'))
+        h.update(source.encode('utf8'))
+        return h.hexdigest()
+
+    def path(self, key):
+        """
+        Returns the path of the cache entry for `key`.
+        """
+        return os.path.join(self.directory, 'compiled', f'{key}.json')
+
+    def load(self, key):
+        """
+        Returns the compiled story stored for `key` or `None`.
+        """
+        try:
+            with io.open(self.path(key), 'r', encoding='utf8') as f:
+                compiled = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return compiled
+
+    def save(self, key, compiled):
+        """
+        Stores a compiled story for `key`.
+        """
+        data = json.dumps(compiled).encode('utf8')
+        ParserCache.write(self.path(key), lambda f: f.write(data))
+
+    def stats(self):
+        """
+        Returns a summary of the cache hits and misses.
+        """
+        return f'{self.hits} cache hits, {self.misses} cache misses'
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import json
+
+from .Api import Api
+from .Features import Features
+from .Story import Story
+from .exceptions import StoryError
+
+
+class Server:
+    """
+    Long-running compiler that answers requests, one JSON object per line:
+
+        {"id": 1, "method": "loads", "params": {"source": "a = 1"}}
+
+    The parser and the other compiler state stay loaded between requests,
+    which avoids the start-up costs of a new compiler process per story.
+    """
+
+    methods = ('loads', 'load_map', 'parse', 'lex')
+
+    def __init__(self, input, output, features=None):
+        self.input = input
+        self.output = output
+        self.features = features
+
+    @staticmethod
+    def errors(result):
+        """
+        Returns the messages of all errors of a compilation result.
+        """
+        messages = []
+        for error in result.errors():
+            error.with_color = False
+            messages.append(error.message())
+        return messages
+
+    def compilation(self, result):
+        """
+        Converts a StoryscriptCompilationResult into a response payload.
+        """
+        return {'result': result.result(), 'errors': self.errors(result)}
+
+    def loads(self, source, features=None):
+        """
+        Compiles a single story. Same as `Api.loads`.
+        """
+        return self.compilation(Api.loads(source, features=features))
+
+    def load_map(self, files, features=None):
+        """
+        Compiles a mapping of story files. Same as `Api.load_map`.
+        """
+        return self.compilation(Api.load_map(files, features=features))
+
+    def parse(self, source, features=None, lower=False):
+        """
+        Parses a single story, returning its pretty-printed tree.
+        """
+        story = Story(source, Features(features))
+        try:
+            story.parse(parser=None, lower=lower)
+        except StoryError as e:
+            e.with_color = False
+            return {'result': None, 'errors': [e.message()]}
+        return {'result': story.tree.pretty(), 'errors': []}
+
+    def lex(self, source, features=None):
+        """
+        Lexes a single story, returning a list of [type, value] tokens.
+        """
+        tokens = Story(source, Features(features)).lex(parser=None)
+        return {'result': [[token.type, token.value] for token in tokens],
+                'errors': []}
+
+    def handle(self, request):
+        """
+        Handles a single request and returns the response.
+        """
+        request_id = None
+        try:
+            request = json.loads(request)
+            request_id = request.get('id')
+            method = request['method']
+            if method not in self.methods:
+                return {'id': request_id,
+                        'error': f'Unknown method: {method}'}
+            params = request.get('params', {})
+            params.setdefault('features', self.features)
+            response = getattr(self, method)(**params)
+        except Exception as e:
+            return {'id': request_id, 'error': f'{type(e).__name__}: {e}'}
+        response['id'] = request_id
+        return response
+
+    def warm_up(self):
+        """
+        Loads the parser and compiler state by compiling an empty story.
+        """
+        Api.loads('', features=self.features)
+
+    def serve(self):
+        """
+        Answers requests until the input is closed.
+        """
+        self.warm_up()
+        for line in self.input:
+            if not line.strip():
+                continue
+            response = self.handle(line)
+            self.output.write(json.dumps(response) + '\n')
+            self.output.flush()
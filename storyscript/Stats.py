@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import time
+from contextlib import contextmanager
+
+
+class Stats:
+    """
+    Records the time spent in each compiler phase of a story and counters
+    about its compilation (e.g. the number of tokens).
+    """
+
+    # descriptions of the counters
+    counter_names = {
+        'tokens': 'tokens read by the parser',
+        'nodes': 'nodes of the syntax tree',
+        'fake_lines': 'lines inserted by the lowering',
+        'reparses': 'string templates parsed by the lowering',
+        'mutation_hits': 'mutation calls instantiated from the cache',
+        'mutation_misses': 'mutation calls instantiated anew',
+    }
+
+    def __init__(self):
+        # seconds spent in each phase, in the order of the phases
+        self.timings = {}
+        self.counters = {}
+
+    def add_time(self, phase, seconds):
+        """
+        Adds the time spent in a phase.
+        """
+        self.timings[phase] = self.timings.get(phase, 0) + seconds
+
+    @contextmanager
+    def timer(self, phase):
+        """
+        Measures the time spent in the block as time of `phase`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def count(self, name, value=1):
+        """
+        Increases a counter.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def total(self):
+        """
+        Returns the time spent in all phases.
+        """
+        return sum(self.timings.values())
+
+    def as_dict(self):
+        return {'timings': dict(self.timings), 'counters': dict(self.counters)}
+
+    def __str__(self):
+        lines = []
+        for phase, seconds in self.timings.items():
+            lines.append(f'{phase:>16}: {seconds * 1000:8.3f}ms')
+        lines.append(f'{"total":>16}: {self.total() * 1000:8.3f}ms')
+        for name, value in self.counters.items():
+            description = self.counter_names.get(name, name)
+            lines.append(f'{value:>16}  {description}')
+        return '\n'.join(lines)
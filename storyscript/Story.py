@@ -2,14 +2,10 @@
 import os
 from functools import lru_cache
 
-from bom_open import bom_open
-
-from lark.exceptions import UnexpectedInput, UnexpectedToken
-
-from .compiler import Compiler
-from .compiler.lowering import Lowering
 from .exceptions import CompilerError, StoryError, StorySyntaxError
-from .parser import Parser
+
+# The parser, the compiler and their dependencies are imported on first use,
+# s.t. importing storyscript (e.g. for the Api) stays cheap.
 
 
 @lru_cache(maxsize=1)
@@ -17,6 +13,7 @@ def _parser():
     """
     Cached instance of the parser
     """
+    from .parser import Parser
     return Parser()
 
 
@@ -31,12 +28,15 @@ class Story:
         self.path = path
         self.lines = story.splitlines(keepends=False)
         self.features = features
+        # timings and counters of the compilation (a Stats object)
+        self.stats = None
 
     @classmethod
     def read(cls, path):
         """
         Reads a story
         """
+        from bom_open import bom_open
         has_error = False
         try:
             with bom_open(path, 'r') as file:
@@ -74,11 +74,14 @@ class Story:
         """
         Parses the story, storing the tree
         """
+        from lark.exceptions import UnexpectedInput, UnexpectedToken
+        from .compiler.lowering import Lowering
         if parser is None:
             parser = self._parser()
         try:
             self.tree = parser.parse(self.story,
-                                     allow_single_quotes=allow_single_quotes)
+                                     allow_single_quotes=allow_single_quotes,
+                                     stats=self.stats)
             if lower:
                 proc = Lowering(parser, features=self.features)
                 self.tree = proc.process(self.tree)
@@ -93,9 +96,11 @@ class Story:
         """
         Compiles the story and stores the result.
         """
+        from .compiler import Compiler
         try:
             self.compiled = Compiler.compile(self.tree, story=self,
-                                             features=self.features)
+                                             features=self.features,
+                                             stats=self.stats)
         except (CompilerError, StorySyntaxError) as error:
             raise self.error(error) from error
 
@@ -1,15 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import io
-import subprocess
+import os
+import sys
+from functools import lru_cache
 from os import path
 
-import pkg_resources
-
 root_dir = path.abspath(path.dirname(path.dirname(__file__)))
 
 
 def git_version():
+    import subprocess
     return subprocess.run(
         ['git', 'describe', '--abbrev=0', '--tags'],
         stdout=subprocess.PIPE,
@@ -21,6 +22,7 @@ def git_version():
 
 
 def git_describe():
+    import subprocess
     return subprocess.run(
         ['git', 'describe', '--dirty', '--tags'],
         stdout=subprocess.PIPE,
@@ -31,17 +33,116 @@ def git_describe():
     ).stdout.strip()
 
 
+def git_state():
+    """
+    Returns a key for the state of the git checkout, which changes with new
+    commits, tags, branches or changes to the index.
+    Edits of the working tree don't change it.
+    Returns `None` if there's no git directory.
+    """
+    git_dir = path.join(root_dir, '.git')
+    if not path.isdir(git_dir):
+        return None
+    with io.open(path.join(git_dir, 'HEAD'), 'r', encoding='utf8') as f:
+        head = f.read().strip()
+    state = [head]
+    files = ['index', 'packed-refs', path.join('refs', 'tags')]
+    if head.startswith('ref: '):
+        files.append(head[5:])
+    for name in files:
+        try:
+            state.append(str(os.stat(path.join(git_dir, name)).st_mtime_ns))
+        except OSError:
+            state.append('')
+    return ':'.join(state)
+
+
+def git_memo_path():
+    """
+    Returns the file of the user cache directory which memoizes the git
+    versions of this checkout. setup.py runs this module on its own, thus
+    the directory is found like ParserCache.default_directory without
+    importing it.
+    """
+    import hashlib
+    directory = os.getenv('STORYSCRIPT_CACHE_DIR')
+    if not directory:
+        base = os.getenv('XDG_CACHE_HOME')
+        if not base:
+            base = path.join(path.expanduser('~'), '.cache')
+        directory = path.join(base, 'storyscript')
+    checkout = hashlib.sha256(root_dir.encode('utf8')).hexdigest()
+    return path.join(directory, 'version', f'{checkout}.json')
+
+
+def read_git_memo(state):
+    """
+    Reads the git versions memoized for the state of the checkout.
+    """
+    import json
+    try:
+        with io.open(git_memo_path(), 'r', encoding='utf8') as f:
+            memo = json.load(f)
+    except Exception:
+        return {'state': state}
+    if not isinstance(memo, dict) or memo.get('state') != state:
+        return {'state': state}
+    return memo
+
+
+def write_git_memo(memo):
+    import json
+    memo_path = git_memo_path()
+    try:
+        os.makedirs(path.dirname(memo_path), exist_ok=True)
+        with io.open(memo_path, 'w', encoding='utf8') as f:
+            json.dump(memo, f)
+    except OSError:
+        # the memo is only an optimization
+        pass
+
+
+def run_git(describe):
+    try:
+        return describe()
+    except Exception:
+        return None
+
+
+def memoized_git(describe):
+    """
+    Returns the result of a git describe function or `None` if git failed.
+    Results are memoized in the cache directory, s.t. git only runs again
+    when the checkout changed. Edits of the working tree aren't noticed, thus
+    the results must not depend on them (e.g. --dirty).
+    """
+    state = git_state()
+    if state is None:
+        return run_git(describe)
+    memo = read_git_memo(state)
+    name = describe.__name__
+    if name not in memo:
+        memo[name] = run_git(describe)
+        write_git_memo(memo)
+    return memo[name]
+
+
 def read_version_file():
     return io.open(path.join(root_dir, 'storyscript', 'VERSION'), 'r',
                    encoding='utf8').read().strip()
 
 
 def read_version_package():
+    # importing pkg_resources is slow, thus it's only done when needed
+    import pkg_resources
     resource_package = 'storyscript'
     ver = pkg_resources.resource_string(resource_package, 'VERSION')
     return ver.decode('utf8').strip()
 
 
+# The version is a constant which isn't going to change over the program
+# lifetime, thus it's only read once when it's first needed
+@lru_cache(maxsize=1)
 def read_version():
     try:
         return read_version_file()
@@ -52,40 +153,48 @@ def read_version():
             return None
 
 
-# The version is a constant which isn't going to change over the program
-# lifetime
-_version = read_version()
-
-
+@lru_cache(maxsize=1)
 def get_version():
     # try to read a VERSION file (e.g. for a released storyscript)
-    if _version is not None:
-        return _version
+    version = read_version()
+    if version is not None:
+        return version
 
-    # detect a git version (for development builds)
-    try:
-        return git_describe()
-    except Exception:
-        pass
+    # detect a git version (for development builds), which notices edits of
+    # the checkout with --dirty, thus it can't be memoized. Checking the
+    # working tree for edits without git would be slower than git itself.
+    version = run_git(git_describe)
+    if version is not None:
+        return version
 
     # soft fallback in case everything fails
     return '0.0.0'
 
 
+@lru_cache(maxsize=1)
 def get_release_version():
     # try to read a VERSION file (e.g. for a released storyscript)
-    if _version is not None:
-        return _version
+    version = read_version()
+    if version is not None:
+        return version
 
     # detect a git version (for development builds)
-    try:
-        return git_version()
-    except Exception:
-        pass
+    version = memoized_git(git_version)
+    if version is not None:
+        return version
 
     # soft fallback in case everything fails
     return '0.0.0'
 
 
-version = get_version()
-release_version = get_release_version()
+if sys.version_info < (3, 7):
+    # modules can only resolve attributes lazily since Python 3.7
+    version = get_version()
+    release_version = get_release_version()
+else:
+    def __getattr__(name):
+        if name == 'version':
+            return get_version()
+        if name == 'release_version':
+            return get_release_version()
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+import click
+
+from .Bundle import Bundle
+from .exceptions import StoryError
+
+
+class Watcher:
+    """
+    Polls the stories of a path and recompiles the stories that changed.
+    The parser and the results of unchanged stories are kept between
+    compilations.
+    """
+
+    # seconds between two polls of the story files
+    interval = 0.5
+    # seconds for which the files must stay unchanged before compiling
+    debounce = 0.2
+
+    def __init__(self, path, ignored_path=None, ebnf=None, features=None,
+                 cache=None):
+        self.path = path
+        self.bundle = Bundle(features=features)
+        self.parser = self.bundle.parser(ebnf)
+        self.cache = cache
+        self.ignores = []
+        if os.path.isdir(path):
+            self.ignores = Bundle.find_ignores(ignored_path)
+        self.mtimes = {}
+
+    def stories(self):
+        """
+        Finds the stories to watch.
+        """
+        if os.path.isdir(self.path):
+            return Bundle.parse_directory(self.path, ignores=self.ignores)
+        return [os.path.relpath(self.path)]
+
+    def snapshot(self):
+        """
+        Returns the modification times of all watched stories.
+        """
+        mtimes = {}
+        for story in self.stories():
+            try:
+                mtimes[story] = os.stat(story).st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def wait_until_stable(self, mtimes):
+        """
+        Waits until no story has been modified for `debounce` seconds, s.t.
+        editors that write files in several steps trigger one compilation.
+        """
+        while True:
+            time.sleep(self.debounce)
+            current = self.snapshot()
+            if current == mtimes:
+                return current
+            mtimes = current
+
+    def remove(self, story):
+        """
+        Forgets a story that has been removed.
+        """
+        self.bundle.story_files.pop(story, None)
+        self.bundle.stories.pop(story, None)
+        click.echo(f'{story}: removed')
+
+    def compile(self, story):
+        """
+        Reads and compiles a single story, printing the time it took.
+        """
+        self.bundle.story_files.pop(story, None)
+        start = time.perf_counter()
+        try:
+            self.bundle.compile([story], parser=self.parser, cache=self.cache)
+        except StoryError as e:
+            self.bundle.stories.pop(story, None)
+            e.echo()
+            return
+        except Exception as e:
+            self.bundle.stories.pop(story, None)
+            StoryError.internal_error(e).echo()
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        click.echo(f'{story}: compiled in {elapsed:.1f}ms')
+
+    def update(self, mtimes):
+        """
+        Recompiles the stories that changed since the previous update.
+        """
+        for story in self.mtimes:
+            if story not in mtimes:
+                self.remove(story)
+        for story, mtime in mtimes.items():
+            if self.mtimes.get(story) != mtime:
+                self.compile(story)
+        self.mtimes = mtimes
+
+    def watch(self):
+        """
+        Compiles all stories and then recompiles them on every change,
+        until interrupted.
+        """
+        self.update(self.snapshot())
+        click.echo(f'Watching {self.path} for changes...')
+        while True:
+            time.sleep(self.interval)
+            mtimes = self.snapshot()
+            if mtimes != self.mtimes:
+                self.update(self.wait_until_stable(mtimes))
@@ -1,11 +1,20 @@
 # -*- coding: utf-8 -*-
-from .Api import Api
-from .Version import version
-
+import sys
 
-__version__ = version = version
+from .Api import Api
+from .Version import get_version
 
 
 loads = Api.loads
 load = Api.load
 load_map = Api.load_map
+
+if sys.version_info < (3, 7):
+    # modules can only resolve attributes lazily since Python 3.7
+    __version__ = version = get_version()
+else:
+    def __getattr__(name):
+        # resolving the version might need git, thus it's done on first use
+        if name in ('version', '__version__'):
+            return get_version()
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
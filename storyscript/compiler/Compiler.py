@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import time
+
 from storyscript.compiler.json.JSONCompiler import JSONCompiler
 from storyscript.compiler.lowering.Lowering import Lowering
 from storyscript.compiler.semantics.Semantics import Semantics
@@ -7,16 +9,34 @@ from storyscript.compiler.semantics.Semantics import Semantics
 class Compiler:
 
     @classmethod
-    def generate(cls, tree, features):
+    def generate(cls, tree, features, stats=None):
         """
         Parses an AST and checks it.
+        The time of each phase is recorded in `stats` (a Stats object) if
+        given.
         """
-        tree = Lowering(parser=tree.parser, features=features).process(tree)
-        return Semantics(features=features).process(tree)
+        lowering = Lowering(parser=tree.parser, features=features)
+        tree = lowering.process(tree)
+        if stats is not None:
+            stats.add_time('Lowering', sum(lowering.timings.values()))
+            stats.count('reparses', lowering.reparses)
+            stats.count('fake_lines', Lowering.fake_lines(tree))
+        semantics = Semantics(features=features)
+        tree = semantics.process(tree)
+        if stats is not None:
+            for name, seconds in semantics.timings.items():
+                stats.add_time(name, seconds)
+            stats.count('mutation_hits', semantics.mutation_cache.hits)
+            stats.count('mutation_misses', semantics.mutation_cache.misses)
+        return tree
 
     @classmethod
-    def compile(cls, tree, story, features, backend='json'):
+    def compile(cls, tree, story, features, backend='json', stats=None):
         assert backend == 'json'
         compiler = JSONCompiler(story)
-        tree = cls.generate(tree, features)
-        return compiler.compile(tree)
+        tree = cls.generate(tree, features, stats)
+        start = time.perf_counter()
+        result = compiler.compile(tree)
+        if stats is not None:
+            stats.add_time('JSONCompiler', time.perf_counter() - start)
+        return result
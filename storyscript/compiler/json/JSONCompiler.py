@@ -1,18 +1,29 @@
 # -*- coding: utf-8 -*-
-from storyscript.Version import version
+from storyscript.Version import get_version
 from storyscript.exceptions import StorySyntaxError
 from storyscript.exceptions import internal_assert
-from storyscript.parser import Tree
+from storyscript.parser import Tree, TreeVisitor
 
 from .Lines import Lines
 from .Objects import Objects
 
 
-class JSONCompiler:
+class JSONCompiler(TreeVisitor):
 
     """
     Compiles Storyscript abstract syntax tree to JSON.
     """
+
+    # trees which are compiled by their method, all other trees are searched
+    # for deeper trees
+    allowed_nodes = frozenset([
+        'service_block', 'absolute_expression', 'assignment', 'if_block',
+        'elseif_block', 'else_block', 'foreach_block', 'function_block',
+        'when_block', 'try_block', 'return_statement', 'arguments',
+        'while_block', 'throw_statement', 'break_statement',
+        'continue_statement', 'mutation_block', 'indented_chain',
+    ])
+
     def __init__(self, story):
         self.lines = Lines(story)
         self.objects = Objects()
@@ -433,15 +444,8 @@ class JSONCompiler:
         Parses a subtree, checking whether it should be compiled directly
         or keep parsing for deeper trees.
         """
-        allowed_nodes = ['service_block', 'absolute_expression', 'assignment',
-                         'if_block', 'elseif_block', 'else_block',
-                         'foreach_block', 'function_block', 'when_block',
-                         'try_block', 'return_statement', 'arguments',
-                         'while_block', 'throw_statement', 'break_statement',
-                         'continue_statement', 'mutation_block',
-                         'indented_chain']
-        if tree.data in allowed_nodes:
-            getattr(self, tree.data)(tree, parent)
+        if tree.data in self.allowed_nodes:
+            self.handler(tree.data)(tree, parent)
         else:
             self.parse_tree(tree, parent=parent)
 
@@ -461,4 +465,4 @@ class JSONCompiler:
         lines = self.lines
         return {'tree': lines.lines, 'services': lines.get_services(),
                 'entrypoint': lines.entrypoint(), 'functions': lines.functions,
-                'version': version}
+                'version': get_version()}
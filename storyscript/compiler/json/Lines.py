@@ -6,15 +6,24 @@ class Lines:
     """
     Holds compiled lines and provides methods for operation on lines.
     """
+
+    # methods of the lines whose exit is set by set_exit
+    exit_methods = ('if', 'elif', 'try', 'catch')
+
     def __init__(self, story):
         self.story = story
         self.lines = {}
         self._lines = []  # sorted line nr (by insertion)
-        self.variables = []
+        self.variables = set()
         self.services = []
         self.functions = {}
         self.output_scopes = {}
+        # the outputs of each scope, including those of its parents
+        self.scope_outputs = {}
         self.finished_scopes = []
+        # the last line whose exit is set by a following elif/else or
+        # catch/finally line
+        self.exit_line = None
 
     def entrypoint(self):
         """
@@ -49,7 +58,9 @@ class Lines:
         if previous_line is not None:
             previous_line['name'] = name
 
-        self.variables.append(name)
+        # only the names can be looked up, the fragments of a path are
+        # objects
+        self.variables.update(n for n in name if isinstance(n, str))
 
     def set_next(self, line_number):
         """
@@ -64,12 +75,9 @@ class Lines:
         Sets the current line as the exit line for a previous one, as needed
         in if/elif/else and try/catch/finally blocks.
         """
-        methods = ['if', 'elif', 'try', 'catch']
-        for line_number in self._lines[::-1]:
-            if self.lines[line_number]['method'] in methods:
-                self.finished_scopes = []
-                self.lines[line_number]['exit'] = line
-                break
+        if self.exit_line is not None:
+            self.finished_scopes = []
+            self.lines[self.exit_line]['exit'] = line
 
     def set_scope(self, line, parent, output=[]):
         """
@@ -77,6 +85,11 @@ class Lines:
         nested children.
         """
         self.output_scopes[line] = {'parent': parent, 'output': output}
+        outputs = set(output)
+        if parent in self.scope_outputs:
+            assert parent != line
+            outputs.update(self.scope_outputs[parent])
+        self.scope_outputs[line] = outputs
 
     def finish_scope(self, line):
         """
@@ -90,14 +103,7 @@ class Lines:
         Checks whether a service has been defined as output for this block
         or for its parents.
         """
-        if parent in self.output_scopes:
-            scope = self.output_scopes[parent]
-            if service in scope['output']:
-                return True
-            if scope['parent']:
-                assert scope['parent'] != parent
-                return self.is_output(scope['parent'], service)
-        return False
+        return service in self.scope_outputs.get(parent, ())
 
     def make(self, method, position, name=None, args=None, service=None,
              command=None, function=None, output=None, enter=None, exit=None,
@@ -127,6 +133,8 @@ class Lines:
         }
         # save insertion order
         self._lines.append(position.line)
+        if method in self.exit_methods:
+            self.exit_line = position.line
 
     def check_service_name(self, service, line):
         """
@@ -166,10 +174,9 @@ class Lines:
         """
         Checks whether a variable has been defined so far
         """
-        for vs in self.variables:
-            if variable_name in vs:
-                return True
-        return False
+        # paths of objects are never defined as a variable name
+        return isinstance(variable_name, str) and \
+            variable_name in self.variables
 
     def _as_none(self, value):
         return value if value != 'None' else None
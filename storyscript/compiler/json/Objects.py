@@ -172,13 +172,27 @@ class Objects:
         return {'$OBJECT': 'range', 'range': r}
 
     def list(self, tree):
+        return self.expr_visitor.literal(self.list_items(tree))
+
+    def list_items(self, tree):
+        """
+        Compiles a list, receiving the compiled items it yields (see
+        ExpressionVisitor.literal).
+        """
         items = []
         for value in tree.children:
             if isinstance(value, Tree):
-                items.append(self.base_expression(value))
+                items.append((yield value))
         return {'$OBJECT': 'list', 'items': items}
 
     def map(self, tree):
+        return self.expr_visitor.literal(self.map_items(tree))
+
+    def map_items(self, tree):
+        """
+        Compiles a map, receiving the compiled values it yields (see
+        ExpressionVisitor.literal).
+        """
         items = []
         for item in tree.children:
             child = item.child(0)
@@ -191,7 +205,7 @@ class Objects:
             else:
                 internal_assert(child.data == 'path')
                 key = self.path(child)
-            value = self.base_expression(item.child(1))
+            value = yield item.child(1)
             items.append([key, value])
         return {'$OBJECT': 'dict', 'items': items}
 
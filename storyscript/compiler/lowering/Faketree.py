@@ -16,6 +16,15 @@ class FakeTree:
         self.original_line = str(block.line())
         self.new_lines = {}
         self._check_existing_fake_lines(block)
+        # The new assignments are only inserted into the block by `splice`.
+        # `groups[i]` holds the assignments inserted before the i-th child
+        # of the block. It's built when the first assignment is added.
+        self.groups = None
+        # the line of a child mapped to the index of the first child with it
+        self.child_lines = None
+        # the line of a new assignment mapped to (group index, assignment)
+        # of the first new assignment with it
+        self.inserted_lines = {}
 
     def _check_existing_fake_lines(self, block):
         for child in block.children:
@@ -62,11 +71,12 @@ class FakeTree:
         """
         Updates the line for all tokens of a given `node`.
         """
-        for child in node.children:
-            if isinstance(child, Token):
-                child.line = line
-            else:
-                self.mark_line(child, line)
+        def enter(tree):
+            for child in tree.children:
+                if isinstance(child, Token):
+                    child.line = line
+
+        Tree.traverse(node, enter=enter)
 
     def assignment(self, value):
         """
@@ -92,17 +102,51 @@ class FakeTree:
         fragment = Tree('assignment_fragment', [equals, expr])
         return Tree('assignment', [path, fragment])
 
-    def find_insert_pos(self, original_line):
+    def index_children(self):
+        """
+        Computes the line of every child of the block once.
         """
-        Finds the insert position for a targeted line in the fake tree block.
+        self.groups = [[] for child in self.block.children]
+        self.child_lines = {}
+        for i, child in enumerate(self.block.children):
+            self.child_lines.setdefault(child.line(), i)
+
+    def find_insert_pos(self, original_line):
         """
-        for i, n in enumerate(self.block.children):
-            line = n.line()
-            if line == original_line:
-                return i
+        Finds the insert position for a targeted line in the fake tree block:
+        before the first child or new assignment with this line.
+        Returns the index of the group and the new assignment before which
+        to insert (`None` to insert at the end of the group).
+        """
+        if self.groups is None:
+            self.index_children()
+        child = self.child_lines.get(original_line)
+        inserted = self.inserted_lines.get(original_line)
+        if inserted is not None and (child is None or inserted[0] <= child):
+            return inserted
+        if child is not None:
+            return child, None
         # use the last position as insert position by default
         # this inserts the new assignment node _before_ the last node
-        return -1
+        return len(self.groups) - 1, None
+
+    def insert(self, position, assignment):
+        """
+        Inserts a new assignment at a position of `find_insert_pos`.
+        """
+        group_index, before = position
+        group = self.groups[group_index]
+        if before is None:
+            group.append(assignment)
+        else:
+            group.insert(group.index(before), assignment)
+
+        line = assignment.line()
+        first = self.inserted_lines.get(line)
+        if first is None or group_index < first[0] or \
+                (group_index == first[0] and
+                 group.index(assignment) < group.index(first[1])):
+            self.inserted_lines[line] = (group_index, assignment)
 
     def add_assignment(self, value, original_line):
         """
@@ -113,12 +157,7 @@ class FakeTree:
 
         insert_pos = self.find_insert_pos(original_line)
         assignment = self.assignment(value)
-
-        self.block.children = [
-            *self.block.children[:insert_pos],
-            assignment,
-            *self.block.children[insert_pos:],
-        ]
+        self.insert(insert_pos, assignment)
 
         # we need a new node, s.t. already inserted
         # fake nodes don't get changed
@@ -126,3 +165,19 @@ class FakeTree:
         name = Tree.create_token_from_tok(path_tok, 'NAME', path_tok.value)
         name.line = original_line
         return Tree('path', [name])
+
+    def splice(self):
+        """
+        Inserts all new assignments into the block at once.
+        Must be called before the children of the block are used again.
+        """
+        if not self.inserted_lines:
+            return
+        children = []
+        for group, child in zip(self.groups, self.block.children):
+            children.extend(group)
+            children.append(child)
+        self.block.children = children
+        self.groups = None
+        self.child_lines = None
+        self.inserted_lines = {}
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import time
 from enum import Enum
 
 from lark.lexer import Token
@@ -22,6 +23,11 @@ class Lowering:
     too complicated for the Transformer, before the tree is compiled.
     """
 
+    # The passes in the order in which they are applied by `process`.
+    # Rewrites that don't depend on each other share a single traversal.
+    passes = ('concise_when', 'expressions', 'assignments',
+              'string_templates', 'inline_expressions')
+
     def __init__(self, parser, features):
         """
         Saves the used parser as it might be used again for re-evaluation
@@ -29,6 +35,10 @@ class Lowering:
         """
         self.parser = parser
         self.features = features
+        # seconds spent in each pass
+        self.timings = {}
+        # the number of string templates parsed by `eval`
+        self.reparses = 0
 
     @staticmethod
     def fake_tree(block):
@@ -37,6 +47,19 @@ class Lowering:
         """
         return FakeTree(block)
 
+    @staticmethod
+    def fake_lines(tree):
+        """
+        Returns the number of lines inserted into a lowered tree.
+        """
+        count = 0
+        for assignment in tree.find_data('assignment'):
+            path = assignment.path
+            if path is not None and \
+                    path.find_first_token().value.startswith(FakeTree.prefix):
+                count += 1
+        return count
+
     @classmethod
     def replace_expression(cls, node, fake_tree, insert_point):
         """
@@ -64,9 +87,32 @@ class Lowering:
         insert_point.replace(0, fake_path.child(0))
 
     @classmethod
-    def visit(cls, node, block, entity, pred, fun, parent):
-        if not hasattr(node, 'children') or len(node.children) == 0:
-            return
+    def visit(cls, node, block, entity, pred, fun, parent, pre=None):
+        # the block, entity and parent of the trees being visited
+        context = [(block, entity, parent)]
+
+        def enter(node):
+            if len(node.children) == 0:
+                return False
+            block, entity = context[-1][:2]
+            context.append(cls.enter_visit(node, block, entity, pre))
+
+        def exit(node):
+            block, entity, node = context.pop()
+            parent = context[-1][2]
+            cls.exit_visit(node, block, entity, pred, fun, parent)
+
+        Tree.traverse(node, enter=enter, exit=exit)
+
+    @classmethod
+    def enter_visit(cls, node, block, entity, pre):
+        """
+        Returns the block, entity and parent for the children of `node`.
+        """
+        if pre is not None:
+            # rewrites of this node that must happen before its children
+            # are visited
+            pre(node)
 
         if node.data == 'block':
             # only generate a fake_block once for every line
@@ -78,9 +124,16 @@ class Lowering:
             entity = node
         elif node.data == 'service' and node.child(0).data == 'path':
             entity = node
+        return block, entity, node
 
-        for c in node.children:
-            cls.visit(c, block, entity, pred, fun, parent=node)
+    @classmethod
+    def exit_visit(cls, node, block, entity, pred, fun, parent):
+        """
+        Creates the fake lines for `node` after its children were visited.
+        """
+        if node.data == 'block':
+            # insert all fake lines of this block at once
+            block.splice()
 
         # create fake lines for base_expressions too, but only when required:
         # 1) `expressions` are already allowed to be nested
@@ -102,6 +155,8 @@ class Lowering:
 
             # Evaluate from leaf to the top
             fun(node, fake_tree, entity.path)
+            if fake_tree is not block:
+                fake_tree.splice()
 
             # split services into service calls and mutations
             if entity.data == 'service':
@@ -211,14 +266,11 @@ class Lowering:
                 'string': buf
             }
 
-    def eval(self, orig_node, code_string, fake_tree):
+    def parse_story(self, orig_node, code_string, column):
         """
-        Evaluates a string by parsing it to its AST representation.
-        Inserts the AST expression as fake_node and returns the path
-        reference to the inserted fake_node.
+        Parses the code of a string template as a complete story. This is
+        slower than `Parser.parse_template`, but reports invalid code.
         """
-        line = orig_node.line()
-        column = int(orig_node.column()) + 1
         # add whitespace as padding to fixup the column location of the
         # resulting tokens.
         from storyscript.Story import Story
@@ -233,6 +285,25 @@ class Lowering:
             orig_node.expect(len(new_node.children) == 1,
                              'string_templates_no_assignment')
             new_node = new_node.children[0]
+        return new_node
+
+    def eval(self, orig_node, code_string, fake_tree):
+        """
+        Evaluates a string by parsing it to its AST representation.
+        Inserts the AST expression as fake_node and returns the path
+        reference to the inserted fake_node.
+        """
+        line = orig_node.line()
+        column = int(orig_node.column()) + 1
+        parses = self.parser.template_parses
+        new_node = self.parser.parse_template(code_string, column)
+        # memoized templates aren't parsed again
+        self.reparses += self.parser.template_parses - parses
+        if new_node is None:
+            self.reparses += 1
+            new_node = self.parse_story(orig_node, code_string, column)
+        else:
+            new_node = new_node.children[0]
         # for now only expressions or service_blocks are allowed inside string
         # templates
         if new_node.data == 'service_block' and \
@@ -326,6 +397,9 @@ class Lowering:
         Otherwise, the string concatenation will be inserted as a new AST node.
         """
         entity = node.entity
+        # follow_node_chain visits all subtrees, e.g. of nested lists
+        if entity.follow(['values', 'string']) is None:
+            return
         string_node = entity.follow_node_chain(['entity', 'values', 'string'])
         if string_node is None:
             return
@@ -344,8 +418,7 @@ class Lowering:
             # no further AST modifications required
             return
 
-        fake_tree = self.fake_tree(block)
-        children = self.concat_string_templates(fake_tree, string_node,
+        children = self.concat_string_templates(block, string_node,
                                                 string_objs)
         new_node = self.add_strings(*children)
 
@@ -357,19 +430,28 @@ class Lowering:
         """
         Iterates the AST and evaluates string templates.
         """
-        if not hasattr(node, 'children'):
-            return
+        # the block and parent of the trees being visited
+        context = [(block, parent)]
 
-        if node.data == 'block':
-            block = node
+        def enter(node):
+            block = context[-1][0]
+            if node.data == 'block':
+                block = self.fake_tree(node)
+            context.append((block, node))
+
+        def exit(node):
+            block = context.pop()[0]
+            parent = context[-1][1]
+            if node.data == 'block':
+                # insert all fake lines of this block at once
+                block.splice()
 
-        for c in node.children:
-            self.visit_string_templates(c, block, node)
+            # leaf-to-to to avoid double execution
+            if node.data == 'expression':
+                if node.entity is not None:
+                    self.inline_string_templates(node, block, parent)
 
-        # leaf-to-to to avoid double execution
-        if node.data == 'expression':
-            if node.entity is not None:
-                self.inline_string_templates(node, block, parent)
+        Tree.traverse(node, enter=enter, exit=exit)
 
     def visit_concise_when(self, node):
         """
@@ -384,7 +466,7 @@ class Lowering:
             fake_tree = self.fake_tree(node)
             for i, c in enumerate(node.children):
                 if c.data == 'concise_when_block':
-                    node.children[i] = self.process_concise_block(c, fake_tree)
+                    node.replace(i, self.process_concise_block(c, fake_tree))
 
     def process_concise_block(self, node, fake_tree):
         """
@@ -426,51 +508,68 @@ class Lowering:
         """
         Visit assignments and lower destructors
         """
-        if not hasattr(node, 'children') or len(node.children) == 0:
-            return
+        # the block and parent of the trees being visited
+        context = [(block, parent)]
 
-        if node.data == 'block':
-            # only generate a fake_block once for every line
-            # node: block in which the fake assignments should be inserted
-            block = self.fake_tree(node)
+        def enter(node):
+            if len(node.children) == 0:
+                return False
+            block, parent = context[-1]
+            if node.data == 'block':
+                # only generate a fake_block once for every line
+                # node: block in which the fake assignments should be
+                # inserted
+                block = self.fake_tree(node)
+            if node.data == 'assignment':
+                self.lower_assignment(node, block, parent)
+                return False
+            context.append((block, node))
 
-        if node.data == 'assignment':
-            c = node.children[0]
+        def exit(node):
+            block = context.pop()[0]
+            if node.data == 'block':
+                # insert all fake lines of this block at once
+                block.splice()
 
-            if c.data == 'path':
-                # a path assignment -> no processing required
-                pass
-            else:
-                assert c.data == 'assignment_destructoring'
-                line = node.line()
-                base_expr = node.assignment_fragment.base_expression
-                orig_node = Tree('base_expression', base_expr.children)
-                orig_obj = block.add_assignment(orig_node, original_line=line)
-                for i, n in enumerate(c.children):
-                    new_line = block.line()
-                    n.expect(len(n.children) == 1,
-                             'object_destructoring_invalid_path')
-                    name = n.child(0)
-                    name.line = new_line  # update token's line info
-                    # <n> = <val>
-                    val = self.create_entity(Tree('path', [
-                        orig_obj.child(0),
-                        Tree('path_fragment', [
-                            Tree('string', [name])
-                        ])
-                    ]))
-                    if i + 1 == len(c.children):
-                        # for the last entry, we can recycle the existing node
-                        node.children[0] = n
-                        node.assignment_fragment.base_expression.children = \
-                            [val]
-                    else:
-                        # insert new fake line
-                        a = block.assignment_path(n, val, new_line)
-                        parent.children.insert(0, a)
+        Tree.traverse(node, enter=enter, exit=exit)
+
+    def lower_assignment(self, node, block, parent):
+        """
+        Lowers a destructoring assignment into one assignment per name.
+        """
+        c = node.children[0]
+
+        if c.data == 'path':
+            # a path assignment -> no processing required
+            pass
         else:
-            for c in node.children:
-                self.visit_assignment(c, block, parent=node)
+            assert c.data == 'assignment_destructoring'
+            line = node.line()
+            base_expr = node.assignment_fragment.base_expression
+            orig_node = Tree('base_expression', base_expr.children)
+            orig_obj = block.add_assignment(orig_node, original_line=line)
+            for i, n in enumerate(c.children):
+                new_line = block.line()
+                n.expect(len(n.children) == 1,
+                         'object_destructoring_invalid_path')
+                name = n.child(0)
+                name.line = new_line  # update token's line info
+                # <n> = <val>
+                val = self.create_entity(Tree('path', [
+                    orig_obj.child(0),
+                    Tree('path_fragment', [
+                        Tree('string', [name])
+                    ])
+                ]))
+                if i + 1 == len(c.children):
+                    # for the last entry, we can recycle the existing node
+                    node.replace(0, n)
+                    node.assignment_fragment.base_expression.children = \
+                        [val]
+                else:
+                    # insert new fake line
+                    a = block.assignment_path(n, val, new_line)
+                    parent.insert(a)
 
     @classmethod
     def rewrite_cmp_expr(cls, node):
@@ -496,13 +595,10 @@ class Lowering:
             Tree('expression', node.children),
         ]
 
-    def visit_cmp_expr(self, node):
+    def lower_cmp_expr(self, node):
         """
-        Visit assignments and lower destructors
+        Rewrites comparisons with `!=`, `>=` and `>`.
         """
-        if not hasattr(node, 'children') or len(node.children) == 0:
-            return
-
         if node.data == 'expression' and node.kind == 'cmp_expression' and \
                 len(node.children) == 3:
             cmp_op = node.child(1)
@@ -513,30 +609,11 @@ class Lowering:
                     cmp_tok.type == 'GREATER':
                 self.rewrite_cmp_expr(node)
 
-        for c in node.children:
-            self.visit_cmp_expr(c)
-
-    def visit_arguments(self, node):
-        """
-        Transforms an argument tree. Short-hand argument (:foo) will be
-        expanded.
-        """
-        if not hasattr(node, 'children') or len(node.children) == 0:
-            return
-
-        if node.data == 'arguments':
-            Transformer.argument_shorthand(node)
-
-        for c in node.children:
-            self.visit_arguments(c)
-
-    def visit_as_expr(self, node, block):
+    def lower_as_expr(self, node, block):
         """
-        Visit assignments and move 'as' up the tree if required
+        Moves 'as' up the tree if required.
+        Returns the block of the outputs for the children of `node`.
         """
-        if not hasattr(node, 'children') or len(node.children) == 0:
-            return
-
         if node.data == 'foreach_block':
             block = node.foreach_statement
             assert block is not None
@@ -550,20 +627,38 @@ class Lowering:
             if as_op is not None and as_op.output_names is not None:
                 output = Tree('output', as_op.output_names.children)
                 node.expect(block is not None, 'service_no_inline_output')
-                block.children.append(output)
+                block.append(output)
                 node.children = [node.children[0].children[0]]
+        return block
 
-        for c in node.children:
-            self.visit_as_expr(c, block)
-
-    def visit_function_dot(self, node, block):
+    def visit_expressions(self, node, block):
         """
-        Visit function call with more than one path and lower
-        them into mutations.
+        Lowers comparisons, `as` expressions and short-hand arguments (:foo)
+        in a single traversal.
         """
-        if not hasattr(node, 'children') or len(node.children) == 0:
-            return
+        # the blocks of the outputs for the trees being visited
+        blocks = [block]
+
+        def enter(node):
+            if len(node.children) == 0:
+                return False
+            self.lower_cmp_expr(node)
+            blocks.append(self.lower_as_expr(node, blocks[-1]))
 
+        def exit(node):
+            blocks.pop()
+            # arguments are expanded after their expressions have been
+            # lowered
+            if node.data == 'arguments':
+                Transformer.argument_shorthand(node)
+
+        Tree.traverse(node, enter=enter, exit=exit)
+
+    @staticmethod
+    def lower_function_dot(node):
+        """
+        Lowers a function call with more than one path into a mutation.
+        """
         if node.data == 'call_expression':
             call_expr = node
             if len(call_expr.path.children) > 1:
@@ -581,21 +676,34 @@ class Lowering:
                 ]
                 call_expr.data = 'mutation'
 
-        for c in node.children:
-            self.visit_function_dot(c, block)
+    def pass_concise_when(self, tree):
+        self.visit_concise_when(tree)
+
+    def pass_expressions(self, tree):
+        self.visit_expressions(tree, block=None)
+
+    def pass_assignments(self, tree):
+        self.visit_assignment(tree, block=None, parent=None)
+
+    def pass_string_templates(self, tree):
+        # the trees parsed from string templates are only lowered by the
+        # passes that follow this one
+        self.visit_string_templates(tree, block=None, parent=None)
+
+    def pass_inline_expressions(self, tree):
+        # function calls are lowered into mutations, before their inline
+        # expressions are moved to new lines
+        self.visit(tree, None, None, Lowering.is_inline_expression,
+                   self.replace_expression, parent=None,
+                   pre=self.lower_function_dot)
 
     def process(self, tree):
         """
         Applies several preprocessing steps to the existing AST.
         """
-        pred = Lowering.is_inline_expression
-        self.visit_concise_when(tree)
-        self.visit_cmp_expr(tree)
-        self.visit_as_expr(tree, block=None)
-        self.visit_arguments(tree)
-        self.visit_assignment(tree, block=None, parent=None)
-        self.visit_string_templates(tree, block=None, parent=None)
-        self.visit_function_dot(tree, block=None)
-        self.visit(tree, None, None, pred,
-                   self.replace_expression, parent=None)
+        for name in self.passes:
+            start = time.perf_counter()
+            getattr(self, f'pass_{name}')(tree)
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0) + elapsed
         return tree
@@ -8,6 +8,7 @@ from storyscript.exceptions import CompilerError
 from storyscript.parser import Tree
 
 from .PathResolver import PathResolver
+from .functions.MutationCache import MutationCache
 from .symbols.Symbols import Symbol, base_symbol
 
 
@@ -203,18 +204,22 @@ class SymbolExpressionVisitor(ExpressionVisitor):
                 i += 1
             # check whether a tree child needs casting
             if t != target_type:
-                tree.children[i] = self.type_cast_expression(
-                    tree.children[i], target_type)
+                tree.replace(i, self.type_cast_expression(
+                    tree.children[i], target_type))
 
 
 class ExpressionResolver:
 
-    def __init__(self, symbol_resolver, function_table, mutation_table):
+    def __init__(self, symbol_resolver, function_table, mutation_table,
+                 mutation_cache=None):
         self.expr_visitor = SymbolExpressionVisitor(self)
         # how to resolve existing symbols
         self.path_resolver = PathResolver(symbol_resolver=symbol_resolver)
         self.function_table = function_table
         self.mutation_table = mutation_table
+        if mutation_cache is None:
+            mutation_cache = MutationCache()
+        self.mutation_cache = mutation_cache
 
     def path(self, tree):
         assert tree.data == 'path'
@@ -255,11 +260,18 @@ class ExpressionResolver:
 
     def list(self, tree):
         assert tree.data == 'list'
+        return self.expr_visitor.literal(self.list_items(tree))
+
+    def list_items(self, tree):
+        """
+        Resolves the type of a list, receiving the symbols of the yielded
+        items (see ExpressionVisitor.literal).
+        """
         value = None
         for i, c in enumerate(tree.children[1:]):
             if not isinstance(c, Tree):
                 continue
-            val = self.base_expression(c).type()
+            val = (yield c).type()
             if i >= 1:
                 # type mismatch in the list
                 if val != value:
@@ -273,6 +285,13 @@ class ExpressionResolver:
 
     def map(self, tree):
         assert tree.data == 'map'
+        return self.expr_visitor.literal(self.map_items(tree))
+
+    def map_items(self, tree):
+        """
+        Resolves the type of a map, receiving the symbols of the yielded
+        values (see ExpressionVisitor.literal).
+        """
         keys = []
         values = []
         for i, item in enumerate(tree.children):
@@ -288,7 +307,7 @@ class ExpressionResolver:
                 assert key_child.data == 'path'
                 new_key = self.path(key_child).type()
             keys.append(new_key)
-            values.append(self.base_expression(item.child(1)).type())
+            values.append((yield item.child(1)).type())
 
             # check all keys - even if they don't match
             key_child.expect(new_key.hashable(),
@@ -487,7 +506,7 @@ class ExpressionResolver:
         else:
             assert len(ms) == 1
             m = ms[0]
-            m = m.instantiate(t)
+            m = self.mutation_cache.instantiate(m, t)
             m.check_call(tree.mutation_fragment, args)
             return base_symbol(m.output())
 
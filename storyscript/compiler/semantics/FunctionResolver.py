@@ -19,6 +19,7 @@ class FunctionResolver(ScopeSelectiveVisitor):
             symbol_resolver=None,
             function_table=self.function_table,
             mutation_table=self.mutation_table,
+            mutation_cache=self.mutation_cache,
         )
 
     def block(self, tree, scope):
@@ -12,13 +12,15 @@ class ReturnVisitor:
     """
     Checks the return type of functions.
     """
-    def __init__(self, return_type, function_table, mutation_table):
+    def __init__(self, return_type, function_table, mutation_table,
+                 mutation_cache=None):
         self.return_type = return_type
         self.symbol_resolver = SymbolResolver(scope=None)
         self.resolver = ExpressionResolver(
             symbol_resolver=self.symbol_resolver,
             function_table=function_table,
             mutation_table=mutation_table,
+            mutation_cache=mutation_cache,
         )
 
     def has_return(self, tree):
@@ -87,6 +89,8 @@ class ReturnVisitor:
                 )
 
     @classmethod
-    def check(cls, tree, scope, return_type, function_table, mutation_table):
-        rv = ReturnVisitor(return_type, function_table, mutation_table)
+    def check(cls, tree, scope, return_type, function_table, mutation_table,
+              mutation_cache=None):
+        rv = ReturnVisitor(return_type, function_table, mutation_table,
+                           mutation_cache)
         rv.function_block(tree, scope)
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
+import time
 
 from .FunctionResolver import FunctionResolver
 from .TypeResolver import TypeResolver
 from .functions.FunctionTable import FunctionTable
+from .functions.MutationCache import MutationCache
 from .functions.MutationTable import MutationTable
 
 
@@ -13,15 +15,21 @@ class Semantics:
 
     def __init__(self, features):
         self.features = features
+        # seconds spent in each visitor
+        self.timings = {}
 
     visitors = [FunctionResolver, TypeResolver]
 
     def process(self, tree):
         self.function_table = FunctionTable()
         self.mutation_table = MutationTable.init()
+        self.mutation_cache = MutationCache()
         for visitor in self.visitors:
             v = visitor(function_table=self.function_table,
                         mutation_table=self.mutation_table,
-                        features=self.features)
+                        features=self.features,
+                        mutation_cache=self.mutation_cache)
+            start = time.perf_counter()
             v.visit(tree)
+            self.timings[visitor.__name__] = time.perf_counter() - start
         return tree
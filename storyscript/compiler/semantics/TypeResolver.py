@@ -50,6 +50,7 @@ class TypeResolver(ScopeSelectiveVisitor):
             symbol_resolver=self.symbol_resolver,
             function_table=self.function_table,
             mutation_table=self.mutation_table,
+            mutation_cache=self.mutation_cache,
         )
         self.path_symbol_resolver = SymbolResolver(
             scope=None, check_variable_existence=False)
@@ -91,7 +92,7 @@ class TypeResolver(ScopeSelectiveVisitor):
                                             'assignment_type_none')
             sym = Symbol(target_symbol.name(), expr_type,
                          storage_class=storage_class)
-            scope.symbols().insert(sym)
+            scope.insert(sym)
         else:
             tree.expect(target_symbol.type().can_be_assigned(expr_type),
                         'type_assignment_different',
@@ -126,7 +127,7 @@ class TypeResolver(ScopeSelectiveVisitor):
             else:
                 command = tree.service.path.child(0)
             output = Tree('output', [command])
-            fragment.children.append(output)
+            fragment.append(output)
 
     def foreach_block(self, tree, scope):
         """
@@ -298,7 +299,8 @@ class TypeResolver(ScopeSelectiveVisitor):
         with self.create_scope(tree.scope, storage_class=StorageClass.write()):
             self.visit_children(tree.nested_block, scope=tree.scope)
             ReturnVisitor.check(tree, tree.scope, return_type,
-                                self.function_table, self.mutation_table)
+                                self.function_table, self.mutation_table,
+                                self.mutation_cache)
 
     def function_statement(self, tree, scope):
         """
@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 
-from storyscript.parser import Tree
+from storyscript.parser import Tree, TreeVisitor
 
+from .functions.MutationCache import MutationCache
 
-class BaseVisitor:
-    def __init__(self, function_table, mutation_table, features):
+
+class BaseVisitor(TreeVisitor):
+    def __init__(self, function_table, mutation_table, features,
+                 mutation_cache=None):
         self.function_table = function_table
         self.mutation_table = mutation_table
         self.features = features
+        if mutation_cache is None:
+            mutation_cache = MutationCache()
+        self.mutation_cache = mutation_cache
 
 
 class SelectiveVisitor(BaseVisitor):
@@ -16,8 +22,9 @@ class SelectiveVisitor(BaseVisitor):
     visit_children must be called explicitly.
     """
     def visit(self, tree):
-        if hasattr(self, tree.data):
-            return getattr(self, tree.data)(tree)
+        handler = self.handler(tree.data)
+        if handler is not None:
+            return handler(tree)
 
     def visit_children(self, tree):
         for c in tree.children:
@@ -31,8 +38,9 @@ class ScopeSelectiveVisitor(BaseVisitor):
     visit_children must be called explicitly.
     """
     def visit(self, tree, scope=None):
-        if hasattr(self, tree.data):
-            return getattr(self, tree.data)(tree, scope)
+        handler = self.handler(tree.data)
+        if handler is not None:
+            return handler(tree, scope)
 
     def visit_children(self, tree, scope):
         for c in tree.children:
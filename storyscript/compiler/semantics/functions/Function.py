@@ -65,8 +65,9 @@ class BaseFunction:
                 # We don't emit a type cast if:
                 # * Target type is AnyType (AnyType can represent anything)
                 # * Target and Source type are the same.
-                argument.children[1] = SymbolExpressionVisitor.\
-                    type_cast_expression(argument.children[1], target)
+                argument.replace(1, SymbolExpressionVisitor.
+                                 type_cast_expression(argument.children[1],
+                                                      target))
 
     def output(self):
         return self._output
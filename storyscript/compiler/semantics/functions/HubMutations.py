@@ -1,5 +1,3 @@
-from storyhub.engine.Builtins import builtins
-
 from storyscript.compiler.semantics.functions.MutationBuilder import \
     mutation_builder
 
@@ -9,6 +7,10 @@ class Hub:
     A representation of a Storyscript Engine and Hub.
     Assumed to be Asyncy Engine for now.
     """
+
+    # the current Hub, loaded on first use
+    _instance = None
+
     def __init__(self, mutations):
         self._mutations = []
         for m in mutations.split('\n'):
@@ -22,11 +24,15 @@ class Hub:
         """
         return self._mutations
 
-    def instance():
+    @classmethod
+    def instance(cls):
         """
-        Return the current Hub instance
+        Return the current Hub instance.
+        The builtin mutations are only loaded and parsed on first use, s.t.
+        commands without semantic analysis (e.g. lex or grammar) don't pay
+        for them.
         """
-        return hub
-
-
-hub = Hub(builtins)
+        if cls._instance is None:
+            from storyhub.engine.Builtins import builtins
+            cls._instance = cls(builtins)
+        return cls._instance
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+
+class MutationCache:
+    """
+    Caches the instantiations of mutations by the mutation and the type of
+    its receiver, e.g. `length` of List[string].
+    Types are interned and instantiated mutations are never changed, thus
+    the instantiations are shared by all stories. The least recently used
+    instantiation is dropped once `max_size` instantiations are kept.
+    The hits and misses are counted per cache object.
+    """
+
+    max_size = 1024
+
+    # the instantiated mutations, the least recently used first
+    _instances = OrderedDict()
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def instantiate(self, mutation, type_):
+        """
+        Returns the instantiation of `mutation` for the receiver `type_`.
+        """
+        instances = MutationCache._instances
+        key = (mutation, type_)
+        fn = instances.get(key, None)
+        if fn is not None:
+            self.hits += 1
+            instances.move_to_end(key)
+            return fn
+
+        self.misses += 1
+        fn = mutation.instantiate(type_)
+        instances[key] = fn
+        if len(instances) > self.max_size:
+            instances.popitem(last=False)
+        return fn
+
+    def hit_rate(self):
+        """
+        Returns the ratio of the instantiations found in the cache.
+        """
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+    @classmethod
+    def clear(cls):
+        """
+        Drops all cached instantiations.
+        """
+        cls._instances.clear()
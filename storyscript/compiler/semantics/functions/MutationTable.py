@@ -74,18 +74,31 @@ class MutationOverloads:
 class MutationTable:
     """
     A table of all available mutation inside a story.
+    The table of the Hub mutations is built once and shared by all stories,
+    thus it can't be changed. Mutations can be added to an `overlay` of it
+    instead.
     """
-    def __init__(self):
+
+    # the Hub instance and the shared table of its mutations
+    _hub = None
+
+    def __init__(self, parent=None):
         self.mutations = {}
+        self.parent = parent
+        self.frozen = False
+        # all overloads of a mutation name, i.e. for AnyType
+        self._any = {}
 
     def insert(self, mutation):
         """
         Insert a new mutation into the mutation table.
         """
         assert isinstance(mutation, Mutation)
+        assert not self.frozen, 'the mutation table is immutable'
         name = mutation.name()
         if mutation.name() not in self.mutations:
-            self.mutations[name] = {}
+            self.mutations[name] = self.copy_parent(name)
+        self._any.pop(name, None)
         muts = self.mutations[name]
         t = self.type_key(mutation.base_type())
         arg_names = mutation.arg_names_hash()
@@ -98,6 +111,27 @@ class MutationTable:
             muts[t] = {}
         muts[t][arg_names] = mutation
 
+    def get(self, name):
+        """
+        Returns the overloads of the mutation `name` by type or `None`.
+        """
+        muts = self.mutations.get(name, None)
+        if muts is None and self.parent is not None:
+            return self.parent.get(name)
+        return muts
+
+    def copy_parent(self, name):
+        """
+        Copies the overloads of the mutation `name` from the parent table,
+        s.t. new overloads can be added without changing the parent.
+        """
+        if self.parent is None:
+            return {}
+        muts = self.parent.get(name)
+        if muts is None:
+            return {}
+        return {t: dict(overloads) for t, overloads in muts.items()}
+
     @staticmethod
     def type_key(type_):
         """
@@ -108,10 +142,14 @@ class MutationTable:
     def _resolve_any(self, muts, name):
         """
         Searches for all potential type overloads on mutation.
-        """
-        mo = MutationOverloads(name, AnyType.instance())
-        for overloads in muts.values():
-            mo.add_overloads(overloads)
+        The result is kept until the mutation is changed.
+        """
+        mo = self._any.get(name, None)
+        if mo is None:
+            mo = MutationOverloads(name, AnyType.instance())
+            for overloads in muts.values():
+                mo.add_overloads(overloads)
+            self._any[name] = mo
         return mo
 
     def resolve(self, type_, name):
@@ -120,6 +158,8 @@ class MutationTable:
         """
         muts = self.mutations.get(name, None)
         if muts is None:
+            if self.parent is not None:
+                return self.parent.resolve(type_, name)
             return None
 
         if type_ == AnyType.instance():
@@ -134,12 +174,33 @@ class MutationTable:
         mo.add_overloads(overloads)
         return mo
 
+    def freeze(self):
+        """
+        Prevents further changes and precomputes the overloads of all
+        mutation names.
+        """
+        for name, muts in self.mutations.items():
+            self._resolve_any(muts, name)
+        self.frozen = True
+
+    def overlay(self):
+        """
+        Returns a new table for adding mutations to this table, without
+        changing it.
+        """
+        return MutationTable(parent=self)
+
     @classmethod
     def init(cls):
         """
-        Builds a list of all mutations of the Hub.
-        """
-        mi = cls()
-        for m in Hub.instance().mutations():
-            mi.insert(m)
-        return mi
+        Returns the table of all mutations of the Hub. It's built on first
+        use and then shared until the Hub instance changes.
+        """
+        hub = Hub.instance()
+        if cls._hub is None or cls._hub[0] is not hub:
+            mi = cls()
+            for m in hub.mutations():
+                mi.insert(m)
+            mi.freeze()
+            cls._hub = (hub, mi)
+        return cls._hub[1]
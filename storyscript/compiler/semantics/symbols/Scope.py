@@ -7,21 +7,55 @@ from .Symbols import StorageClass, Symbol, Symbols
 
 class Scope:
     """
-    Manages an individual scope
+    Manages an individual scope.
+    A name is resolved in the parent scopes only once: each scope keeps the
+    symbols it resolved from its parents together with the number of
+    insertions of the name in all scopes of the tree at that time. Any
+    insertion of the name invalidates these resolutions.
     """
 
     def __init__(self, parent=None):
         self._parent = parent
         self._symbols = Symbols()
+        # name -> (insertions, symbol) resolved from the parent scopes
+        self._resolved = {}
+        if parent is None:
+            # name -> insertions of the name into this scope or its children
+            self._names = {}
+        else:
+            self._names = parent._names
 
     def insert(self, sym):
         self._symbols.insert(sym)
+        name = sym.name()
+        self._names[name] = self._names.get(name, 0) + 1
 
     def resolve(self, path):
-        for scope in self.scopes():
-            p = scope._symbols.resolve(path)
-            if p:
-                return p
+        symbol = self._symbols.resolve(path)
+        if symbol is not None:
+            return symbol
+        insertions = self._names.get(path, None)
+        if insertions is None:
+            # no scope of this tree has the name
+            return None
+
+        # walk up until a scope has the name or has a valid resolution
+        unresolved = [self]
+        scope = self._parent
+        while scope is not None:
+            symbol = scope._symbols.resolve(path)
+            if symbol is not None:
+                break
+            resolved = scope._resolved.get(path, None)
+            if resolved is not None and resolved[0] == insertions:
+                symbol = resolved[1]
+                break
+            unresolved.append(scope)
+            scope = scope._parent
+
+        for scope in unresolved:
+            scope._resolved[path] = (insertions, symbol)
+        return symbol
 
     def symbols(self):
         """
@@ -76,7 +110,7 @@ class ScopeJoiner:
         """
         if self.scope is None:
             self.scope = scope
-            self.symbols = scope._symbols._symbols
+            self.symbols = dict(scope._symbols._symbols)
         else:
             # join symbols
             symbols = scope._symbols._symbols
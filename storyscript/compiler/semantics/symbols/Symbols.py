@@ -6,8 +6,15 @@ from storyscript.compiler.semantics.types.Types import BaseType
 class StorageClass:
     """
     A storage class of a variable defines the capabilities of a variable.
+    There are only four distinct storage classes, thus they are interned
+    (see `instance`) and never changed.
     """
 
+    __slots__ = ('_write', '_rebindable')
+
+    # the interned storage classes by (write, rebindable)
+    _instances = {}
+
     def __init__(self, write=True, rebindable=True):
         """
         Args:
@@ -31,26 +38,38 @@ class StorageClass:
         """
         return self._rebindable
 
+    @classmethod
+    def instance(cls, write, rebindable):
+        """
+        Returns the interned storage class with these capabilities.
+        """
+        key = (write, rebindable)
+        sc = cls._instances.get(key)
+        if sc is None:
+            sc = cls(write=write, rebindable=rebindable)
+            cls._instances[key] = sc
+        return sc
+
     @classmethod
     def write(cls):
         """
         Create a writable, rebindable storage class.
         """
-        return cls(write=True, rebindable=True)
+        return cls.instance(write=True, rebindable=True)
 
     @classmethod
     def read(cls):
         """
         Create a readonly and non-rebindable storage class.
         """
-        return cls(write=False, rebindable=False)
+        return cls.instance(write=False, rebindable=False)
 
     @classmethod
     def rebindable(cls):
         """
         Create a readonly, but rebindable storage class.
         """
-        return cls(write=False, rebindable=True)
+        return cls.instance(write=False, rebindable=True)
 
     def index(self):
         """
@@ -61,8 +80,7 @@ class StorageClass:
         rebindable = self._rebindable
         if not self.can_write():
             rebindable = False
-        sc = StorageClass(write=write, rebindable=rebindable)
-        return sc
+        return StorageClass.instance(write=write, rebindable=rebindable)
 
     def declaration_from_symbol(self, rebindable):
         """
@@ -70,8 +88,7 @@ class StorageClass:
         Copy over the existing read permission.
         """
         write = self._write
-        sc = StorageClass(write=write, rebindable=rebindable)
-        return sc
+        return StorageClass.instance(write=write, rebindable=rebindable)
 
     def __str__(self):
         read_write = 'w' if self.can_write() else 'r'
@@ -90,6 +107,9 @@ class Symbol:
     """
     Representation of an individual symbol.
     """
+
+    __slots__ = ('_name', '_type', '_storage_class')
+
     def __init__(self, name, type_, storage_class=None):
         self._name = name
         self._type = type_
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from weakref import WeakValueDictionary
+
 from storyscript.compiler.semantics.types.Indexing import IndexKind
 
 
@@ -16,7 +18,38 @@ def singleton(fn):
     return wrapped
 
 
+# Types are interned and never change, thus the results of the operations
+# and casts are memoized by their arguments
+binary_ops = {}
+explicit_casts = {}
+implicit_casts = {}
+# the maximal number of results in a memo table
+memo_size = 4096
+
+
+def memoize(table, key, value):
+    """
+    Stores `value` for `key` in a memo table and returns it. A full table is
+    emptied first, s.t. it doesn't grow without bound in a long-running
+    process (e.g. `storyscript serve`).
+    """
+    if len(table) >= memo_size:
+        table.clear()
+    table[key] = value
+    return value
+
+
 def binary_op(op, left, right):
+    """
+    Default binary operation (memoized by the type of `op` and the types)
+    """
+    key = (None if op is None else op.type, left, right)
+    if key in binary_ops:
+        return binary_ops[key]
+    return memoize(binary_ops, key, derive_binary_op(op, left, right))
+
+
+def derive_binary_op(op, left, right):
     """
     Default binary operation:
         1) if both types are equal -> left.op(op)
@@ -54,9 +87,14 @@ def explicit_cast(from_, to):
     Checks whether from_ can be explicitly converted to to.
     `any` can always be explicitly converted.
     """
+    key = (from_, to)
+    if key in explicit_casts:
+        return explicit_casts[key]
     if from_ == AnyType.instance():
-        return to
-    return to.explicit_from(from_)
+        new_type = to
+    else:
+        new_type = to.explicit_from(from_)
+    return memoize(explicit_casts, key, new_type)
 
 
 def implicit_cast(t1, t2):
@@ -65,20 +103,34 @@ def implicit_cast(t1, t2):
     to one of each other.
     Returns `None` if no implicit cast can be performed.
     """
-    t1_t2 = t1.implicit_to(t2)
-    if t1_t2 is not None:
-        return t1_t2
-    t2_t1 = t2.implicit_to(t1)
-    if t2_t1 is not None:
-        return t2_t1
-    return None
+    key = (t1, t2)
+    if key in implicit_casts:
+        return implicit_casts[key]
+    new_type = t1.implicit_to(t2)
+    if new_type is None:
+        new_type = t2.implicit_to(t1)
+    return memoize(implicit_casts, key, new_type)
 
 
 class BaseType:
     """
     Base class of a type.
+    Types are interned: a type is only created once for each class and
+    arguments, thus equal types are the same object and are compared by
+    identity. A type is dropped from the table when it isn't used anymore.
     """
 
+    # the interned types by their class and arguments
+    _interned = WeakValueDictionary()
+
+    def __new__(cls, *args):
+        key = (cls, *args)
+        t = BaseType._interned.get(key)
+        if t is None:
+            t = super().__new__(cls)
+            BaseType._interned[key] = t
+        return t
+
     def binary_op(self, other, op):
         """
         Returns the new_type if the type supports this operation.
@@ -170,9 +222,6 @@ class BooleanType(BaseType):
     def __str__(self):
         return 'boolean'
 
-    def __eq__(self, other):
-        return isinstance(other, BooleanType)
-
     def op(self, op):
         return IntType.instance()
 
@@ -208,9 +257,6 @@ class NoneType(BaseType):
     def __str__(self):
         return 'none'
 
-    def __eq__(self, other):
-        return isinstance(other, NoneType)
-
     def can_be_assigned(self, other):
         return False
 
@@ -248,9 +294,6 @@ class IntType(BaseType):
     def __str__(self):
         return 'int'
 
-    def __eq__(self, other):
-        return isinstance(other, IntType)
-
     def op(self, op):
         return self
 
@@ -295,9 +338,6 @@ class FloatType(BaseType):
     def __str__(self):
         return 'float'
 
-    def __eq__(self, other):
-        return isinstance(other, FloatType)
-
     def op(self, op):
         return self
 
@@ -331,9 +371,6 @@ class StringType(BaseType):
     def __str__(self):
         return 'string'
 
-    def __eq__(self, other):
-        return isinstance(other, StringType)
-
     def op(self, op):
         if op.type == 'PLUS':
             return self
@@ -373,9 +410,6 @@ class TimeType(BaseType):
     def __str__(self):
         return 'time'
 
-    def __eq__(self, other):
-        return isinstance(other, TimeType)
-
     def op(self, op):
         if op.type == 'PLUS' or op.type == 'DASH':
             return self
@@ -406,9 +440,6 @@ class RegExpType(BaseType):
     def __str__(self):
         return 'regexp'
 
-    def __eq__(self, other):
-        return isinstance(other, RegExpType)
-
     def op(self, op):
         # no operations allowed on RegExp
         return None
@@ -444,9 +475,6 @@ class RangeType(BaseType):
     def __str__(self):
         return 'range'
 
-    def __eq__(self, other):
-        return isinstance(other, RangeType)
-
     @singleton
     def instance():
         """
@@ -463,13 +491,12 @@ class ListType(BaseType):
         assert isinstance(inner, BaseType)
         self.inner = inner
 
+    def __getnewargs__(self):
+        return self.inner,
+
     def __str__(self):
         return f'List[{self.inner}]'
 
-    def __eq__(self, other):
-        return isinstance(other, ListType) and \
-            self.inner == other.inner
-
     def op(self, op):
         if op.type == 'PLUS':
             return self
@@ -534,14 +561,12 @@ class MapType(BaseType):
         self.key = key
         self.value = value
 
+    def __getnewargs__(self):
+        return self.key, self.value
+
     def __str__(self):
         return f'Map[{self.key},{self.value}]'
 
-    def __eq__(self, other):
-        return isinstance(other, MapType) and \
-               self.key == other.key and \
-               self.value == other.value
-
     def op(self, op):
         return None
 
@@ -600,9 +625,6 @@ class ObjectType(BaseType):
     def __str__(self):
         return f'Object'
 
-    def __eq__(self, other):
-        return isinstance(other, ObjectType)
-
     def op(self, op):
         return None
 
@@ -638,9 +660,6 @@ class AnyType(BaseType):
     def __str__(self):
         return 'any'
 
-    def __eq__(self, other):
-        return isinstance(other, AnyType)
-
     def can_be_assigned(self, other):
         return True
 
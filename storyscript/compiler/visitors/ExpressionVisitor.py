@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from storyscript.parser.Tree import Tree
 
 
 class ExpressionVisitor:
@@ -15,6 +16,55 @@ class ExpressionVisitor:
     def as_expression(self, tree, expr):
         raise NotImplementedError()
 
+    @staticmethod
+    def collection(tree):
+        """
+        Returns the list or map of a base expression which is only a list or
+        map literal, or None.
+        """
+        if not isinstance(tree, Tree) or tree.data != 'base_expression':
+            return None
+        values = tree.follow(['expression', 'entity', 'values'])
+        if values is not None:
+            literal = values.child(0)
+            if getattr(literal, 'data', None) in ('list', 'map'):
+                return literal
+        return None
+
+    def literal(self, items):
+        """
+        Compiles a list or map literal with its `items` generator, e.g.
+        `list_items` of the visitor, which yields the base expressions of the
+        items and receives their values.
+        Nested literals are compiled with an explicit stack of generators,
+        thus deeply nested literals don't hit the recursion limit.
+        """
+        stack = [items]
+        value = None
+        while stack:
+            try:
+                item = stack[-1].send(value)
+            except StopIteration as e:
+                stack.pop()
+                value = e.value
+                continue
+            nested = self.collection(item)
+            if nested is None:
+                value = self.visitor.base_expression(item)
+            else:
+                stack.append(self.items(nested))
+                value = None
+        return value
+
+    def items(self, tree):
+        """
+        Returns the items generator of the visitor for a list or map.
+        """
+        if tree.data == 'list':
+            return self.visitor.list_items(tree)
+        assert tree.data == 'map'
+        return self.visitor.map_items(tree)
+
     def entity(self, tree):
         """
         Compiles an entity expression with the given tree
@@ -24,6 +74,31 @@ class ExpressionVisitor:
     def expression(self, tree):
         """
         Compiles an expression object with the given tree.
+        The nested expressions are compiled first with an explicit stack,
+        thus long expressions don't hit the recursion limit.
+        """
+        # the compiled nested expressions
+        values = []
+
+        def enter(node):
+            # entities and operators aren't compiled as nested expressions
+            return node.data == 'expression'
+
+        def exit(node):
+            nested = sum(1 for c in node.children
+                         if getattr(c, 'data', None) == 'expression')
+            start = len(values) - nested
+            value = self.compile_expression(node, values[start:])
+            del values[start:]
+            values.append(value)
+
+        Tree.traverse(tree, enter=enter, exit=exit)
+        return values.pop()
+
+    def compile_expression(self, tree, values):
+        """
+        Compiles an expression tree, whose nested expressions were compiled
+        to `values`.
         """
         first_child = tree.first_child()
         if len(tree.children) == 1:
@@ -32,16 +107,11 @@ class ExpressionVisitor:
         elif len(tree.children) == 2:
             second_child = tree.child(1)
             if second_child.data == 'as_operator':
-                expr = self.expression(first_child)
-                return self.as_expression(tree, expr)
+                return self.as_expression(tree, values[0])
             # unary_expression
             op = first_child.child(0)  # unary_operator
-            values = [self.expression(second_child)]
             return self.nary_expression(tree, op, values)
         else:
             assert len(tree.children) >= 3
             op = tree.child(1).child(0)
-            values = [self.expression(first_child)]
-            for child in tree.children[2:]:
-                values.append(self.expression(child))
             return self.nary_expression(tree, op, values)
@@ -1,10 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
 
-import click
-
-from lark.exceptions import UnexpectedCharacters, UnexpectedToken
-
 from .CompilerError import CompilerError
 from .ProcessingError import ProcessingError
 from ..ErrorCodes import ErrorCodes
@@ -59,6 +55,7 @@ class StoryError(SyntaxError):
         """
         name = self.name()
         if self.with_color:
+            import click
             name = click.style(self.name(), bold=True)
         text = f'Error: syntax error in {name} at line {self.int_line()}'
         if self.error.column != 'None':
@@ -90,6 +87,7 @@ class StoryError(SyntaxError):
         spaces = ' ' * (start_column + 5)
         highlight = f'{spaces}{symbols}'
         if self.with_color:
+            import click
             return click.style(highlight, fg='red')
         else:
             return highlight
@@ -201,6 +199,8 @@ class StoryError(SyntaxError):
             if ErrorCodes.is_error(self.error.error):
                 return ErrorCodes.get_error(self.error.error)
 
+        # lark is only imported here, as errors of the parser need it anyway
+        from lark.exceptions import UnexpectedCharacters, UnexpectedToken
         if isinstance(self.error, UnexpectedToken):
             return self.unexpected_token_code()
         elif isinstance(self.error, UnexpectedCharacters):
@@ -238,6 +238,7 @@ class StoryError(SyntaxError):
         """
         Prints the message
         """
+        import click
         click.echo(self.message())
 
     @staticmethod
@@ -276,6 +276,13 @@ class Grammar:
         self.ebnf.block = block
         self.ebnf.nested_block = 'indent block+ dedent'
 
+    def template(self):
+        """
+        Defines the entry point for the code of string templates, which is a
+        single expression or service call.
+        """
+        self.ebnf.template = 'absolute_expression nl, service nl'
+
     def build(self):
         self.ebnf._WS = '(" ")+'
         self.macros()
@@ -293,6 +300,7 @@ class Grammar:
         self.try_block()
         self.throw_statement()
         self.block()
+        self.template()
         self.ebnf.start = 'nl? block*'
         self.ebnf.ignore('_WS')
         self.ebnf.SINGLE_LINE_COMMENT = r'/(\r?\n)?\s*#[^\n\r]*/'
@@ -10,6 +10,8 @@ class Indenter:
         self.reset()
 
     def reset(self):
+        # the number of tokens read from the lexer
+        self.tokens = 0
         self.paren_level = 0
         self.indent_level = [0]
 
@@ -43,6 +45,7 @@ class Indenter:
     def process(self, stream):
         self.reset()
         for token in stream:
+            self.tokens += 1
             if token.type == self.NL_type:
                 for t in self.handle_nl(token):
                     yield t
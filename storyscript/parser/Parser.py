@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import io
+import time
 
 from lark import Lark
-from lark.exceptions import VisitError
+from lark.exceptions import UnexpectedInput, VisitError
 
 from .Grammar import Grammar
 from .Indenter import CustomIndenter
+from .ParserCache import ParserCache
 from .Transformer import Transformer
 from .Tree import Tree
 
@@ -15,10 +17,25 @@ class Parser:
     Wraps up the parser submodule and exposes parsing and lexing
     functionalities.
     """
-    def __init__(self, algo='lalr', ebnf=None):
+
+    # the number of string templates whose trees are memoized
+    template_memo_size = 1024
+
+    def __init__(self, algo='lalr', ebnf=None, cache=True):
         self.algo = algo
         self.ebnf = ebnf
+        self.cache = None
+        # only the LALR tables can be serialized
+        if cache and algo == 'lalr':
+            self.cache = ParserCache()
         self.lark = self._lark()
+        # the parser for string templates is only built when needed
+        self.template_lark = None
+        self.templates = {}
+        # the number of template codes parsed, i.e. not found in the memo
+        self.template_parses = 0
+        # the transformers for each value of allow_single_quotes
+        self.transformers = {}
 
     @staticmethod
     def indenter():
@@ -27,12 +44,18 @@ class Parser:
         """
         return CustomIndenter()
 
-    @staticmethod
-    def transformer(allow_single_quotes):
+    def transformer(self, allow_single_quotes):
         """
-        Initialize the transformer
+        Get the transformer, which is created once per parser.
+        The trees of lark are only transformed once, thus they are
+        transformed in place.
         """
-        return Transformer(allow_single_quotes=allow_single_quotes)
+        transformer = self.transformers.get(allow_single_quotes)
+        if transformer is None:
+            transformer = Transformer(allow_single_quotes=allow_single_quotes,
+                                      in_place=True)
+            self.transformers[allow_single_quotes] = transformer
+        return transformer
 
     def grammar(self):
         if self.ebnf:
@@ -40,28 +63,81 @@ class Parser:
                 return f.read()
         return Grammar().build()
 
-    def _lark(self):
+    def _lark(self, start='start'):
         """
-        Get the grammar and initialize Lark.
+        Get the grammar and initialize Lark. Prebuilt parser tables are loaded
+        from the cache when available.
         """
-        return Lark(self.grammar(), parser=self.algo, postlex=self.indenter())
+        grammar = self.grammar()
+        if self.cache is None:
+            return Lark(grammar, parser=self.algo, start=start,
+                        postlex=self.indenter())
+
+        key = ParserCache.key(grammar, self.algo, start)
+        lark = self.cache.load(key, postlex=self.indenter())
+        if lark is None:
+            lark = Lark(grammar, parser=self.algo, start=start,
+                        postlex=self.indenter())
+            self.cache.save(key, lark)
+        return lark
 
-    def parse(self, source, allow_single_quotes=False):
+    def parse(self, source, allow_single_quotes=False, stats=None):
         """
         Parses the source string.
+        The time spent and the number of tokens and nodes are recorded in
+        `stats` (a Stats object) if given. Lark lexes while parsing, thus the
+        time of the lexer is part of the time of the parser.
         """
         if source == '':
             return Tree('empty', [])
         source = '{}\n'.format(source)
         lark = self.lark
+        start = time.perf_counter()
         tree = lark.parse(source)
+        parsed = time.perf_counter()
         try:
             result = self.transformer(allow_single_quotes).transform(tree)
         except VisitError as e:
             raise e.orig_exc
+        if stats is not None:
+            stats.add_time('Parser', parsed - start)
+            stats.add_time('Transformer', time.perf_counter() - parsed)
+            stats.count('tokens', lark.options.postlex.tokens)
+            stats.count('nodes', sum(1 for _ in result.iter_subtrees()))
         result.parser = self
         return result
 
+    def parse_template(self, code, column):
+        """
+        Parses the code of a string template, which must be a single
+        expression or service call. Single quotes are allowed, as the code
+        is part of a string.
+        The trees are memoized by code, thus a copy is returned whose tokens
+        start at `column`. Returns `None` for any other code and with a
+        custom grammar.
+        """
+        if self.ebnf:
+            return None
+        memo = self.templates.get(code)
+        if memo is None:
+            if self.template_lark is None:
+                self.template_lark = self._lark(start='template')
+            source = '{}{}\n'.format(' ' * column, code)
+            self.template_parses += 1
+            try:
+                tree = self.template_lark.parse(source)
+                tree = self.transformer(allow_single_quotes=True).transform(
+                    tree)
+            except (UnexpectedInput, VisitError):
+                tree = None
+            if len(self.templates) >= self.template_memo_size:
+                del self.templates[next(iter(self.templates))]
+            memo = (column, tree)
+            self.templates[code] = memo
+        if memo[1] is None:
+            return None
+        return memo[1].clone(column - memo[0])
+
     def lex(self, source):
         """
         Lexes the source string
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+from lark import Lark, __version__ as lark_version
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
+
+
+class ParserCache:
+    """
+    Persists the analysed LALR tables of a grammar on disk, so that the
+    grammar doesn't need to be analysed again on every start.
+    Entries are keyed by a hash of the grammar text, thus any change to the
+    grammar (or to a given EBNF file) results in a new entry.
+    """
+
+    # bump when the format of the stored entries changes
+    format_version = 1
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = self.default_directory()
+        self.directory = directory
+
+    @staticmethod
+    def default_directory():
+        """
+        Returns the user cache directory of Storyscript.
+        `STORYSCRIPT_CACHE_DIR` can be used to override it.
+        """
+        directory = os.getenv('STORYSCRIPT_CACHE_DIR')
+        if directory:
+            return directory
+        base = os.getenv('XDG_CACHE_HOME')
+        if not base:
+            base = os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'storyscript')
+
+    @classmethod
+    def key(cls, grammar, algo, start='start'):
+        """
+        Computes the cache key of a grammar text and its start rule.
+        """
+        h = hashlib.sha256()
+        header = (f'{cls.format_version}:{lark_version}:'
+                  f'{sys.version_info[0]}.{sys.version_info[1]}:{algo}:'
+                  f'{start}:')
+        h.update(header.encode('utf8'))
+        h.update(grammar.encode('utf8'))
+        return h.hexdigest()
+
+    def path(self, key):
+        """
+        Returns the path of the cache entry for `key`.
+        """
+        return os.path.join(self.directory, 'parser', f'{key}.pickle')
+
+    def load(self, key, postlex):
+        """
+        Loads the Lark parser stored for `key`.
+        Returns `None` if there's no usable entry.
+        """
+        try:
+            with open(self.path(key), 'rb') as f:
+                data, memo = pickle.load(f)
+            namespace = {'Rule': Rule, 'TerminalDef': TerminalDef}
+            lark = Lark.deserialize(data, namespace, memo, postlex=postlex)
+        except Exception:
+            # a missing, corrupted or incompatible entry is a cache miss
+            return None
+        # a deserialized Lark instance lacks the configuration of its
+        # standalone lexer which is required for `Lark.lex`
+        lark.lexer_conf = lark.parser.lexer_conf
+        return lark
+
+    def save(self, key, lark):
+        """
+        Stores the tables of a Lark parser for `key`.
+        """
+        data, memo = lark.memo_serialize([TerminalDef, Rule])
+        # runtime objects are passed again on load
+        data['options'] = {k: v for k, v in data['options'].items()
+                           if k not in ('postlex', 'transformer')}
+        self.write(self.path(key),
+                   lambda f: pickle.dump((data, memo), f,
+                                         pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def write(path, dump):
+        """
+        Writes a cache entry atomically: `dump` writes it to a temporary
+        binary file, which then replaces `path`.
+        OSErrors are ignored as the caches are only an optimization.
+        """
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        except OSError:
+            return
+        try:
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    dump(f)
+                # concurrent processes must never see a partially written
+                # file
+                os.replace(tmp_path, path)
+            except BaseException:
+                # errors of `dump` other than OSError are raised, but never
+                # leave the temporary file behind
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass
@@ -1,17 +1,23 @@
 # -*- coding: utf-8 -*-
 from lark import Transformer as LarkTransformer
+from lark.exceptions import GrammarError, VisitError
 from lark.lexer import Token
+from lark.visitors import Discard
 
 from .Tree import Tree
+from .TreeVisitor import TreeVisitor
 from ..exceptions import StorySyntaxError
 
 
-class Transformer(LarkTransformer):
+class Transformer(LarkTransformer, TreeVisitor):
 
     """
     Performs transformations on the tree before it's parsed.
     All trees are transformed to Storyscript's custom tree. In some cases,
     additional transformations or checks are performed.
+    With `in_place`, the children of the trees are replaced in place and
+    trees without transformation are turned into Storyscript's tree instead
+    of being copied.
     """
     reserved_keywords = ['function', 'if', 'else', 'foreach', 'return',
                          'returns', 'try', 'catch', 'finally', 'when', 'as',
@@ -47,8 +53,9 @@ class Transformer(LarkTransformer):
         },
     }
 
-    def __init__(self, allow_single_quotes=False):
+    def __init__(self, allow_single_quotes=False, in_place=False):
         self.allow_single_quotes = allow_single_quotes
+        self.in_place = in_place
 
     @classmethod
     def is_keyword(cls, token):
@@ -95,7 +102,7 @@ class Transformer(LarkTransformer):
                 'Operator assignment is only allowed on variables'
 
             # Replace `<op>=` with `=`
-            c.children[0] = assignment_node.create_token('EQUALS', '=')
+            c.replace(0, assignment_node.create_token('EQUALS', '='))
 
             # Prepare LHS as an expression:
             lvalue_path = matches[0]
@@ -174,7 +181,7 @@ class Transformer(LarkTransformer):
             )]
             if len(args) > 0:
                 for arg in args:
-                    matches[0].service_fragment.children.append(arg)
+                    matches[0].service_fragment.append(arg)
                 return Tree('service_block', [matches[0]])
 
         return Tree('service_block', matches)
@@ -272,7 +279,7 @@ class Transformer(LarkTransformer):
                 first_arg.children = [path_token, first_arg.last_child()]
             else:
                 command = Tree('command', [path_token])
-                when.service_fragment.children.insert(0, command)
+                when.service_fragment.insert(command)
             return cls.create_when_block(
                 service_name=name_token,
                 fragment=when.service_fragment,
@@ -310,7 +317,7 @@ class Transformer(LarkTransformer):
         if len(matches) > 1:
             if matches[1].data == 'indented_typed_arguments':
                 for argument in matches.pop(1).find_data('typed_argument'):
-                    matches[0].children.append(argument)
+                    matches[0].append(argument)
                 matches[-1] = Tree('nested_block', [matches[-1]])
 
         return Tree('function_block', matches)
@@ -476,7 +483,7 @@ class Transformer(LarkTransformer):
                 offset = 1
                 if matches[1].data == 'arguments':
                     # append its arguments (if available)
-                    tree.children[1].children.append(matches[1])
+                    tree.children[1].append(matches[1])
                     offset += 1
                 else:
                     assert matches[1].data == 'mutation'
@@ -512,5 +519,35 @@ class Transformer(LarkTransformer):
             return t
         return cls.expression_rewrite('primary_expression', matches)
 
-    def __getattr__(self, attribute, *args):
-        return lambda matches: Tree(attribute, matches)
+    def _call_userfunc(self, tree, new_children=None):
+        """
+        Calls the method for a tree from the dispatch table instead of
+        looking it up for every tree.
+        """
+        children = new_children if new_children is not None else tree.children
+        handler = self.handler(tree.data)
+        if handler is None:
+            if self.in_place:
+                return self.relabel(tree, children)
+            return Tree(tree.data, children)
+        try:
+            return handler(children)
+        except (GrammarError, Discard):
+            raise
+        except Exception as e:
+            raise VisitError(tree, e)
+
+    def _transform_tree(self, tree):
+        if not self.in_place:
+            return super()._transform_tree(tree)
+        # the trees of long expressions are too deep for recursion
+        return Tree.traverse(tree, exit=self._call_userfunc)
+
+    @staticmethod
+    def relabel(tree, children):
+        """
+        Turns a tree of lark into a Tree with `children` without copying it.
+        """
+        tree.__class__ = Tree
+        tree.children = children
+        return tree
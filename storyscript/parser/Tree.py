@@ -19,13 +19,54 @@ class Tree(LarkTree):
                 if item.data == path:
                     return item
 
+    @staticmethod
+    def traverse(tree, enter=None, exit=None):
+        """
+        Visits `tree` and all its subtrees depth-first with an explicit stack
+        instead of recursion, thus deep trees don't hit the recursion limit.
+        `enter(tree)` is called before the children of a tree (pre-order).
+        If it returns False, the children and `exit` of the tree are
+        skipped. `exit(tree)` is called after the children (post-order).
+        If it returns a value other than None, the tree is replaced by this
+        value among the children of its parent.
+        Returns `tree` or its replacement. Tokens aren't visited and, like
+        for the trees of lark, any other child with `children` is a tree.
+        """
+        root = [tree]
+        # the tree, its index in the children of its parent, its children and
+        # the iterator over them
+        stack = [(None, None, root, enumerate(root))]
+        while stack:
+            node, position, children, items = stack[-1]
+            for index, child in items:
+                # tokens are strings
+                if isinstance(child, str):
+                    continue
+                grandchildren = getattr(child, 'children', None)
+                if grandchildren is None:
+                    continue
+                if enter is None or enter(child) is not False:
+                    # `enter` might have replaced the children
+                    grandchildren = child.children
+                    stack.append((child, index, grandchildren,
+                                  enumerate(grandchildren)))
+                    break
+            else:
+                stack.pop()
+                if exit is not None and stack:
+                    result = exit(node)
+                    if result is not None:
+                        stack[-1][2][position] = result
+        return root[0]
+
     def node(self, path):
         """
         Finds a subtree or a nested subtree, using path
         """
-        shards = path.split('.')
+        if '.' not in path:
+            return self.walk(self, path)
         current = None
-        for shard in shards:
+        for shard in path.split('.'):
             if current is None:
                 current = self.walk(self, shard)
             else:
@@ -82,17 +123,25 @@ class Tree(LarkTree):
 
     def find_first_token(self, reverse=False):
         """
-        Finds the first token in a tree
+        Finds the first token in a tree.
+        With `reverse`, the first token of the last child with tokens is
+        found instead.
         """
-        childs = self.children
+        children = self.children
         if reverse:
-            childs = reversed(childs)
-        for child in childs:
-            if isinstance(child, Token):
-                return child
-            t = child.find_first_token(reverse=False)
-            if t is not None:
-                return t
+            children = reversed(children)
+        # the remaining children of the trees on the path to the token, which
+        # can be deeper than the recursion limit
+        stack = [iter(children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, Token):
+                    return child
+                stack.append(iter(child.children))
+                break
+            else:
+                stack.pop()
+        return None
 
     def line(self):
         """
@@ -116,9 +165,22 @@ class Tree(LarkTree):
 
     def position(self):
         """
-        Finds the position of a tree using _find_position
+        Finds the position of a tree, searching its first and its last token
+        only once.
         """
-        return Position(self.line(), self.column(), self.end_column())
+        first = self.find_first_token()
+        if first is None:
+            return Position(None, None, None)
+        line = str(first.line)
+        assert line != 'None', self
+        last = self.find_first_token(reverse=True)
+        return Position(line, str(first.column), str(last.end_column))
+
+    def append(self, item):
+        """
+        Appends an item to the current tree.
+        """
+        self.children.append(item)
 
     def insert(self, item):
         """
@@ -138,6 +200,40 @@ class Tree(LarkTree):
         """
         self.children[index] = item
 
+    @staticmethod
+    def _shift(position, column):
+        """
+        Moves a positional attribute of a token `column` columns to the
+        right. Tokens from `create_token` have string columns and no
+        position in the stream, which stays None.
+        """
+        if position is None or position == 'None':
+            return position
+        return int(position) + column
+
+    def clone(self, column=0):
+        """
+        Returns a deep copy of the tree, whose tokens are moved `column`
+        columns to the right.
+        """
+        children = []
+        for child in self.children:
+            if isinstance(child, Token):
+                # the value of a token can differ from its text
+                token = Token(child.type, str(child),
+                              self._shift(child.pos_in_stream, column),
+                              child.line, self._shift(child.column, column),
+                              child.end_line,
+                              self._shift(child.end_column, column))
+                token.value = child.value
+                children.append(token)
+            else:
+                children.append(child.clone(column))
+        tree = self.__class__.__new__(self.__class__)
+        tree.__dict__.update(self.__dict__)
+        tree.children = children
+        return tree
+
     def extract_path(self):
         """
         Extracts the path name from a path tree
@@ -195,11 +291,9 @@ class Tree(LarkTree):
         Create a token from the current tree fragment and use the current tree
         for the position of the to-be-created token (line, column, end_column).
         """
-        line = self.line()
-        column = self.column()
-        end_column = self.end_column()
-        tok = Token(name, data, line=line, column=column)
-        tok.end_column = end_column
+        position = self.position()
+        tok = Token(name, data, line=position.line, column=position.column)
+        tok.end_column = position.end_column
         return tok
 
     @classmethod
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+
+class TreeVisitor:
+    """
+    Base class for visitors which dispatch a tree to the method named after
+    its `data`. The bound methods are looked up once per visitor and kept
+    in a dispatch table.
+    """
+
+    def handler(self, data):
+        """
+        Returns the bound method for trees of `data` or `None` if the visitor
+        has no such method.
+        """
+        # the table is created on first use, s.t. subclasses needn't call
+        # this __init__
+        handlers = vars(self).setdefault('_handlers', {})
+        try:
+            return handlers[data]
+        except KeyError:
+            handler = getattr(self, data, None)
+            handlers[data] = handler
+            return handler
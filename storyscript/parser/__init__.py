@@ -2,10 +2,12 @@ from .Ebnf import Ebnf
 from .Grammar import Grammar
 from .Indenter import CustomIndenter
 from .Parser import Parser
+from .ParserCache import ParserCache
 from .Position import Position
 from .Transformer import Transformer
 from .Tree import Tree
+from .TreeVisitor import TreeVisitor
 
 
-__all__ = ['CustomIndenter', 'Ebnf', 'Grammar', 'Parser', 'Position',
-           'Transformer', 'Tree', ]
+__all__ = ['CustomIndenter', 'Ebnf', 'Grammar', 'Parser', 'ParserCache',
+           'Position', 'Transformer', 'Tree', 'TreeVisitor', ]
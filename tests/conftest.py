@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from pytest import fixture
+
+
+@fixture(scope='session')
+def cache_root(tmp_path_factory):
+    """
+    The cache directory of the test session. It's shared by all tests, s.t.
+    the parser tables are only analysed once.
+    """
+    return tmp_path_factory.mktemp('cache')
+
+
+@fixture(autouse=True)
+def cache_dir(monkeypatch, cache_root):
+    """
+    Keeps the parser and compile caches of the tests out of the user cache
+    directory.
+    """
+    monkeypatch.setenv('STORYSCRIPT_CACHE_DIR', str(cache_root))
+    return cache_root
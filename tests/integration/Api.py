@@ -1,13 +1,52 @@
 # -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
 from unittest.mock import patch
 
-from pytest import raises
+from pytest import mark, raises
 
 from storyscript.Api import Api
 from storyscript.Bundle import Bundle
 from storyscript.Story import Story
 from storyscript.exceptions import StoryError
 
+# modules which must only be imported when a story is compiled
+lazy_modules = ['click', 'click_alias', 'lark', 'bom_open', 'subprocess',
+                'concurrent.futures.process', 'storyscript.compiler',
+                'storyscript.parser']
+
+
+def import_times(statement):
+    """
+    Returns the cumulative import times of all modules imported by
+    `statement` in a new interpreter, as reported by `-X importtime`.
+    """
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             statement], cwd=root_dir, check=True,
+                            stderr=subprocess.PIPE, encoding='utf8').stderr
+    times = {}
+    for line in stderr.splitlines()[1:]:
+        self_time, cumulative, name = line.split('|')
+        # a module can appear twice, e.g. for `import a.b` when `a` imports
+        # `a.b` itself
+        name = name.strip()
+        times[name] = max(times.get(name, 0), int(cumulative))
+    return times
+
+
+@mark.skipif(sys.version_info < (3, 7), reason='-X importtime needs 3.7')
+def test_api_import_lazy():
+    """
+    Ensures importing the Api doesn't import the CLI, the parser or the
+    compiler.
+    """
+    times = import_times('from storyscript.Api import Api')
+    assert 'storyscript.Api' in times
+    for module in lazy_modules:
+        assert module not in times
+
 
 def test_api_load_map_compiling_try_block():
     """
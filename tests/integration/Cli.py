@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 from unittest import mock
 
+import bom_open
+
 from click.testing import CliRunner
 
 from pytest import fixture
 
-import storyscript.Story as StoryModule
 from storyscript.Cli import Cli
 
 
@@ -16,7 +17,7 @@ def runner():
 
 @fixture
 def open_mock(mocker):
-    m = mocker.patch.object(StoryModule, 'bom_open')
+    m = mocker.patch.object(bom_open, 'bom_open')
     return m
 
 
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from benchmarks.generator import generate
+from benchmarks.scaling import scenarios
+
+from pytest import mark
+
+from storyscript.Api import Api
+
+
+@mark.parametrize('scenario', scenarios)
+def test_scaling_large_story(scenario):
+    """
+    Ensures large synthetic stories of each scenario compile
+    """
+    source = generate(**scenarios[scenario](500))
+    result = Api.loads(source, stats=True)
+    result.check_success()
+    assert len(result.result()['tree']) >= 500
+
+
+def test_scaling_inline_expressions():
+    source = generate(lines=100, inline=1)
+    result = Api.loads(source, stats=True)
+    result.check_success()
+    assert result.stats().counters['fake_lines'] == 100
+
+
+def test_scaling_templates():
+    """
+    Ensures string templates are only parsed once. The memo of the parser
+    is shared by all stories, thus codes compiled before aren't counted.
+    """
+    source = generate(lines=100, templates=1)
+    result = Api.loads(source, stats=True)
+    result.check_success()
+    assert 0 < result.stats().counters['reparses'] <= 200
+    result = Api.loads(source, stats=True)
+    assert result.stats().counters['reparses'] == 0
+
+
+def test_scaling_mutations():
+    """
+    Ensures repeated mutation calls are instantiated from the cache
+    """
+    source = 'a = [1, 2]\n' + 'a.length()\n' * 100
+    result = Api.loads(source, stats=True)
+    result.check_success()
+    counters = result.stats().counters
+    assert counters['mutation_hits'] + counters['mutation_misses'] == 100
+    assert counters['mutation_misses'] <= 1
+
+
+def test_scaling_deep_nesting():
+    """
+    Ensures stories with deeply nested blocks compile
+    """
+    source = generate(lines=500, depth=60)
+    result = Api.loads(source)
+    result.check_success()
+    assert len(result.result()['tree']) >= 500
+
+
+def test_scaling_long_expression():
+    """
+    Ensures long concatenations compile without raising the recursion limit
+    """
+    source = 'a = "a"\nb = ' + ' + '.join(['a'] * 3000) + '\n'
+    result = Api.loads(source)
+    result.check_success()
+    expression = result.result()['tree']['2']['args'][0]
+    assert expression['expression'] == 'sum'
+    assert expression['values'][1] == {'$OBJECT': 'path', 'paths': ['a']}
+
+
+@mark.parametrize('literal', ['[{}]', '{{"a": {}}}'])
+def test_scaling_nested_literals(literal):
+    """
+    Ensures deeply nested lists and maps compile without raising the
+    recursion limit
+    """
+    value = '1'
+    for i in range(1000):
+        value = literal.format(value)
+    result = Api.loads('a = {}\n'.format(value))
+    result.check_success()
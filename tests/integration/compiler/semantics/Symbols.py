@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import gc
+import inspect
+import tracemalloc
+
+from benchmarks.corpus import corpus
+
+from storyscript.Story import Story
+from storyscript.compiler.lowering.Lowering import Lowering
+from storyscript.compiler.semantics.Semantics import Semantics
+from storyscript.compiler.semantics.symbols import Symbols
+from storyscript.compiler.semantics.symbols.Symbols import StorageClass, \
+    Symbol
+
+
+def lowered_corpus():
+    """
+    Returns the lowered trees of the e2e stories which compile.
+    """
+    trees = []
+    for name, source, features in corpus():
+        story = Story(source, features)
+        story.parse(parser=None)
+        tree = Lowering(parser=story.tree.parser,
+                        features=features).process(story.tree)
+        trees.append((tree, features))
+    return trees
+
+
+def source_lines(obj):
+    lines, start = inspect.getsourcelines(obj)
+    return range(start, start + len(lines))
+
+
+def test_symbols_type_check_allocations():
+    """
+    Ensures that the symbols kept in the scopes after type-checking the e2e
+    corpus don't allocate instance dictionaries and that the storage
+    classes are interned.
+    """
+    trees = lowered_corpus()
+    tracemalloc.start()
+    for tree, features in trees:
+        Semantics(features=features).process(tree)
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    traces = snapshot.filter_traces([
+        tracemalloc.Filter(True, Symbols.__file__),
+    ]).statistics('lineno')
+
+    def allocations(lines):
+        return [stat for stat in traces
+                if stat.traceback[0].lineno in lines]
+
+    # a dictionary would be allocated by the first attribute of a symbol
+    assert allocations(source_lines(Symbol.__init__)) == []
+    # counted as objects, as tracemalloc attributes recycled temporaries
+    # to the lines of StorageClass on some versions
+    storage_classes = [obj for obj in gc.get_objects()
+                       if isinstance(obj, StorageClass)]
+    assert len(storage_classes) <= 4
@@ -6,6 +6,7 @@ from pytest import raises
 from storyscript.Api import Api
 from storyscript.Bundle import Bundle
 from storyscript.Features import Features
+from storyscript.Stats import Stats
 from storyscript.Story import Story
 from storyscript.exceptions import StoryError
 
@@ -24,6 +25,17 @@ def test_api_loads(patch):
     assert result == Story.process()
 
 
+def test_api_loads_stats(patch):
+    """
+    Ensures Api.loads can record the stats of a compilation
+    """
+    patch.init(Story)
+    patch.object(Story, 'process')
+    result = Api.loads('string', stats=True)
+    assert isinstance(result.stats(), Stats)
+    assert Api.loads('string').stats() is None
+
+
 def test_api_load(patch, magic):
     """
     Ensures Api.load can compile stories from a file stream
@@ -50,10 +62,31 @@ def test_api_load_map(patch, magic):
     result = Api.load_map(files).result()
     Bundle.__init__.assert_called_with(story_files=files, features=ANY)
     assert isinstance(Bundle.__init__.call_args[1]['features'], Features)
-    Bundle.bundle.assert_called()
+    Bundle.bundle.assert_called_with(workers=None, stats=None)
     assert result == Bundle.bundle()
 
 
+def test_api_load_map_workers(patch):
+    """
+    Ensures Api.load_map can compile stories in parallel
+    """
+    patch.init(Bundle)
+    patch.object(Bundle, 'bundle')
+    Api.load_map({}, workers=4)
+    Bundle.bundle.assert_called_with(workers=4, stats=None)
+
+
+def test_api_load_map_stats(patch):
+    """
+    Ensures Api.load_map can record the stats of each story
+    """
+    patch.init(Bundle)
+    patch.object(Bundle, 'bundle')
+    result = Api.load_map({}, stats=True)
+    Bundle.bundle.assert_called_with(workers=None, stats={})
+    assert result.stats() == {}
+
+
 def test_api_loads_internal_error(patch):
     """
     Ensures Api.loads handles unknown errors
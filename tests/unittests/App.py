@@ -61,7 +61,9 @@ def test_app_compile(patch, bundle):
     result = App.compile('path')
     Bundle.from_path.assert_called_with('path', ignored_path=None,
                                         features=None)
-    Bundle.from_path().bundle.assert_called_with(ebnf=None)
+    Bundle.from_path().bundle.assert_called_with(ebnf=None, workers=None,
+                                                 cache=None,
+                                                 stats=None)
     json.dumps.assert_called_with(Bundle.from_path().bundle(), indent=2)
     assert result == json.dumps()
 
@@ -72,7 +74,9 @@ def test_app_compile_concise(patch, bundle):
     result = App.compile('path', concise=True)
     Bundle.from_path.assert_called_with('path', ignored_path=None,
                                         features=None)
-    Bundle.from_path().bundle.assert_called_with(ebnf=None)
+    Bundle.from_path().bundle.assert_called_with(ebnf=None, workers=None,
+                                                 cache=None,
+                                                 stats=None)
     AppModule._clean_dict.assert_called_with(Bundle.from_path().bundle())
     json.dumps.assert_called_with(AppModule._clean_dict(), indent=2)
     assert result == json.dumps()
@@ -91,7 +95,31 @@ def test_app_compile_ebnf(patch, bundle):
     """
     patch.object(json, 'dumps')
     App.compile('path', ebnf='ebnf')
-    Bundle.from_path().bundle.assert_called_with(ebnf='ebnf')
+    Bundle.from_path().bundle.assert_called_with(ebnf='ebnf', workers=None,
+                                                 cache=None,
+                                                 stats=None)
+
+
+def test_app_compile_workers(patch, bundle):
+    """
+    Ensures App.compile supports compiling with multiple processes
+    """
+    patch.object(json, 'dumps')
+    App.compile('path', workers=4)
+    Bundle.from_path().bundle.assert_called_with(ebnf=None, workers=4,
+                                                 cache=None,
+                                                 stats=None)
+
+
+def test_app_compile_cache(patch, bundle):
+    """
+    Ensures App.compile supports a compilation cache
+    """
+    patch.object(json, 'dumps')
+    App.compile('path', cache='cache')
+    Bundle.from_path().bundle.assert_called_with(ebnf=None, workers=None,
+                                                 cache='cache',
+                                                 stats=None)
 
 
 def test_app_compile_first(patch, bundle):
@@ -103,7 +131,9 @@ def test_app_compile_first(patch, bundle):
     result = App.compile('path', first=True)
     Bundle.from_path.assert_called_with('path', ignored_path=None,
                                         features=None)
-    Bundle.from_path().bundle.assert_called_with(ebnf=None)
+    Bundle.from_path().bundle.assert_called_with(ebnf=None, workers=None,
+                                                 cache=None,
+                                                 stats=None)
     json.dumps.assert_called_with(42, indent=2)
     assert result == json.dumps()
 
@@ -123,7 +153,9 @@ def test_app_compile_first_error(patch, bundle):
         'if one story is complied.'
     Bundle.from_path.assert_called_with('path', ignored_path=None,
                                         features=None)
-    Bundle.from_path().bundle.assert_called_with(ebnf=None)
+    Bundle.from_path().bundle.assert_called_with(ebnf=None, workers=None,
+                                                 cache=None,
+                                                 stats=None)
 
 
 def test_app_lex(bundle):
@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 import os
 import subprocess
+from concurrent import futures
 from unittest.mock import ANY
 
-from pytest import fixture
+from pytest import fixture, raises
 
+import storyscript.Bundle as BundleModule
 from storyscript.Bundle import Bundle
 from storyscript.Features import Features
+from storyscript.Stats import Stats
 from storyscript.Story import Story
+from storyscript.exceptions import StoryError
 from storyscript.parser import Parser
 
 
@@ -129,6 +133,25 @@ def test_bundle_parse_directory_ignored_path(patch, bundle):
     Bundle.ignores.assert_called_with('ignored')
 
 
+def test_bundle_parse_directory_ignores(patch, bundle):
+    """
+    Ensures parse_directory can reuse a list of ignored files
+    """
+    patch.object(os, 'walk', return_value=[('./root', [], ['one.story'])])
+    patch.object(Bundle, 'gitignores')
+    assert Bundle.parse_directory('dir', ignores=['root/one.story']) == []
+    assert Bundle.gitignores.call_count == 0
+
+
+def test_bundle_find_ignores(patch):
+    patch.many(Bundle, ['gitignores', 'ignores'])
+    Bundle.gitignores.return_value = ['a']
+    Bundle.ignores.return_value = ['b']
+    assert Bundle.find_ignores() == ['a']
+    assert Bundle.find_ignores('ignored') == ['a', 'b']
+    Bundle.ignores.assert_called_with('ignored')
+
+
 def test_bundle_from_path(patch):
     """
     Ensures Bundle.from_path can create a Bundle from a filepath
@@ -232,23 +255,280 @@ def test_bundle_compile(mocker, patch, bundle):
     assert bundle.stories['one.story'] == story.compiled
 
 
+def test_bundle_compile_cache_hit(patch, magic, bundle):
+    """
+    Ensures cached stories aren't compiled again
+    """
+    compile = bundle.compile
+    patch.many(Bundle, ['compile', 'load_story'])
+    cache = magic()
+    compile(['one.story'], parser=None, cache=cache)
+    story = Bundle.load_story()
+    cache.key.assert_called_with(story.story, bundle.features)
+    cache.load.assert_called_with(cache.key())
+    assert story.parse.call_count == 0
+    assert bundle.stories['one.story'] == cache.load()
+
+
+def test_bundle_compile_cache_miss(patch, magic, bundle):
+    """
+    Ensures compiled stories are added to the cache
+    """
+    compile = bundle.compile
+    patch.many(Bundle, ['compile', 'load_story'])
+    cache = magic()
+    cache.load.return_value = None
+    compile(['one.story'], parser=None, cache=cache)
+    story = Bundle.load_story()
+    story.compile.assert_called()
+    cache.save.assert_called_with(cache.key(), story.compiled)
+    assert bundle.stories['one.story'] == story.compiled
+
+
+def test_bundle_compile_stats(patch, bundle):
+    """
+    Ensures the stats of compiled stories are recorded
+    """
+    compile = bundle.compile
+    patch.many(Bundle, ['compile', 'load_story'])
+    stats = {}
+    compile(['one.story'], parser=None, stats=stats)
+    assert isinstance(stats['one.story'], Stats)
+    assert Bundle.load_story().stats == stats['one.story']
+
+
 def test_bundle_bundle(patch, bundle):
     patch.many(Bundle, ['find_stories', 'services', 'compile', 'parser'])
     result = bundle.bundle()
     Bundle.parser.assert_called_with(None)
     Bundle.compile.assert_called_with(Bundle.find_stories(),
-                                      parser=Bundle.parser())
+                                      parser=Bundle.parser(), cache=None,
+                                      stats=None)
     expected = {'stories': bundle.stories, 'services': Bundle.services(),
                 'entrypoint': Bundle.find_stories()}
     assert result == expected
 
 
+def test_bundle_bundle_cache(patch, bundle):
+    patch.many(Bundle, ['find_stories', 'services', 'compile', 'parser'])
+    bundle.bundle(cache='cache')
+    Bundle.compile.assert_called_with(Bundle.find_stories(),
+                                      parser=Bundle.parser(), cache='cache',
+                                      stats=None)
+
+
+def test_bundle_bundle_workers(patch, bundle):
+    patch.many(Bundle, ['find_stories', 'services', 'compile',
+                        'compile_parallel'])
+    Bundle.find_stories.return_value = ['a.story', 'b.story']
+    bundle.bundle(ebnf='ebnf', workers=2)
+    Bundle.compile_parallel.assert_called_with(['a.story', 'b.story'],
+                                               ebnf='ebnf', workers=2,
+                                               cache=None, stats=None)
+    assert Bundle.compile.call_count == 0
+
+
+def test_bundle_bundle_workers_single_story(patch, bundle):
+    """
+    Ensures that no process pool is started for a single story
+    """
+    patch.many(Bundle, ['find_stories', 'services', 'compile', 'parser',
+                        'compile_parallel'])
+    Bundle.find_stories.return_value = ['a.story']
+    bundle.bundle(workers=2)
+    Bundle.compile.assert_called_with(['a.story'], parser=Bundle.parser(),
+                                      cache=None, stats=None)
+    assert Bundle.compile_parallel.call_count == 0
+
+
+@fixture
+def worker(patch):
+    patch.dict(BundleModule._worker, {}, clear=True)
+    return BundleModule._worker
+
+
+def test_bundle_init_worker(worker):
+    BundleModule._init_worker({'globals': True}, None)
+    assert worker['features'].globals is True
+    assert worker['parser'] is None
+
+
+def test_bundle_init_worker_ebnf(patch, worker):
+    patch.init(Parser)
+    BundleModule._init_worker({}, 'ebnf')
+    Parser.__init__.assert_called_with(ebnf='ebnf')
+    assert isinstance(worker['parser'], Parser)
+
+
+def test_bundle_init_worker_reuse(patch, worker):
+    """
+    Ensures the parser of a worker is kept for stories with the same options
+    """
+    patch.init(Parser)
+    BundleModule._init_worker({}, 'ebnf')
+    parser = worker['parser']
+    BundleModule._init_worker({}, 'ebnf')
+    assert worker['parser'] is parser
+    assert Parser.__init__.call_count == 1
+    BundleModule._init_worker({'globals': True}, 'ebnf')
+    assert worker['parser'] is not parser
+    assert worker['features'].globals is True
+
+
+def test_bundle_compile_story(patch):
+    patch.init(Story)
+    patch.many(Story, ['parse', 'compile'])
+    patch.object(BundleModule, '_init_worker')
+    patch.dict(BundleModule._worker, {'features': 'features',
+                                      'parser': 'parser'})
+    patch.object(Story, 'compiled', 'compiled', create=True)
+    patch.object(Story, 'stats', None, create=True)
+    result = BundleModule._compile_story('source', {}, 'ebnf')
+    BundleModule._init_worker.assert_called_with({}, 'ebnf')
+    Story.__init__.assert_called_with('source', features='features')
+    Story.parse.assert_called_with(parser='parser')
+    assert result == ('compiled', None)
+
+
+def test_bundle_compile_story_stats(patch):
+    patch.init(Story)
+    patch.many(Story, ['parse', 'compile'])
+    patch.object(BundleModule, '_init_worker')
+    patch.dict(BundleModule._worker, {'features': 'features',
+                                      'parser': 'parser'})
+    patch.object(Story, 'compiled', 'compiled', create=True)
+    compiled, stats = BundleModule._compile_story('source', {}, None,
+                                                  stats=True)
+    assert isinstance(stats, Stats)
+
+
+def test_bundle_compile_story_error(patch):
+    patch.init(Story)
+    patch.object(Story, 'parse', side_effect=StoryError(None, None))
+    patch.object(BundleModule, '_init_worker')
+    patch.dict(BundleModule._worker, {'features': None, 'parser': None})
+    assert BundleModule._compile_story('source', {}, None) is None
+
+
+def test_bundle_worker_result(magic):
+    future = magic()
+    assert Bundle.worker_result(future) == future.result()
+
+
+def test_bundle_worker_result_none():
+    assert Bundle.worker_result(None) is None
+
+
+def test_bundle_worker_result_error(magic):
+    future = magic()
+    future.result.side_effect = Exception()
+    assert Bundle.worker_result(future) is None
+
+
+@fixture
+def executor(patch, bundle):
+    patch.object(futures, 'ProcessPoolExecutor')
+    patch.many(Bundle, ['load_story', 'compile', 'parser'])
+    return futures.ProcessPoolExecutor().__enter__()
+
+
+def test_bundle_compile_parallel(executor, bundle):
+    executor.submit().result.side_effect = [('a', None), ('b', None)]
+    bundle.compile_parallel(['a.story', 'b.story'], ebnf=None, workers=2)
+    futures.ProcessPoolExecutor.assert_called_with(max_workers=2)
+    executor.submit.assert_called_with(BundleModule._compile_story,
+                                       Bundle.load_story().story,
+                                       bundle.features.features, None, False)
+    assert bundle.stories == {'a.story': 'a', 'b.story': 'b'}
+    assert list(bundle.stories.keys()) == ['a.story', 'b.story']
+    assert Bundle.compile.call_count == 0
+
+
+def test_bundle_compile_parallel_stats(executor, bundle):
+    executor.submit().result.side_effect = [('a', 'stats a'), None]
+    stats = {}
+    bundle.compile_parallel(['a.story', 'b.story'], ebnf=None, workers=2,
+                            stats=stats)
+    assert executor.submit.call_args[0][-1] is True
+    assert stats == {'a.story': 'stats a'}
+    Bundle.compile.assert_called_with(['b.story'], parser=Bundle.parser(),
+                                      stats=stats)
+
+
+def test_bundle_compile_parallel_fallback(executor, bundle):
+    """
+    Ensures failed stories are compiled again in the current process
+    """
+    executor.submit().result.side_effect = [None, ('b', None)]
+    bundle.compile_parallel(['a.story', 'b.story'], ebnf='ebnf', workers=2)
+    Bundle.parser.assert_called_with('ebnf')
+    Bundle.compile.assert_called_once_with(['a.story'],
+                                           parser=Bundle.parser(),
+                                           stats=None)
+    assert bundle.stories['b.story'] == 'b'
+
+
+def test_bundle_compile_parallel_error(executor, bundle):
+    """
+    Ensures the first error is raised and pending stories are cancelled
+    """
+    executor.submit().result.side_effect = [None, ('b', None)]
+    Bundle.compile.side_effect = StoryError(None, None)
+    with raises(StoryError):
+        bundle.compile_parallel(['a.story', 'b.story'], ebnf=None,
+                                workers=2)
+    assert executor.submit().cancel.call_count == 2
+
+
+def test_bundle_compile_parallel_read_error(executor, bundle):
+    """
+    Ensures stories that can't be read are reported by the fallback
+    """
+    Bundle.load_story.side_effect = StoryError(None, None)
+    bundle.compile_parallel(['a.story'], ebnf=None, workers=2)
+    assert executor.submit.call_count == 0
+    Bundle.compile.assert_called_with(['a.story'], parser=Bundle.parser(),
+                                      stats=None)
+
+
+def test_bundle_compile_parallel_cache(magic, executor, bundle):
+    """
+    Ensures cached stories aren't submitted and new ones are cached
+    """
+    cache = magic()
+    cache.load.side_effect = ['a', None]
+    executor.submit().result.return_value = ('b', None)
+    executor.submit.reset_mock()
+    bundle.compile_parallel(['a.story', 'b.story'], ebnf=None, workers=2,
+                            cache=cache)
+    assert executor.submit.call_count == 1
+    cache.save.assert_called_with(cache.key(), 'b')
+    assert list(bundle.stories.items()) == [('a.story', 'a'),
+                                            ('b.story', 'b')]
+
+
 def test_bundle_bundle_ebnf(patch, bundle):
+    """
+    Ensures a custom grammar disables the cache
+    """
     patch.many(Bundle, ['find_stories', 'services', 'compile', 'parser'])
-    bundle.bundle(ebnf='ebnf')
+    bundle.bundle(ebnf='ebnf', cache='cache')
     Bundle.parser.assert_called_with('ebnf')
     Bundle.compile.assert_called_with(Bundle.find_stories(),
-                                      parser=Bundle.parser())
+                                      parser=Bundle.parser(), cache=None,
+                                      stats=None)
+
+
+def test_bundle_bundle_stats(patch, bundle):
+    """
+    Ensures stats disable the cache, s.t. every story is timed
+    """
+    patch.many(Bundle, ['find_stories', 'services', 'compile', 'parser'])
+    stats = {}
+    bundle.bundle(cache='cache', stats=stats)
+    Bundle.compile.assert_called_with(Bundle.find_stories(),
+                                      parser=Bundle.parser(), cache=None,
+                                      stats=stats)
 
 
 def test_bundle_bundle_trees(patch, bundle):
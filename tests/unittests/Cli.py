@@ -7,10 +7,14 @@ from click.testing import CliRunner
 
 from pytest import fixture, mark
 
+import storyscript.Cli as CliModule
 from storyscript.App import App
 from storyscript.Cli import Cli
 from storyscript.Project import Project
+from storyscript.Server import Server
+from storyscript.Stats import Stats
 from storyscript.Version import version
+from storyscript.Watcher import Watcher
 from storyscript.exceptions.CompilerError import CompilerError
 from storyscript.exceptions.StoryError import StoryError
 
@@ -28,6 +32,7 @@ def echo(patch):
 @fixture
 def app(patch):
     patch.many(App, ['compile', 'parse'])
+    patch.object(CliModule, 'CompileCache')
     return App
 
 
@@ -98,7 +103,9 @@ def test_cli_compile_with_ignore_option(runner, app):
                                 '--ignore', 'path/sub_dir/my_fake.story'])
     App.compile.assert_called_with('path/fake.story', ebnf=None,
                                    ignored_path='path/sub_dir/my_fake.story',
-                                   concise=False, first=False, features={})
+                                   concise=False, first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 def test_cli_parse_with_ignore_option(runner, app):
@@ -268,7 +275,9 @@ def test_cli_compile(patch, runner, echo, app):
     runner.invoke(Cli.compile, [])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
     click.style.assert_called_with('Script syntax passed!', fg='green')
     click.echo.assert_called_with(click.style())
 
@@ -280,7 +289,9 @@ def test_cli_compile_path(patch, runner, app):
     runner.invoke(Cli.compile, ['/path'])
     App.compile.assert_called_with('/path', ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 def test_cli_compile_output_file(patch, runner, app):
@@ -301,7 +312,9 @@ def test_cli_compile_silent(runner, echo, app, option):
     result = runner.invoke(Cli.compile, [option])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
     assert result.output == ''
     assert click.echo.call_count == 0
 
@@ -314,7 +327,9 @@ def test_cli_compile_concise(runner, echo, app, option):
     runner.invoke(Cli.compile, [option])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=True,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 @mark.parametrize('option', ['--first', '-f'])
@@ -325,21 +340,27 @@ def test_cli_compile_first(runner, echo, app, option):
     runner.invoke(Cli.compile, [option])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=True, features={})
+                                   first=True, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 def test_cli_compile_debug(runner, echo, app):
     runner.invoke(Cli.compile, ['--debug'])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 def test_cli_compile_features(runner, echo, app):
     runner.invoke(Cli.compile, ['--preview=globals'])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=False, features={'globals': True})
+                                   first=False, features={'globals': True},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 @mark.parametrize('option', ['--json', '-j'])
@@ -350,15 +371,115 @@ def test_cli_compile_json(runner, echo, app, option):
     runner.invoke(Cli.compile, [option])
     App.compile.assert_called_with(os.getcwd(), ebnf=None,
                                    ignored_path=None, concise=False,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
     click.echo.assert_called_with(App.compile())
 
 
+def test_cli_compile_jobs(runner, echo, app):
+    """
+    Ensures --jobs sets the number of compilation processes
+    """
+    runner.invoke(Cli.compile, ['--jobs', '4'])
+    App.compile.assert_called_with(os.getcwd(), ebnf=None,
+                                   ignored_path=None, concise=False,
+                                   first=False, features={}, workers=4,
+                                   cache=CliModule.CompileCache(), stats=None)
+
+
+def test_cli_compile_jobs_invalid(runner, echo, app):
+    result = runner.invoke(Cli.compile, ['--jobs', '0'])
+    assert result.exit_code == 2
+    assert App.compile.call_count == 0
+
+
+def test_cli_compile_cache_dir(runner, echo, app):
+    """
+    Ensures --cache-dir sets the directory of the compilation cache
+    """
+    runner.invoke(Cli.compile, ['--cache-dir', '/cache'])
+    CliModule.CompileCache.assert_called_with(directory='/cache')
+    App.compile.assert_called_with(os.getcwd(), ebnf=None,
+                                   ignored_path=None, concise=False,
+                                   first=False, features={}, workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
+
+
+def test_cli_compile_no_cache(runner, echo, app):
+    """
+    Ensures --no-cache disables the compilation cache
+    """
+    runner.invoke(Cli.compile, ['--no-cache'])
+    assert CliModule.CompileCache.call_count == 0
+    App.compile.assert_called_with(os.getcwd(), ebnf=None,
+                                   ignored_path=None, concise=False,
+                                   first=False, features={}, workers=1,
+                                   cache=None, stats=None)
+
+
+def test_cli_compile_cache_stats(runner, echo, app):
+    runner.invoke(Cli.compile, ['--cache-stats', '--silent'])
+    stats = CliModule.CompileCache().stats()
+    click.echo.assert_called_with(stats, err=True)
+
+
+def test_cli_compile_timings(patch, runner, echo, app):
+    """
+    Ensures --timings prints the stats of each story
+    """
+    def compile(*args, stats, **kwargs):
+        stats['a.story'] = Stats()
+
+    App.compile.side_effect = compile
+    runner.invoke(Cli.compile, ['--timings', '--silent'])
+    assert isinstance(App.compile.call_args[1]['stats'], dict)
+    click.echo.assert_called_with(f'a.story:\n{Stats()}', err=True)
+
+
+@mark.parametrize('option', ['--watch', '-w'])
+def test_cli_compile_watch(patch, runner, echo, app, option):
+    """
+    Ensures --watch recompiles stories on changes
+    """
+    patch.init(Watcher)
+    patch.object(Watcher, 'watch')
+    runner.invoke(Cli.compile, ['/path', option, '--ignore', 'ignored'])
+    Watcher.__init__.assert_called_with('/path', ignored_path='ignored',
+                                        ebnf=None, features={},
+                                        cache=CliModule.CompileCache())
+    assert Watcher.watch.call_count == 1
+    assert App.compile.call_count == 0
+
+
+@mark.parametrize('options, used', [
+    (['-j'], '--json'),
+    (['out.json'], 'OUTPUT'),
+    (['--jobs', '2'], '--jobs'),
+    (['--timings'], '--timings'),
+    (['--silent'], '--silent'),
+    (['--debug'], '--debug'),
+    (['--cache-stats'], '--cache-stats'),
+    (['--concise', '--first'], '--concise, --first'),
+])
+def test_cli_compile_watch_options(patch, runner, echo, app, options, used):
+    """
+    Ensures --watch rejects the options which it would ignore
+    """
+    patch.object(Watcher, 'watch')
+    e = runner.invoke(Cli.compile, ['/path', '--watch'] + options)
+    assert e.exit_code == 2
+    assert f'--watch can not be used with {used}' in e.output
+    assert Watcher.watch.call_count == 0
+
+
 def test_cli_compile_ebnf(runner, echo, app):
     runner.invoke(Cli.compile, ['--ebnf', 'test.ebnf'])
     App.compile.assert_called_with(os.getcwd(), ebnf='test.ebnf',
                                    ignored_path=None, concise=False,
-                                   first=False, features={})
+                                   first=False, features={},
+                                   workers=1,
+                                   cache=CliModule.CompileCache(), stats=None)
 
 
 def test_cli_compile_ice(runner, echo, app):
@@ -407,6 +528,18 @@ def test_cli_compile_not_found_debug(runner, echo, app):
     assert e.exception.message() == 'Unknown compiler error'
 
 
+def test_cli_serve(patch, runner):
+    """
+    Ensures the serve command answers requests from stdin
+    """
+    patch.init(Server)
+    patch.object(Server, 'serve')
+    runner.invoke(Cli.serve, ['--preview=globals'])
+    args, kwargs = Server.__init__.call_args
+    assert kwargs == {'features': {'globals': True}}
+    assert Server.serve.call_count == 1
+
+
 def test_cli_lex(patch, magic, runner, app, echo):
     """
     Ensures the lex command outputs lexer tokens
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+from pytest import fixture
+
+import storyscript.CompileCache as CompileCacheModule
+from storyscript.CompileCache import CompileCache
+from storyscript.Features import Features
+from storyscript.parser import ParserCache
+
+
+@fixture
+def cache(tmpdir):
+    return CompileCache(directory=str(tmpdir))
+
+
+def test_compilecache_init(patch):
+    patch.object(ParserCache, 'default_directory')
+    cache = CompileCache()
+    assert cache.directory == ParserCache.default_directory()
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+def test_compilecache_key():
+    features = Features(None)
+    key = CompileCache.key('a = 1', features)
+    assert key == CompileCache.key('a = 1', Features(None))
+    assert key != CompileCache.key('a = 2', features)
+    assert key != CompileCache.key('a = 1', Features({'globals': True}))
+
+
+def test_compilecache_key_version(patch):
+    """
+    Ensures a new compiler version doesn't use old entries
+    """
+    key = CompileCache.key('a = 1', Features(None))
+    patch.object(CompileCacheModule, 'get_version', return_value='new')
+    assert key != CompileCache.key('a = 1', Features(None))
+
+
+def test_compilecache_key_sources(patch):
+    """
+    Ensures that changes to the compiler sources don't use old entries
+    """
+    key = CompileCache.key('a = 1', Features(None))
+    patch.object(CompileCache, 'fingerprint', return_value='new')
+    assert key != CompileCache.key('a = 1', Features(None))
+    CompileCache.fingerprint.assert_called_with(CompileCache.package_dir)
+
+
+def test_compilecache_fingerprint(tmpdir):
+    tmpdir.join('Compiler.py').write('a')
+    tmpdir.mkdir('__pycache__').join('Compiler.pyc').write('a')
+    fingerprint = CompileCache.fingerprint(str(tmpdir))
+    assert fingerprint == CompileCache.fingerprint(str(tmpdir))
+    CompileCache.fingerprint.cache_clear()
+    tmpdir.join('__pycache__', 'Compiler.pyc').write('b')
+    assert CompileCache.fingerprint(str(tmpdir)) == fingerprint
+    CompileCache.fingerprint.cache_clear()
+    tmpdir.mkdir('parser').join('Grammar.py').write('a')
+    assert CompileCache.fingerprint(str(tmpdir)) != fingerprint
+
+
+def test_compilecache_path(cache):
+    path = os.path.join(cache.directory, 'compiled', 'key.json')
+    assert cache.path('key') == path
+
+
+def test_compilecache_load_missing(cache):
+    assert cache.load('key') is None
+    assert cache.misses == 1
+
+
+def test_compilecache_load_corrupted(cache):
+    os.makedirs(os.path.dirname(cache.path('key')))
+    with open(cache.path('key'), 'w') as f:
+        f.write('{corrupted')
+    assert cache.load('key') is None
+    assert cache.misses == 1
+
+
+def test_compilecache_save_load(cache):
+    compiled = {'tree': {'1': {'method': 'expression'}}, 'services': []}
+    cache.save('key', compiled)
+    assert cache.load('key') == compiled
+    assert cache.hits == 1
+    assert cache.misses == 0
+    with open(cache.path('key')) as f:
+        assert json.load(f) == compiled
+
+
+def test_compilecache_save_unwritable(patch, cache):
+    patch.object(os, 'makedirs', side_effect=PermissionError())
+    cache.save('key', {})
+    assert cache.load('key') is None
+
+
+def test_compilecache_stats(cache):
+    cache.hits = 2
+    cache.misses = 1
+    assert cache.stats() == '2 cache hits, 1 cache misses'
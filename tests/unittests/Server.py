@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+from pytest import fixture
+
+from storyscript.Api import Api
+from storyscript.Server import Server
+from storyscript.Story import Story
+from storyscript.exceptions import StoryError
+
+
+@fixture
+def server():
+    return Server(io.StringIO(), io.StringIO(), features={'debug': False})
+
+
+def test_server_init(server):
+    assert server.features == {'debug': False}
+
+
+def test_server_errors(magic):
+    error = magic()
+    result = magic()
+    result.errors.return_value = [error]
+    assert Server.errors(result) == [error.message()]
+    assert error.with_color is False
+
+
+def test_server_compilation(patch, magic, server):
+    patch.object(Server, 'errors')
+    result = magic()
+    expected = {'result': result.result(), 'errors': Server.errors()}
+    assert server.compilation(result) == expected
+
+
+def test_server_loads(patch, server):
+    patch.object(Api, 'loads')
+    patch.object(Server, 'compilation')
+    result = server.loads('source', features='features')
+    Api.loads.assert_called_with('source', features='features')
+    Server.compilation.assert_called_with(Api.loads())
+    assert result == Server.compilation()
+
+
+def test_server_load_map(patch, server):
+    patch.object(Api, 'load_map')
+    patch.object(Server, 'compilation')
+    result = server.load_map({'a.story': 'source'})
+    Api.load_map.assert_called_with({'a.story': 'source'}, features=None)
+    assert result == Server.compilation()
+
+
+def test_server_parse(patch, server):
+    patch.object(Story, 'parse')
+    patch.object(Story, 'tree', create=True)
+    result = server.parse('source', lower=True)
+    Story.parse.assert_called_with(parser=None, lower=True)
+    assert result == {'result': Story.tree.pretty(), 'errors': []}
+
+
+def test_server_parse_error(patch, server):
+    error = StoryError(None, None)
+    patch.object(StoryError, 'message')
+    patch.object(Story, 'parse', side_effect=error)
+    result = server.parse('source')
+    assert result == {'result': None, 'errors': [StoryError.message()]}
+    assert error.with_color is False
+
+
+def test_server_lex(patch, magic, server):
+    token = magic(type='NAME', value='a')
+    patch.object(Story, 'lex', return_value=[token])
+    result = server.lex('source')
+    Story.lex.assert_called_with(parser=None)
+    assert result == {'result': [['NAME', 'a']], 'errors': []}
+
+
+def test_server_handle(patch, server):
+    patch.object(Server, 'loads', return_value={'result': 'compiled'})
+    request = {'id': 1, 'method': 'loads', 'params': {'source': 'a = 1'}}
+    result = server.handle(json.dumps(request))
+    Server.loads.assert_called_with(source='a = 1',
+                                    features={'debug': False})
+    assert result == {'id': 1, 'result': 'compiled'}
+
+
+def test_server_handle_features(patch, server):
+    """
+    Ensures requests can override the features of the server
+    """
+    patch.object(Server, 'lex', return_value={})
+    request = {'id': 1, 'method': 'lex',
+               'params': {'source': 'a', 'features': {'globals': True}}}
+    server.handle(json.dumps(request))
+    Server.lex.assert_called_with(source='a', features={'globals': True})
+
+
+def test_server_handle_unknown_method(server):
+    request = {'id': 1, 'method': 'handle'}
+    result = server.handle(json.dumps(request))
+    assert result == {'id': 1, 'error': 'Unknown method: handle'}
+
+
+def test_server_handle_invalid_json(server):
+    result = server.handle('{invalid')
+    assert result['id'] is None
+    assert result['error'].startswith('JSONDecodeError')
+
+
+def test_server_handle_invalid_params(server):
+    request = {'id': 2, 'method': 'loads', 'params': {'story': 'a = 1'}}
+    result = server.handle(json.dumps(request))
+    assert result['id'] == 2
+    assert result['error'].startswith('TypeError')
+
+
+def test_server_warm_up(patch, server):
+    patch.object(Api, 'loads')
+    server.warm_up()
+    Api.loads.assert_called_with('', features={'debug': False})
+
+
+def test_server_serve(patch, server):
+    patch.many(Server, ['warm_up', 'handle'])
+    Server.handle.return_value = {'id': 1}
+    server.input = io.StringIO('request\n\nrequest\n')
+    server.serve()
+    Server.warm_up.assert_called()
+    Server.handle.assert_called_with('request\n')
+    assert Server.handle.call_count == 2
+    assert server.output.getvalue() == '{"id": 1}\n{"id": 1}\n'
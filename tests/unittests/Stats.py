@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from storyscript.Stats import Stats
+
+
+def test_stats_init():
+    stats = Stats()
+    assert stats.timings == {}
+    assert stats.counters == {}
+
+
+def test_stats_add_time():
+    stats = Stats()
+    stats.add_time('Parser', 1)
+    stats.add_time('Lowering', 2)
+    stats.add_time('Parser', 3)
+    assert stats.timings == {'Parser': 4, 'Lowering': 2}
+    assert list(stats.timings) == ['Parser', 'Lowering']
+    assert stats.total() == 6
+
+
+def test_stats_timer(patch):
+    patch.object(Stats, 'add_time')
+    stats = Stats()
+    with stats.timer('Parser'):
+        pass
+    assert Stats.add_time.call_args[0][0] == 'Parser'
+    assert Stats.add_time.call_args[0][1] >= 0
+
+
+def test_stats_count():
+    stats = Stats()
+    stats.count('tokens', 10)
+    stats.count('reparses')
+    stats.count('reparses')
+    assert stats.counters == {'tokens': 10, 'reparses': 2}
+
+
+def test_stats_as_dict():
+    stats = Stats()
+    stats.add_time('Parser', 1)
+    stats.count('tokens', 10)
+    assert stats.as_dict() == {'timings': {'Parser': 1},
+                               'counters': {'tokens': 10}}
+
+
+def test_stats_str():
+    stats = Stats()
+    stats.add_time('Parser', 0.5)
+    stats.count('tokens', 10)
+    stats.count('custom', 2)
+    lines = str(stats).split('\n')
+    assert lines == [
+        '          Parser:  500.000ms',
+        '           total:  500.000ms',
+        '              10  tokens read by the parser',
+        '               2  custom',
+    ]
@@ -2,11 +2,13 @@
 import io
 import os
 
+import bom_open
+
 from lark.exceptions import UnexpectedInput, UnexpectedToken
 
 from pytest import fixture, mark, raises
 
-import storyscript.Story as StoryModule
+from storyscript.Stats import Stats
 from storyscript.Story import Story
 from storyscript.compiler import Compiler
 from storyscript.compiler.lowering.Lowering import Lowering
@@ -46,9 +48,9 @@ def test_story_read(patch):
     """
     Ensures Story.read can read a story
     """
-    patch.object(StoryModule, 'bom_open')
+    patch.object(bom_open, 'bom_open')
     Story.read('hello.story')
-    StoryModule.bom_open.assert_called_with('hello.story', 'r')
+    bom_open.bom_open.assert_called_with('hello.story', 'r')
 
 
 def test_story_read_not_found(patch, capsys):
@@ -86,24 +88,28 @@ def test_story_error(patch, story):
 
 def test_story_parse(patch, story, parser):
     story.parse(parser=parser)
-    parser.parse.assert_called_with(story.story, allow_single_quotes=False)
+    parser.parse.assert_called_with(story.story, allow_single_quotes=False,
+                                    stats=None)
     assert story.tree == Parser.parse()
 
 
 def test_story_parse_debug(patch, story, parser):
     story.parse(parser=parser)
-    parser.parse.assert_called_with(story.story, allow_single_quotes=False)
+    parser.parse.assert_called_with(story.story, allow_single_quotes=False,
+                                    stats=None)
 
 
 def test_story_parse_debug_single_quotes(patch, story, parser):
     story.parse(parser=parser, allow_single_quotes=True)
-    parser.parse.assert_called_with(story.story, allow_single_quotes=True)
+    parser.parse.assert_called_with(story.story, allow_single_quotes=True,
+                                    stats=None)
 
 
 def test_story_parse_lower(patch, story, parser):
     patch.object(Lowering, 'process')
     story.parse(parser=parser, lower=True)
-    parser.parse.assert_called_with(story.story, allow_single_quotes=False)
+    parser.parse.assert_called_with(story.story, allow_single_quotes=False,
+                                    stats=None)
     Lowering.process.assert_called_with(Parser.parse())
     assert story.tree == Lowering.process(Lowering.process())
 
@@ -126,10 +132,18 @@ def test_story_parse_error(patch, story, parser, error):
 
 def test_story_compile(patch, story, compiler):
     story.compile()
-    Compiler.compile.assert_called_with(story.tree, story=story, features=None)
+    Compiler.compile.assert_called_with(story.tree, story=story, features=None,
+                                        stats=None)
     assert story.compiled == Compiler.compile()
 
 
+def test_story_compile_stats(patch, story, compiler):
+    story.stats = Stats()
+    story.compile()
+    Compiler.compile.assert_called_with(story.tree, story=story, features=None,
+                                        stats=story.stats)
+
+
 @mark.parametrize('error', [StorySyntaxError('error'), CompilerError('error')])
 def test_story_compiler_error(patch, story, compiler, error):
     """
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 import io
+import os
 import subprocess
+import sys
 from unittest import mock
 
 import pkg_resources
 
+from pytest import mark
+
 from storyscript import Version
 
 
@@ -36,7 +40,78 @@ def test_git_describe(patch):
     assert r == subprocess.run().stdout.strip()
 
 
+def test_git_state(patch, tmpdir):
+    tmpdir.mkdir('.git').join('HEAD').write('ref: refs/heads/master\n')
+    patch.object(Version, 'root_dir', str(tmpdir))
+    state = Version.git_state()
+    assert state == 'ref: refs/heads/master::::'
+    tmpdir.join('.git', 'index').write('')
+    assert Version.git_state() != state
+
+
+def test_git_state_no_git(patch, tmpdir):
+    patch.object(Version, 'root_dir', str(tmpdir))
+    assert Version.git_state() is None
+
+
+def test_git_memo_path(patch, tmpdir):
+    """
+    Ensures every checkout is memoized in the cache directory
+    """
+    patch.dict(os.environ, {'STORYSCRIPT_CACHE_DIR': str(tmpdir)})
+    patch.object(Version, 'root_dir', '/checkout')
+    memo_path = Version.git_memo_path()
+    assert os.path.dirname(memo_path) == str(tmpdir.join('version'))
+    patch.object(Version, 'root_dir', '/other')
+    assert Version.git_memo_path() != memo_path
+
+
+def test_memoized_git(patch, magic, tmpdir):
+    """
+    Ensures git is only run again once the checkout has changed
+    """
+    memo_path = str(tmpdir.join('version', 'memo.json'))
+    patch.object(Version, 'git_memo_path', return_value=memo_path)
+    patch.object(Version, 'git_state', return_value='state')
+    describe = magic(__name__='git_describe', return_value='0.1.0')
+    assert Version.memoized_git(describe) == '0.1.0'
+    assert Version.memoized_git(describe) == '0.1.0'
+    assert describe.call_count == 1
+    Version.git_state.return_value = 'other state'
+    assert Version.memoized_git(describe) == '0.1.0'
+    assert describe.call_count == 2
+
+
+def test_memoized_git_error(patch, magic, tmpdir):
+    """
+    Ensures failures of git are memoized too
+    """
+    memo_path = str(tmpdir.join('memo.json'))
+    patch.object(Version, 'git_memo_path', return_value=memo_path)
+    patch.object(Version, 'git_state', return_value='state')
+    describe = magic(__name__='git_describe', side_effect=Exception())
+    assert Version.memoized_git(describe) is None
+    assert Version.memoized_git(describe) is None
+    assert describe.call_count == 1
+
+
+def test_memoized_git_no_git(patch, magic):
+    patch.object(Version, 'git_state', return_value=None)
+    patch.object(Version, 'read_git_memo')
+    describe = magic()
+    assert Version.memoized_git(describe) == describe.return_value
+    assert Version.read_git_memo.call_count == 0
+
+
+def test_read_git_memo_invalid(patch, tmpdir):
+    tmpdir.join('memo.json').write('[')
+    patch.object(Version, 'git_memo_path',
+                 return_value=str(tmpdir.join('memo.json')))
+    assert Version.read_git_memo('state') == {'state': 'state'}
+
+
 def test_read_version_file(patch):
+    Version.read_version.cache_clear()
     patch.object(io, 'open')
     r = Version.read_version()
     io.open.assert_called_with(
@@ -46,48 +121,85 @@ def test_read_version_file(patch):
     )
     assert io.open.call_args[0][0].endswith('VERSION')
     assert r == io.open().read().strip()
+    Version.read_version.cache_clear()
 
 
 def test_read_version_package(patch):
+    Version.read_version.cache_clear()
+    patch.object(Version, 'read_version_file', side_effect=Exception())
     patch.object(pkg_resources, 'resource_string')
     r = Version.read_version()
     pkg_resources.resource_string.assert_called_with(
         'storyscript', 'VERSION'
     )
     assert r == pkg_resources.resource_string().decode('utf8').strip()
+    Version.read_version.cache_clear()
 
 
 def test_read_version(patch):
+    Version.read_version.cache_clear()
     patch.object(Version, 'read_version_file')
     patch.object(Version, 'read_version_package')
-    assert Version.read_version() == Version.read_version_file()
+    assert Version.read_version() == Version.read_version_file.return_value
+    # the version is only read once
+    Version.read_version()
+    assert Version.read_version_file.call_count == 1
 
+    Version.read_version.cache_clear()
     Version.read_version_file.side_effect = Exception('.no.file.found.')
     assert Version.read_version() == Version.read_version_package()
 
+    Version.read_version.cache_clear()
     Version.read_version_package.side_effect = Exception('.no.file.found.')
     assert Version.read_version() is None
+    Version.read_version.cache_clear()
 
 
 def test_get_version(patch):
-    patch.object(Version, '_version')
-    assert Version.get_version() == Version._version
-
-    patch.object(Version, 'git_describe')
-    Version._version = None
-    assert Version.get_version() == Version.git_describe()
-
-    Version.git_describe.side_effect = Exception('.no.file.found.')
+    Version.get_version.cache_clear()
+    patch.object(Version, 'read_version')
+    assert Version.get_version() == Version.read_version()
+
+    Version.get_version.cache_clear()
+    patch.object(Version, 'run_git')
+    patch.object(Version, 'memoized_git')
+    Version.read_version.return_value = None
+    assert Version.get_version() == Version.run_git.return_value
+    # the dirty state of the checkout isn't memoized
+    Version.run_git.assert_called_with(Version.git_describe)
+    assert Version.memoized_git.call_count == 0
+
+    Version.get_version.cache_clear()
+    Version.run_git.return_value = None
     assert Version.get_version() == '0.0.0'
+    Version.get_version.cache_clear()
 
 
 def test_get_release_version(patch):
-    patch.object(Version, '_version')
-    assert Version.get_release_version() == Version._version
-
-    patch.object(Version, 'git_version')
-    Version._version = None
-    assert Version.get_release_version() == Version.git_version()
-
-    Version.git_version.side_effect = Exception('.no.file.found.')
+    Version.get_release_version.cache_clear()
+    patch.object(Version, 'read_version')
+    assert Version.get_release_version() == Version.read_version()
+
+    Version.get_release_version.cache_clear()
+    patch.object(Version, 'memoized_git')
+    Version.read_version.return_value = None
+    assert Version.get_release_version() == Version.memoized_git.return_value
+    Version.memoized_git.assert_called_with(Version.git_version)
+
+    Version.get_release_version.cache_clear()
+    Version.memoized_git.return_value = None
     assert Version.get_release_version() == '0.0.0'
+    Version.get_release_version.cache_clear()
+
+
+@mark.skipif(sys.version_info < (3, 7),
+             reason='modules resolve attributes lazily since 3.7')
+def test_version_lazy(patch):
+    """
+    Ensures the version is only resolved when it's accessed
+    """
+    patch.object(Version, 'get_version')
+    patch.object(Version, 'get_release_version')
+    assert Version.get_version.call_count == 0
+    assert Version.version == Version.get_version()
+    assert Version.release_version == Version.get_release_version()
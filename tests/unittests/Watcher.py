@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+import click
+
+from pytest import fixture, raises
+
+from storyscript.Bundle import Bundle
+from storyscript.Watcher import Watcher
+from storyscript.exceptions import StoryError
+
+
+@fixture
+def watcher(patch):
+    patch.object(os.path, 'isdir', return_value=True)
+    patch.many(Bundle, ['find_ignores', 'parser'])
+    return Watcher('dir', ignored_path='ignored', features={'debug': True})
+
+
+@fixture
+def echo(patch):
+    patch.object(click, 'echo')
+
+
+def test_watcher_init(watcher):
+    Bundle.find_ignores.assert_called_with('ignored')
+    Bundle.parser.assert_called_with(None)
+    assert watcher.path == 'dir'
+    assert watcher.bundle.features.debug is True
+    assert watcher.parser == Bundle.parser()
+    assert watcher.ignores == Bundle.find_ignores()
+    assert watcher.cache is None
+    assert watcher.mtimes == {}
+
+
+def test_watcher_init_file(patch):
+    patch.object(os.path, 'isdir', return_value=False)
+    patch.object(Bundle, 'find_ignores')
+    assert Watcher('a.story').ignores == []
+    assert Bundle.find_ignores.call_count == 0
+
+
+def test_watcher_stories(patch, watcher):
+    patch.object(Bundle, 'parse_directory')
+    result = watcher.stories()
+    Bundle.parse_directory.assert_called_with('dir', ignores=watcher.ignores)
+    assert result == Bundle.parse_directory()
+
+
+def test_watcher_stories_file(patch, watcher):
+    os.path.isdir.return_value = False
+    assert watcher.stories() == ['dir']
+
+
+def test_watcher_snapshot(patch, magic, watcher):
+    patch.object(Watcher, 'stories', return_value=['a.story', 'b.story'])
+    patch.object(os, 'stat', side_effect=[magic(st_mtime_ns=1),
+                                          FileNotFoundError()])
+    assert watcher.snapshot() == {'a.story': 1}
+
+
+def test_watcher_wait_until_stable(patch, watcher):
+    patch.object(time, 'sleep')
+    patch.object(Watcher, 'snapshot', side_effect=[{'a': 2}, {'a': 2}])
+    assert watcher.wait_until_stable({'a': 1}) == {'a': 2}
+    time.sleep.assert_called_with(Watcher.debounce)
+    assert Watcher.snapshot.call_count == 2
+
+
+def test_watcher_remove(echo, watcher):
+    watcher.bundle.story_files = {'a.story': 'source'}
+    watcher.bundle.stories = {'a.story': 'compiled'}
+    watcher.remove('a.story')
+    assert watcher.bundle.story_files == {}
+    assert watcher.bundle.stories == {}
+    click.echo.assert_called_with('a.story: removed')
+
+
+def test_watcher_compile(patch, echo, watcher):
+    """
+    Ensures a changed story is read again and compiled
+    """
+    patch.object(Bundle, 'compile')
+    patch.object(time, 'perf_counter', side_effect=[1, 1.5])
+    watcher.bundle.story_files = {'a.story': 'old source'}
+    watcher.compile('a.story')
+    assert watcher.bundle.story_files == {}
+    Bundle.compile.assert_called_with(['a.story'], parser=watcher.parser,
+                                      cache=None)
+    click.echo.assert_called_with('a.story: compiled in 500.0ms')
+
+
+def test_watcher_compile_error(patch, echo, watcher):
+    patch.object(Bundle, 'compile', side_effect=StoryError(None, None))
+    patch.object(StoryError, 'echo')
+    watcher.bundle.stories = {'a.story': 'compiled'}
+    watcher.compile('a.story')
+    assert watcher.bundle.stories == {}
+    assert StoryError.echo.call_count == 1
+    assert click.echo.call_count == 0
+
+
+def test_watcher_compile_internal_error(patch, echo, watcher):
+    patch.object(Bundle, 'compile', side_effect=ValueError())
+    patch.object(StoryError, 'internal_error')
+    watcher.compile('a.story')
+    assert StoryError.internal_error().echo.call_count == 1
+
+
+def test_watcher_update(patch, watcher):
+    """
+    Ensures only changed stories are compiled
+    """
+    patch.many(Watcher, ['compile', 'remove'])
+    watcher.mtimes = {'a.story': 1, 'b.story': 1, 'c.story': 1}
+    watcher.update({'a.story': 1, 'b.story': 2, 'd.story': 1})
+    Watcher.remove.assert_called_once_with('c.story')
+    assert Watcher.compile.call_count == 2
+    Watcher.compile.assert_any_call('b.story')
+    Watcher.compile.assert_any_call('d.story')
+    assert watcher.mtimes == {'a.story': 1, 'b.story': 2, 'd.story': 1}
+
+
+def test_watcher_watch(patch, echo, watcher):
+    patch.object(time, 'sleep', side_effect=[None, None, KeyboardInterrupt])
+    patch.many(Watcher, ['update', 'wait_until_stable'])
+    patch.object(Watcher, 'snapshot', side_effect=[{'a': 1}, {}, {'a': 2}])
+    with raises(KeyboardInterrupt):
+        watcher.watch()
+    time.sleep.assert_called_with(Watcher.interval)
+    Watcher.wait_until_stable.assert_called_once_with({'a': 2})
+    Watcher.update.assert_called_with(Watcher.wait_until_stable())
+    assert Watcher.update.call_count == 2
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from storyscript.Stats import Stats
 from storyscript.compiler import Compiler
 from storyscript.compiler.json import JSONCompiler
 from storyscript.compiler.lowering import Lowering
@@ -24,6 +25,40 @@ def test_compiler_compile(patch, magic):
     patch.object(JSONCompiler, 'compile')
     tree = magic()
     result = Compiler.compile(tree, story=None, features=None)
-    Compiler.generate.assert_called_with(tree, None)
+    Compiler.generate.assert_called_with(tree, None, None)
     JSONCompiler.compile.assert_called_with(Compiler.generate())
     assert result == JSONCompiler.compile()
+
+
+def test_compiler_generate_stats(patch, magic):
+    patch.init(Lowering)
+    patch.object(Lowering, 'process')
+    patch.object(Lowering, 'fake_lines', return_value=2)
+    patch.init(Semantics)
+    patch.object(Semantics, 'process')
+    tree = magic()
+    stats = Stats()
+    lowering = {'timings': {'expressions': 1, 'assignments': 2},
+                'reparses': 3}
+    semantics = {'timings': {'FunctionResolver': 4, 'TypeResolver': 5}}
+    patch.object(Lowering, 'timings', lowering['timings'], create=True)
+    patch.object(Lowering, 'reparses', lowering['reparses'], create=True)
+    patch.object(Semantics, 'timings', semantics['timings'], create=True)
+    patch.object(Semantics, 'mutation_cache', magic(hits=6, misses=7),
+                 create=True)
+    Compiler.generate(tree, features=None, stats=stats)
+    Lowering.fake_lines.assert_called_with(Lowering.process())
+    assert stats.timings == {'Lowering': 3, 'FunctionResolver': 4,
+                             'TypeResolver': 5}
+    assert stats.counters == {'reparses': 3, 'fake_lines': 2,
+                              'mutation_hits': 6, 'mutation_misses': 7}
+
+
+def test_compiler_compile_stats(patch, magic):
+    patch.object(Compiler, 'generate')
+    patch.object(JSONCompiler, 'compile')
+    tree = magic()
+    stats = Stats()
+    Compiler.compile(tree, story=None, features=None, stats=stats)
+    Compiler.generate.assert_called_with(tree, None, stats)
+    assert list(stats.timings) == ['JSONCompiler']
@@ -800,6 +800,14 @@ def test_compiler_subtree_parent(patch, compiler):
     compiler.assignment.assert_called_with(tree, '1')
 
 
+def test_compiler_subtree_parse_tree(patch, compiler):
+    patch.many(JSONCompiler, ['parse_tree', 'output'])
+    tree = Tree('output', [])
+    compiler.subtree(tree, parent='1')
+    JSONCompiler.parse_tree.assert_called_with(tree, parent='1')
+    JSONCompiler.output.assert_not_called()
+
+
 def test_compiler_subtrees(patch, compiler, tree):
     patch.object(JSONCompiler, 'subtree', return_value={'tree': 'sub'})
     compiler.subtrees(tree, tree)
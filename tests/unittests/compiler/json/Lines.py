@@ -16,10 +16,12 @@ def lines(magic):
 
 def test_lines_init(lines):
     assert lines.lines == {}
-    assert lines.variables == []
+    assert lines.variables == set()
     assert lines.services == []
     assert lines.functions == {}
     assert lines.output_scopes == {}
+    assert lines.scope_outputs == {}
+    assert lines.exit_line is None
 
 
 def test_lines_first(patch, lines):
@@ -49,6 +51,12 @@ def test_lines_set_name(patch, lines):
     assert d['name'] == 'name'
 
 
+def test_lines_set_name_variables(patch, lines):
+    patch.object(Lines, 'last', return_value={})
+    lines.set_name(['a', {'$OBJECT': 'dot', 'dot': 'b'}])
+    assert lines.variables == {'a'}
+
+
 def test_lines_set_next(patch, lines):
     lines.lines['1'] = {}
     patch.object(Lines, 'last', return_value=lines.lines['1'])
@@ -58,17 +66,38 @@ def test_lines_set_next(patch, lines):
 
 @mark.parametrize('method', ['if', 'elif', 'try', 'catch'])
 def test_lines_set_exit(patch, lines, method):
-    lines.finished_scopes = ['1']
-    lines.lines = {'1': {}, '2': {'method': method}}
-    lines._lines = ['1', '2']
+    lines.make(method, Position('1', '2', '3'))
+    lines.make('method', Position('2', '2', '3'))
+    lines.finished_scopes = ['2']
     lines.set_exit('3')
-    assert lines.lines['2']['exit'] == '3'
+    assert lines.lines['1']['exit'] == '3'
+    assert lines.lines['2']['exit'] is None
     assert lines.finished_scopes == []
 
 
+def test_lines_set_exit_last(lines):
+    """
+    Ensures that the exit of the last if or try line is set
+    """
+    lines.make('if', Position('1', '2', '3'))
+    lines.make('if', Position('2', '2', '3'))
+    lines.set_exit('3')
+    assert lines.lines['1']['exit'] is None
+    assert lines.lines['2']['exit'] == '3'
+
+
+def test_lines_set_exit_none(lines):
+    lines.finished_scopes = ['1']
+    lines.make('method', position_fixed)
+    lines.set_exit('3')
+    assert lines.lines['1']['exit'] is None
+    assert lines.finished_scopes == ['1']
+
+
 def test_lines_set_scope(patch, lines):
     lines.set_scope('2', '1')
     assert lines.output_scopes['2'] == {'parent': '1', 'output': []}
+    assert lines.scope_outputs['2'] == set()
 
 
 def test_lines_set_scope_output(lines):
@@ -84,16 +113,18 @@ def test_lines_finish_scope(lines):
 
 
 def test_lines_is_output(lines):
-    lines.output_scopes = {'1': {'parent': None, 'output': ['service']}}
+    lines.set_scope('1', None, output=['service'])
     assert lines.is_output('1', 'service') is True
 
 
 def test_lines_is_output_from_parent(lines):
-    lines.output_scopes = {
-        '2': {'parent': '1', 'output': []},
-        '1': {'output': ['service']}
-    }
+    lines.set_scope('1', None, output=['service'])
+    lines.set_scope('2', '1')
+    lines.set_scope('3', '2', output=['other'])
     assert lines.is_output('2', 'service') is True
+    assert lines.is_output('3', 'service') is True
+    assert lines.is_output('3', 'other') is True
+    assert lines.is_output('2', 'other') is False
 
 
 def test_lines_is_output_false(lines):
@@ -229,8 +260,9 @@ def test_lines_is_variable_defined(patch, lines):
     """
     Ensures that the check for previously seen variables works
     """
-    lines.variables = [['one', 'two'], ['three']]
+    lines.variables = {'one', 'two', 'three'}
     assert lines.is_variable_defined('one')
     assert lines.is_variable_defined('two')
     assert lines.is_variable_defined('three')
     assert not lines.is_variable_defined('four')
+    assert not lines.is_variable_defined(['one'])
@@ -124,6 +124,17 @@ def test_faketree_path_line(fake_tree):
     assert fake_tree.path(line=1).child(0).line == 1
 
 
+def test_faketree_mark_line(fake_tree):
+    t1 = Token('X', 'x', line=1)
+    t2 = Token('Y', 'y', line=2)
+    tree = Tree('expression', [Tree('entity', [t1]), t2])
+    for i in range(5000):
+        tree = Tree('expression', [tree])
+    fake_tree.mark_line(tree, 3)
+    assert t1.line == 3
+    assert t2.line == 3
+
+
 def test_faketree_assignment(patch, tree, fake_tree):
     patch.many(FakeTree, ['path', 'get_line'])
     result = fake_tree.assignment(tree)
@@ -142,11 +153,14 @@ def test_faketree_assignment(patch, tree, fake_tree):
 def test_faketree_add_assignment(patch, fake_tree, block):
     patch.object(FakeTree, 'assignment')
     patch.object(Tree, 'create_token_from_tok')
-    patch.object(FakeTree, 'find_insert_pos', return_value=0)
+    patch.object(FakeTree, 'find_insert_pos', return_value=(0, None))
     block.children = [1]
     block.child.return_value = None
+    fake_tree.groups = [[]]
     result = fake_tree.add_assignment('value', original_line=10)
     FakeTree.assignment.assert_called_with('value')
+    assert block.children == [1]
+    fake_tree.splice()
     assert block.children == [FakeTree.assignment(), 1]
     path_tok = FakeTree.assignment().path.child(0)
     Tree.create_token_from_tok.assert_called_with(
@@ -160,26 +174,84 @@ def test_faketree_add_assignment(patch, fake_tree, block):
 
 def test_faketree_add_assignment_more_children(patch, fake_tree, block):
     patch.object(FakeTree, 'assignment')
-    patch.object(FakeTree, 'find_insert_pos', return_value=0)
+    patch.object(FakeTree, 'find_insert_pos', return_value=(0, None))
     block.children = ['c1', fake_tree.block.last_child()]
+    fake_tree.groups = [[], []]
     fake_tree.add_assignment('value', original_line=42)
+    fake_tree.splice()
     expected = [FakeTree.assignment(), 'c1', block.last_child()]
     assert block.children == expected
 
 
 def test_faketree_add_assignment_four_children(patch, fake_tree, block):
     patch.object(FakeTree, 'assignment')
-    patch.object(FakeTree, 'find_insert_pos', return_value=1)
+    patch.object(FakeTree, 'find_insert_pos', return_value=(1, None))
     block.children = ['c1', 'c2', 'c3', fake_tree.block.last_child()]
+    fake_tree.groups = [[], [], [], []]
     fake_tree.add_assignment('value', original_line=42)
+    fake_tree.splice()
     expected = ['c1', FakeTree.assignment(), 'c2', 'c3', block.last_child()]
     assert block.children == expected
 
 
 def test_faketree_add_assignment_four_children_bottom(patch, fake_tree, block):
     patch.object(FakeTree, 'assignment')
-    patch.object(FakeTree, 'find_insert_pos', return_value=-1)
+    patch.object(FakeTree, 'find_insert_pos', return_value=(3, None))
     block.children = ['c1', 'c2', 'c3', fake_tree.block.last_child()]
+    fake_tree.groups = [[], [], [], []]
     fake_tree.add_assignment('value', original_line=42)
+    fake_tree.splice()
     expected = ['c1', 'c2', 'c3', FakeTree.assignment(), block.last_child()]
     assert block.children == expected
+
+
+def assignment(name, line):
+    return Tree('assignment', [Tree('path', [Token('NAME', name, line=line)])])
+
+
+def test_faketree_find_insert_pos():
+    block = Tree('block', [assignment('a', '1'), assignment('b', '2')])
+    fake_tree = FakeTree(block)
+    assert fake_tree.find_insert_pos('2') == (1, None)
+    assert fake_tree.find_insert_pos('1') == (0, None)
+
+
+def test_faketree_find_insert_pos_default():
+    """
+    Ensures lines which aren't in the block are inserted before its last
+    child.
+    """
+    block = Tree('block', [assignment('a', '1'), assignment('b', '2')])
+    fake_tree = FakeTree(block)
+    assert fake_tree.find_insert_pos('5') == (1, None)
+
+
+def test_faketree_find_insert_pos_inserted():
+    """
+    Ensures new assignments can be targeted before they are spliced.
+    """
+    block = Tree('block', [assignment('a', '1'), assignment('b', '2')])
+    fake_tree = FakeTree(block)
+    new = assignment('__p-2.1', '2.1')
+    fake_tree.insert(fake_tree.find_insert_pos('2'), new)
+    assert fake_tree.find_insert_pos('2.1') == (1, new)
+    newer = assignment('__p-2.2', '2.2')
+    fake_tree.insert(fake_tree.find_insert_pos('2.1'), newer)
+    assert fake_tree.groups[1] == [newer, new]
+
+
+def test_faketree_add_assignments_splice():
+    block = Tree('block', [assignment('a', '1'), assignment('b', '2')])
+    fake_tree = FakeTree(block)
+    fake_tree.add_assignment(Tree('x', [Token('NAME', 'x', line='2')]), '2')
+    fake_tree.add_assignment(Tree('y', [Token('NAME', 'y', line='1')]), '1')
+    assert len(block.children) == 2
+    fake_tree.splice()
+    paths = [child.path.child(0).value for child in block.children]
+    assert paths == ['__p-1.2', 'a', '__p-1.1', 'b']
+
+
+def test_faketree_splice_empty(block, fake_tree):
+    block.children = ['c1']
+    fake_tree.splice()
+    assert block.children == ['c1']
@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
+import time
 from unittest import mock
 
+from lark.lexer import Token
+
 from pytest import fixture
 
 from storyscript.compiler.lowering import FakeTree, Lowering
-from storyscript.parser import Tree
+from storyscript.parser import Transformer, Tree
 
 
 @fixture
 def preprocessor(patch):
     patch.init(FakeTree)
+    patch.object(FakeTree, 'splice')
     patch.object(Lowering, 'fake_tree', return_value=FakeTree(None))
     return Lowering(parser=None, features=None)
 
@@ -28,6 +32,17 @@ def test_preprocessor_fake_tree(patch):
     assert isinstance(result, FakeTree)
 
 
+def test_preprocessor_fake_lines():
+    def assignment(name):
+        path = Tree('path', [Token('NAME', name)])
+        return Tree('assignment', [path, Tree('assignment_fragment', [])])
+
+    tree = Tree('start', [Tree('block', [assignment('__p-1.1'),
+                                         assignment('a'),
+                                         assignment('__p-1.2')])])
+    assert Lowering.fake_lines(tree) == 2
+
+
 def test_preprocessor_replace_expression(magic, preprocessor, entity):
     """
     Check that the new assignment is inserted above the tree
@@ -69,7 +84,82 @@ def test_preprocessor_process(patch, magic, preprocessor):
     assert result == tree
     preprocessor.visit.assert_called_with(
         tree, None, None, preprocessor.is_inline_expression,
-        preprocessor.replace_expression, parent=None)
+        preprocessor.replace_expression, parent=None,
+        pre=preprocessor.lower_function_dot)
+
+
+def test_preprocessor_process_passes(patch, magic, preprocessor):
+    """
+    Ensures that all passes are applied in order and timed
+    """
+    passes = [f'pass_{name}' for name in Lowering.passes]
+    patch.many(Lowering, passes)
+    manager = magic()
+    for name in passes:
+        manager.attach_mock(getattr(Lowering, name), name)
+    tree = magic()
+    preprocessor.process(tree)
+    assert manager.mock_calls == [getattr(mock.call, name)(tree)
+                                  for name in passes]
+    assert list(preprocessor.timings.keys()) == list(Lowering.passes)
+
+
+def test_preprocessor_process_timings(patch, magic, preprocessor):
+    """
+    Ensures that the timings of all processed trees are summed up
+    """
+    patch.many(Lowering, [f'pass_{name}' for name in Lowering.passes])
+    patch.object(time, 'perf_counter', side_effect=[0, 1, 2, 4] * 5)
+    preprocessor.process(magic())
+    preprocessor.process(magic())
+    assert preprocessor.timings['concise_when'] == 3
+    assert preprocessor.timings['expressions'] == 3
+
+
+def test_preprocessor_visit_expressions_arguments(patch, preprocessor):
+    """
+    Ensures that arguments are expanded after their expressions
+    """
+    patch.object(Transformer, 'argument_shorthand')
+    patch.many(Lowering, ['lower_cmp_expr', 'lower_as_expr'])
+    expression = Tree('expression', [Tree('entity', ['x'])])
+    arguments = Tree('arguments', [expression])
+    preprocessor.visit_expressions(arguments, block=None)
+    Transformer.argument_shorthand.assert_called_with(arguments)
+    Lowering.lower_cmp_expr.assert_called_with(Tree('entity', ['x']))
+    assert Lowering.lower_as_expr.call_count == 3
+
+
+def test_preprocessor_lower_function_dot():
+    """
+    Ensures that function calls with a dotted path become mutations
+    """
+    name = Tree('path_fragment', ['name'])
+    args = Tree('arguments', [])
+    node = Tree('call_expression', [Tree('path', ['obj', name]), args])
+    Lowering.lower_function_dot(node)
+    assert node == Tree('mutation', [
+        Tree('expression', [Tree('entity', [Tree('path', ['obj'])])]),
+        Tree('mutation_fragment', ['name', args]),
+    ])
+
+
+def test_preprocessor_lower_function_dot_single():
+    node = Tree('call_expression', [Tree('path', ['fun'])])
+    Lowering.lower_function_dot(node)
+    assert node.data == 'call_expression'
+
+
+def test_preprocessor_visit_pre(patch, magic, preprocessor):
+    """
+    Ensures that `pre` is applied to each node before its children
+    """
+    inner = Tree('inner', ['x'])
+    tree = Tree('outer', [inner])
+    pre = magic()
+    preprocessor.visit(tree, None, None, lambda x: False, None, parent=None,
+                       pre=pre)
+    assert pre.call_args_list == [mock.call(tree), mock.call(inner)]
 
 
 def test_preprocessor_is_inline_expression(magic):
@@ -444,3 +534,59 @@ def test_objects_flatten_template_escapes_uni3(patch, tree):
     assert result == [
         flatten_to_string(r'\N{LATIN CAPITAL LETTER A}'),
     ]
+
+
+def test_preprocessor_eval(patch, magic, preprocessor):
+    """
+    Ensures string templates are parsed with the template parser
+    """
+    patch.object(Lowering, 'parse_story')
+    orig_node = magic()
+    orig_node.column.return_value = '4'
+    fake_tree = magic()
+    preprocessor.parser = magic(template_parses=0)
+    template = magic()
+    template.children[0].data = 'service'
+
+    def parse_template(code, column):
+        preprocessor.parser.template_parses += 1
+        return template
+
+    preprocessor.parser.parse_template.side_effect = parse_template
+    result = preprocessor.eval(orig_node, 'a b', fake_tree)
+    preprocessor.parser.parse_template.assert_called_with('a b', 5)
+    assert Lowering.parse_story.call_count == 0
+    assert preprocessor.reparses == 1
+    fake_tree.add_assignment.assert_called_with(
+        template.children[0], original_line=orig_node.line())
+    assert result == fake_tree.add_assignment()
+
+
+def test_preprocessor_eval_memoized(patch, magic, preprocessor):
+    """
+    Ensures memoized string templates aren't counted as reparses
+    """
+    orig_node = magic()
+    orig_node.column.return_value = '4'
+    preprocessor.parser = magic(template_parses=3)
+    preprocessor.parser.parse_template().children[0].data = 'service'
+    preprocessor.eval(orig_node, 'a b', magic())
+    assert preprocessor.reparses == 0
+
+
+def test_preprocessor_eval_story(patch, magic, preprocessor):
+    """
+    Ensures code that the template parser rejects is parsed as a story
+    """
+    patch.object(Lowering, 'parse_story')
+    Lowering.parse_story().data = 'service'
+    orig_node = magic()
+    orig_node.column.return_value = '4'
+    fake_tree = magic()
+    preprocessor.parser = magic(template_parses=0)
+    preprocessor.parser.parse_template.return_value = None
+    preprocessor.eval(orig_node, 'a = b', fake_tree)
+    Lowering.parse_story.assert_called_with(orig_node, 'a = b', 5)
+    assert preprocessor.reparses == 1
+    fake_tree.add_assignment.assert_called_with(
+        Lowering.parse_story(), original_line=orig_node.line())
@@ -7,3 +7,23 @@ def test_mutations_empty():
 
 def test_mutations_comment():
     assert len(Hub('#comment\n#another comment\n').mutations()) == 0
+
+
+def test_hub_instance(patch):
+    patch.object(Hub, '_instance', None)
+    patch.init(Hub)
+    result = Hub.instance()
+    assert isinstance(result, Hub)
+    assert Hub.instance() is result
+    assert Hub.__init__.call_count == 1
+
+
+def test_hub_instance_builtins(patch):
+    """
+    Ensures the builtin mutations of the storyhub are loaded
+    """
+    from storyhub.engine.Builtins import builtins
+    patch.object(Hub, '_instance', None)
+    patch.init(Hub)
+    Hub.instance()
+    Hub.__init__.assert_called_with(builtins)
@@ -0,0 +1,76 @@
+from pytest import fixture
+
+from storyscript.compiler.semantics.functions.MutationBuilder import \
+    mutation_builder
+from storyscript.compiler.semantics.functions.MutationCache import \
+    MutationCache
+from storyscript.compiler.semantics.types.Types import IntType, ListType, \
+    StringType
+
+
+@fixture
+def cache(patch):
+    patch.object(MutationCache, '_instances', MutationCache._instances.copy())
+    MutationCache.clear()
+    return MutationCache()
+
+
+def test_mutationcache_init(cache):
+    assert cache.hits == 0
+    assert cache.misses == 0
+    assert cache.hit_rate() == 0
+
+
+def test_mutationcache_instantiate(cache):
+    mutation = mutation_builder('List[A] length -> int')
+    list_type = ListType(StringType.instance())
+    fn = cache.instantiate(mutation, list_type)
+    assert fn.output() == IntType.instance()
+    assert cache.instantiate(mutation, list_type) is fn
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate() == 0.5
+
+
+def test_mutationcache_instantiate_types(cache):
+    mutation = mutation_builder('List[A] get index:int -> A')
+    strings = cache.instantiate(mutation, ListType(StringType.instance()))
+    ints = cache.instantiate(mutation, ListType(IntType.instance()))
+    assert strings.output() == StringType.instance()
+    assert ints.output() == IntType.instance()
+    assert cache.misses == 2
+
+
+def test_mutationcache_shared(cache):
+    mutation = mutation_builder('string length -> int')
+    fn = cache.instantiate(mutation, StringType.instance())
+    other = MutationCache()
+    assert other.instantiate(mutation, StringType.instance()) is fn
+    assert other.hits == 1
+    assert cache.hits == 0
+
+
+def test_mutationcache_max_size(patch, cache):
+    patch.object(MutationCache, 'max_size', 2)
+    first = mutation_builder('string length -> int')
+    second = mutation_builder('string lowercase -> string')
+    third = mutation_builder('string uppercase -> string')
+    string = StringType.instance()
+    fn = cache.instantiate(first, string)
+    cache.instantiate(second, string)
+    # first is now used more recently than second
+    cache.instantiate(first, string)
+    cache.instantiate(third, string)
+    assert len(MutationCache._instances) == 2
+    assert cache.instantiate(first, string) is fn
+    cache.instantiate(second, string)
+    assert cache.misses == 4
+    assert cache.hits == 2
+
+
+def test_mutationcache_clear(cache):
+    mutation = mutation_builder('string length -> int')
+    cache.instantiate(mutation, StringType.instance())
+    MutationCache.clear()
+    cache.instantiate(mutation, StringType.instance())
+    assert cache.misses == 2
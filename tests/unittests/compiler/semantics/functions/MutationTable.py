@@ -0,0 +1,90 @@
+from pytest import fixture, raises
+
+from storyscript.compiler.semantics.functions.HubMutations import Hub
+from storyscript.compiler.semantics.functions.MutationBuilder import \
+    mutation_builder
+from storyscript.compiler.semantics.functions.MutationTable import \
+    MutationTable
+from storyscript.compiler.semantics.types.Types import AnyType, IntType, \
+    StringType
+
+
+@fixture
+def table():
+    table = MutationTable()
+    table.insert(mutation_builder('int increment -> int'))
+    table.insert(mutation_builder('string length -> int'))
+    table.insert(mutation_builder('int length -> int'))
+    return table
+
+
+def test_mutationtable_resolve(table):
+    overloads = table.resolve(IntType.instance(), 'increment')
+    assert overloads.type() == IntType.instance()
+    assert overloads.single().name() == 'increment'
+    assert table.resolve(StringType.instance(), 'increment') is None
+    assert table.resolve(IntType.instance(), 'unknown') is None
+
+
+def test_mutationtable_resolve_any(table):
+    overloads = table.resolve(AnyType.instance(), 'length')
+    assert len(overloads.all()) == 2
+    assert table.resolve(AnyType.instance(), 'length') is overloads
+
+
+def test_mutationtable_resolve_any_insert(table):
+    """
+    Ensures the overloads for AnyType are updated by inserts
+    """
+    overloads = table.resolve(AnyType.instance(), 'length')
+    table.insert(mutation_builder('List[A] length -> int'))
+    result = table.resolve(AnyType.instance(), 'length')
+    assert result is not overloads
+    assert len(result.all()) == 3
+
+
+def test_mutationtable_freeze(table):
+    table.freeze()
+    assert 'length' in table._any
+    with raises(AssertionError):
+        table.insert(mutation_builder('List[A] length -> int'))
+
+
+def test_mutationtable_overlay(table):
+    """
+    Ensures overlays add mutations without changing their parent table
+    """
+    table.freeze()
+    overlay = table.overlay()
+    overlay.insert(mutation_builder('List[A] length -> int'))
+    overlay.insert(mutation_builder('int decrement -> int'))
+    assert len(overlay.resolve(AnyType.instance(), 'length').all()) == 3
+    assert len(table.resolve(AnyType.instance(), 'length').all()) == 2
+    assert overlay.resolve(IntType.instance(), 'increment') is not None
+    assert table.resolve(IntType.instance(), 'decrement') is None
+
+
+def test_mutationtable_init(patch, magic):
+    patch.object(MutationTable, '_hub', None)
+    patch.object(Hub, 'instance')
+    Hub.instance().mutations.return_value = [
+        mutation_builder('int increment -> int')
+    ]
+    result = MutationTable.init()
+    assert result.frozen
+    assert result.resolve(IntType.instance(), 'increment') is not None
+    assert MutationTable.init() is result
+    assert Hub.instance().mutations.call_count == 1
+
+
+def test_mutationtable_init_hub(patch):
+    """
+    Ensures the table is rebuilt for another Hub instance
+    """
+    patch.object(MutationTable, '_hub', None)
+    patch.object(Hub, 'instance', return_value=Hub('int increment -> int'))
+    result = MutationTable.init()
+    Hub.instance.return_value = Hub('int decrement -> int')
+    table = MutationTable.init()
+    assert table is not result
+    assert table.resolve(IntType.instance(), 'increment') is None
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
-from storyscript.compiler.semantics.symbols.Scope import Scope
-from storyscript.compiler.semantics.symbols.Symbols import Symbols
+from storyscript.compiler.semantics.symbols.Scope import Scope, ScopeJoiner
+from storyscript.compiler.semantics.symbols.Symbols import Symbol, Symbols
+from storyscript.compiler.semantics.types.Types import IntType, StringType
 
 
 def test_scope_pretty_none(patch):
@@ -13,7 +14,8 @@ Symbols:
 
 
 def test_scope_pretty(patch, magic):
-    root_scope = '.parent.'
+    root_scope = Scope()
+    patch.object(Scope, '__str__', return_value='.parent.')
     scope = Scope(parent=root_scope)
     patch.object(Symbols, 'pretty', return_value='.symbols.')
     assert scope.pretty() == """Parent: .parent.
@@ -22,20 +24,74 @@ Symbols:
     Symbols.pretty.assert_called_with(indent='\t')
 
 
-def test_scope_resolve_fail(patch, magic):
-    patch.object(Symbols, 'resolve', return_value=False)
-    patch.object(Scope, 'scopes', return_value=[Scope(), Scope()])
-    scope = Scope()
-    assert scope.resolve('.p.') is None
-    Symbols.resolve.call_count == 2
+def test_scope_resolve_fail():
+    scope = Scope(parent=Scope())
+    assert scope.resolve('a') is None
 
 
-def test_scope_resolve_sucess(patch, magic):
-    patch.object(Symbols, 'resolve', return_value=True)
-    patch.object(Scope, 'scopes', return_value=[Scope(), Scope()])
-    scope = Scope()
-    assert scope.resolve('.p.') == Symbols.resolve()
-    Symbols.resolve.call_count == 1
+def test_scope_resolve_sucess():
+    root = Scope()
+    scope = Scope(parent=root)
+    a = Symbol('a', IntType.instance())
+    root.insert(a)
+    assert scope.resolve('a') is a
+    assert root.resolve('a') is a
+
+
+def test_scope_resolve_nearest():
+    s1 = Scope()
+    s2 = Scope(parent=s1)
+    s3 = Scope(parent=s2)
+    a1 = Symbol('a', IntType.instance())
+    a2 = Symbol('a', StringType.instance())
+    s1.insert(a1)
+    s2.insert(a2)
+    assert s3.resolve('a') is a2
+    assert Scope(parent=s1).resolve('a') is a1
+
+
+def test_scope_resolve_unknown(patch):
+    s1 = Scope()
+    s2 = Scope(parent=s1)
+    patch.object(Symbols, 'resolve', return_value=None)
+    assert s2.resolve('a') is None
+    # the scopes aren't searched for a name which was never inserted
+    Symbols.resolve.assert_called_once_with('a')
+
+
+def test_scope_resolve_cached(patch):
+    s1 = Scope()
+    s2 = Scope(parent=s1)
+    s3 = Scope(parent=s2)
+    a = Symbol('a', IntType.instance())
+    s1.insert(a)
+    assert s3.resolve('a') is a
+    assert s2._resolved == {'a': (1, a)}
+    patch.object(Symbols, 'resolve', return_value=None)
+    assert Scope(parent=s2).resolve('a') is a
+    assert Symbols.resolve.call_count == 2
+
+
+def test_scope_resolve_inserted_after():
+    s1 = Scope()
+    s2 = Scope(parent=s1)
+    s3 = Scope(parent=s2)
+    a1 = Symbol('a', IntType.instance())
+    s1.insert(a1)
+    assert s3.resolve('a') is a1
+    a2 = Symbol('a', StringType.instance())
+    s2.insert(a2)
+    assert s3.resolve('a') is a2
+    assert s3.resolve('b') is None
+    b = Symbol('b', IntType.instance())
+    s1.insert(b)
+    assert s3.resolve('b') is b
+
+
+def test_scope_resolve_separate_trees():
+    s1 = Scope()
+    s1.insert(Symbol('a', IntType.instance()))
+    assert Scope(parent=Scope()).resolve('a') is None
 
 
 def test_scope_scopes_single():
@@ -54,3 +110,21 @@ def test_scope_scopes_multiple():
     assert r[0] is s3
     assert r[1] is s2
     assert r[2] is s1
+
+
+def test_scope_joiner():
+    root = Scope()
+    s1 = Scope(parent=root)
+    s2 = Scope(parent=root)
+    a = Symbol('a', IntType.instance())
+    s1.insert(a)
+    s1.insert(Symbol('b', IntType.instance()))
+    s2.insert(Symbol('a', IntType.instance()))
+    joiner = ScopeJoiner()
+    joiner.add(s1)
+    joiner.add(s2)
+    joiner.insert_to(root)
+    assert root.resolve('a') is a
+    assert root.resolve('b') is None
+    # the joined scopes are kept
+    assert s1.resolve('b').name() == 'b'
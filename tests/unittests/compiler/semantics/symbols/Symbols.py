@@ -51,3 +51,26 @@ def test_storage_class_write():
 
 def test_storage_class_rebindable():
     assert str(StorageClass.rebindable()) == 'ra'
+
+
+def test_storage_class_interned():
+    assert StorageClass.write() is StorageClass.write()
+    assert StorageClass.read() is StorageClass.instance(write=False,
+                                                        rebindable=False)
+    assert StorageClass.read() is not StorageClass.rebindable()
+
+
+def test_storage_class_index():
+    assert StorageClass.write().index() is StorageClass.write()
+    assert StorageClass.rebindable().index() is StorageClass.read()
+
+
+def test_storage_class_declaration_from_symbol():
+    sc = StorageClass.rebindable().declaration_from_symbol(rebindable=False)
+    assert sc is StorageClass.read()
+
+
+def test_symbol_slots():
+    sym = Symbol('foo', IntType.instance())
+    assert not hasattr(sym, '__dict__')
+    assert not hasattr(StorageClass.write(), '__dict__')
@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
+import copy
+import gc
+import pickle
+
 from lark.lexer import Token
 
 from pytest import mark, raises
 
+import storyscript.compiler.semantics.types.Types as TypesModule
 from storyscript.compiler.semantics.types.Types import AnyType, \
     BaseType, BooleanType, FloatType, IntType, ListType, MapType, \
-    NoneType, RegExpType, StringType, singleton
+    NoneType, RegExpType, StringType, binary_op, binary_ops, \
+    explicit_cast, explicit_casts, implicit_cast, implicit_casts, memoize, \
+    singleton
 
 
 def test_singleton():
@@ -64,3 +71,60 @@ def test_none_explicit_from():
 def test_base_type_not_implemented():
     with raises(NotImplementedError):
         BaseType().op(None)
+
+
+def test_types_interned():
+    assert IntType() is IntType.instance()
+    assert ListType(IntType.instance()) is ListType(IntType.instance())
+    assert ListType(IntType.instance()) is not ListType(FloatType.instance())
+    map_type = MapType(StringType.instance(), ListType(IntType.instance()))
+    assert MapType(StringType.instance(),
+                   ListType(IntType.instance())) is map_type
+    assert MapType(StringType.instance(), IntType.instance()) != map_type
+
+
+def test_types_interned_copy():
+    map_type = MapType(StringType.instance(), ListType(IntType.instance()))
+    assert copy.deepcopy(map_type) is map_type
+    assert pickle.loads(pickle.dumps(map_type)) is map_type
+
+
+def test_types_interned_released():
+    """
+    Ensures unused types are removed from the table of interned types
+    """
+    nested = ListType(ListType(ListType(RegExpType.instance())))
+    key = (ListType, nested)
+    outer = ListType(nested)
+    assert BaseType._interned[key] is outer
+    del outer
+    gc.collect()
+    assert key not in BaseType._interned
+
+
+def test_binary_op_memoized():
+    list_type = ListType(IntType.instance())
+    plus = Token('PLUS', '+')
+    assert binary_op(plus, list_type, list_type) is list_type
+    assert binary_ops[('PLUS', list_type, list_type)] is list_type
+
+
+def test_casts_memoized():
+    int_, float_ = IntType.instance(), FloatType.instance()
+    assert implicit_cast(int_, float_) is float_
+    assert implicit_casts[(int_, float_)] is float_
+    assert explicit_cast(int_, StringType.instance()) is StringType.instance()
+    assert explicit_casts[(int_, StringType.instance())] is \
+        StringType.instance()
+
+
+def test_memoize(patch):
+    """
+    Ensures a full memo table is emptied before a result is added
+    """
+    patch.object(TypesModule, 'memo_size', 2)
+    table = {'a': 1}
+    assert memoize(table, 'b', 2) == 2
+    assert table == {'a': 1, 'b': 2}
+    assert memoize(table, 'c', 3) == 3
+    assert table == {'c': 3}
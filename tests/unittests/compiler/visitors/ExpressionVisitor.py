@@ -2,71 +2,96 @@
 from pytest import raises
 
 from storyscript.compiler.visitors.ExpressionVisitor import ExpressionVisitor
+from storyscript.parser import Tree
 
 
 def test_objects_expression_one(patch, tree):
     """
-    Ensures ExpressionVisitor.expression works with one node
+    Ensures ExpressionVisitor.compile_expression works with one node
     """
     patch.many(ExpressionVisitor, ['entity'])
     tree.first_child().data = 'entity'
     tree.children = [1]
-    r = ExpressionVisitor().expression(tree)
+    r = ExpressionVisitor().compile_expression(tree, [])
     ExpressionVisitor.entity.assert_called_with(tree.first_child())
     assert r == ExpressionVisitor.entity()
 
 
 def test_objects_expression_two(patch, tree):
     """
-    Ensures ExpressionVisitor.expression works with two nodes
+    Ensures ExpressionVisitor.compile_expression works with two nodes
     """
     patch.many(ExpressionVisitor, ['nary_expression'])
     tree.first_child().data = 'unary_operator'
     tree.children = ['!', 1]
-    expression = ExpressionVisitor().expression
-    patch.object(ExpressionVisitor, 'expression')
-    r = expression(tree)
+    r = ExpressionVisitor().compile_expression(tree, ['.value.'])
     ExpressionVisitor.nary_expression.assert_called_with(
-        tree, tree.first_child().child(0), [
-            ExpressionVisitor.expression(tree.child(1))
-        ])
+        tree, tree.first_child().child(0), ['.value.'])
     assert r == ExpressionVisitor.nary_expression()
 
 
 def test_objects_expression_two_as(patch, tree):
     """
-    Ensures ExpressionVisitor.expression works with as
+    Ensures ExpressionVisitor.compile_expression works with as
     """
     patch.many(ExpressionVisitor, ['as_expression'])
     tree.child(1).data = 'as_operator'
     tree.children = ['!', 1]
-    expression = ExpressionVisitor().expression
-    patch.object(ExpressionVisitor, 'expression')
-    r = expression(tree)
-    ExpressionVisitor.as_expression.assert_called_with(
-        tree, ExpressionVisitor.expression(tree.first_child()),
-    )
+    r = ExpressionVisitor().compile_expression(tree, ['.value.'])
+    ExpressionVisitor.as_expression.assert_called_with(tree, '.value.')
     assert r == ExpressionVisitor.as_expression()
 
 
 def test_objects_expression_three(patch, tree):
     """
-    Ensures ExpressionVisitor.expression works with three nodes
+    Ensures ExpressionVisitor.compile_expression works with three nodes
     """
     patch.many(ExpressionVisitor, ['nary_expression'])
     tree.child(1).data = 'mul_operator'
     tree.children = [1, '*', 2]
-    expression = ExpressionVisitor().expression
-    patch.object(ExpressionVisitor, 'expression')
-    r = expression(tree)
+    r = ExpressionVisitor().compile_expression(tree, ['.a.', '.b.'])
     ExpressionVisitor.nary_expression.assert_called_with(
-        tree, tree.child(1).child(0), [
-            ExpressionVisitor.expression(tree.first_child()),
-            ExpressionVisitor.expression(tree.child(2))
-        ])
+        tree, tree.child(1).child(0), ['.a.', '.b.'])
     assert r == ExpressionVisitor.nary_expression()
 
 
+def entity(value):
+    return Tree('expression', [Tree('entity', [value])])
+
+
+def test_objects_expression_nested(patch):
+    """
+    Ensures ExpressionVisitor.expression compiles the nested expressions
+    before their expression
+    """
+    patch.object(ExpressionVisitor, 'values', side_effect=lambda v: v)
+    patch.object(ExpressionVisitor, 'nary_expression',
+                 side_effect=lambda tree, op, values: (op, values))
+    patch.object(ExpressionVisitor, 'as_expression',
+                 side_effect=lambda tree, expr: ('as', expr))
+    minus = Tree('expression', [Tree('unary_operator', ['-']), entity('b')])
+    cast = Tree('expression', [minus, Tree('as_operator', ['int'])])
+    tree = Tree('expression', [entity('a'), Tree('arith_operator', ['+']),
+                               cast])
+    r = ExpressionVisitor().expression(tree)
+    assert r == ('+', ['a', ('as', ('-', ['b']))])
+
+
+def test_objects_expression_deep(patch):
+    """
+    Ensures ExpressionVisitor.expression compiles expressions deeper than
+    the recursion limit
+    """
+    patch.object(ExpressionVisitor, 'values', return_value=1)
+    patch.object(ExpressionVisitor, 'nary_expression',
+                 side_effect=lambda tree, op, values: sum(values))
+    tree = entity('a')
+    for i in range(5000):
+        tree = Tree('expression', [tree, Tree('arith_operator', ['+']),
+                                   entity('a')])
+    assert ExpressionVisitor().expression(tree) == 5001
+
+
 def test_objects_nary_expression(patch, tree):
     """
     Ensures that the ExpressionVisitor by default throws AssertionErrors
@@ -92,3 +117,68 @@ def test_objects_as_expression(patch, tree):
     """
     with raises(NotImplementedError):
         ExpressionVisitor().as_expression(None, 0)
+
+
+def base_expression(value):
+    return Tree('base_expression', [entity(Tree('values', [value]))])
+
+
+def test_objects_collection():
+    """
+    Ensures ExpressionVisitor.collection finds list and map literals
+    """
+    literal = Tree('list', [])
+    assert ExpressionVisitor.collection(base_expression(literal)) == literal
+    string = Tree('string', ['a'])
+    assert ExpressionVisitor.collection(base_expression(string)) is None
+    assert ExpressionVisitor.collection(entity(literal)) is None
+    assert ExpressionVisitor.collection('a') is None
+
+
+class ListVisitor:
+
+    def base_expression(self, tree):
+        return 1
+
+    def list_items(self, tree):
+        items = []
+        for child in tree.children:
+            items.append((yield child))
+        return items
+
+
+def test_objects_literal():
+    """
+    Ensures ExpressionVisitor.literal compiles nested literals
+    """
+    visitor = ExpressionVisitor()
+    visitor.visitor = ListVisitor()
+    tree = Tree('list', [base_expression(Tree('list', ['a'])), 'b'])
+    assert visitor.literal(visitor.items(tree)) == [[1], 1]
+
+
+def test_objects_literal_deep():
+    """
+    Ensures ExpressionVisitor.literal compiles literals nested deeper than
+    the recursion limit
+    """
+    visitor = ExpressionVisitor()
+    visitor.visitor = ListVisitor()
+    tree = Tree('list', ['a'])
+    for i in range(5000):
+        tree = Tree('list', [base_expression(tree)])
+    result = visitor.literal(visitor.items(tree))
+    for i in range(5000):
+        result = result[0]
+    assert result == [1]
+
+
+def test_objects_items_map():
+    """
+    Ensures ExpressionVisitor.items uses map_items for maps
+    """
+    visitor = ExpressionVisitor()
+    visitor.visitor = ListVisitor()
+    visitor.visitor.map_items = lambda tree: tree
+    tree = Tree('map', [])
+    assert visitor.items(tree) == tree
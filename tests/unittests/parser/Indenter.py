@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from lark.lexer import Token
+
 from storyscript.parser.Indenter import CustomIndenter, Indenter
 
 
@@ -10,3 +12,15 @@ def test_indenter():
     assert CustomIndenter.INDENT_type == '_INDENT'
     assert CustomIndenter.DEDENT_type == '_DEDENT'
     assert CustomIndenter.tab_len == 8
+
+
+def test_indenter_process_tokens():
+    """
+    Ensures the tokens read from the lexer are counted
+    """
+    indenter = CustomIndenter()
+    stream = [Token('NAME', 'a'), Token('_NL', '\n    '), Token('NAME', 'b')]
+    list(indenter.process(iter(stream)))
+    assert indenter.tokens == 3
+    list(indenter.process(iter(stream[:1])))
+    assert indenter.tokens == 1
@@ -2,11 +2,13 @@
 import io
 
 from lark import Lark
+from lark.exceptions import UnexpectedInput
 
 from pytest import fixture
 
-from storyscript.parser import (CustomIndenter, Grammar, Parser, Transformer,
-                                Tree)
+from storyscript.Stats import Stats
+from storyscript.parser import (CustomIndenter, Grammar, Parser, ParserCache,
+                                Transformer, Tree)
 
 
 @fixture
@@ -15,7 +17,12 @@ def parser(magic, patch):
     parser = Parser()
     parser.algo = 'lalr'
     parser.ebnf = None
+    parser.cache = None
     parser.lark = magic()
+    parser.template_lark = None
+    parser.templates = {}
+    parser.template_parses = 0
+    parser.transformers = {}
     return parser
 
 
@@ -24,6 +31,10 @@ def test_parser_init(patch):
     parser = Parser()
     assert parser.algo == 'lalr'
     assert parser.ebnf is None
+    assert parser.template_lark is None
+    assert parser.templates == {}
+    assert parser.template_parses == 0
+    assert parser.transformers == {}
 
 
 def test_parser_init_algo(patch):
@@ -38,17 +49,50 @@ def test_parser_init_ebnf(patch):
     assert parser.ebnf == 'grammar.ebnf'
 
 
+def test_parser_init_cache(patch):
+    patch.object(Parser, '_lark')
+    patch.init(ParserCache)
+    parser = Parser()
+    assert isinstance(parser.cache, ParserCache)
+
+
+def test_parser_init_no_cache(patch):
+    patch.object(Parser, '_lark')
+    assert Parser(cache=False).cache is None
+
+
+def test_parser_init_cache_algo(patch):
+    """
+    Ensures only LALR tables are cached
+    """
+    patch.object(Parser, '_lark')
+    assert Parser(algo='earley').cache is None
+
+
 def test_parser_indenter(patch):
     patch.init(CustomIndenter)
     assert isinstance(Parser.indenter(), CustomIndenter)
 
 
-def test_parser_transfomer(patch):
+def test_parser_transfomer(patch, parser):
     patch.init(Transformer)
-    result = Parser.transformer(allow_single_quotes=False)
+    result = parser.transformer(allow_single_quotes=False)
+    Transformer.__init__.assert_called_with(allow_single_quotes=False,
+                                            in_place=True)
     assert isinstance(result, Transformer)
 
 
+def test_parser_transfomer_reuse(parser):
+    """
+    Ensures the parser creates one transformer for each flag
+    """
+    transformer = parser.transformer(allow_single_quotes=False)
+    assert parser.transformer(allow_single_quotes=False) is transformer
+    other = parser.transformer(allow_single_quotes=True)
+    assert other is not transformer
+    assert other.allow_single_quotes is True
+
+
 def test_parser_grammar(patch, parser):
     patch.init(Grammar)
     patch.object(Grammar, 'build')
@@ -72,8 +116,52 @@ def test_parser_lark(patch, parser):
     patch.init(Lark)
     patch.many(Parser, ['indenter', 'grammar'])
     result = parser._lark()
-    kwargs = {'parser': parser.algo, 'postlex': Parser.indenter()}
+    kwargs = {'parser': parser.algo, 'start': 'start',
+              'postlex': Parser.indenter()}
+    Lark.__init__.assert_called_with(parser.grammar(), **kwargs)
+    assert isinstance(result, Lark)
+
+
+def test_parser_lark_start(patch, parser):
+    patch.init(Lark)
+    patch.many(Parser, ['indenter', 'grammar'])
+    parser._lark(start='template')
+    kwargs = {'parser': parser.algo, 'start': 'template',
+              'postlex': Parser.indenter()}
+    Lark.__init__.assert_called_with(parser.grammar(), **kwargs)
+
+
+def test_parser_lark_cache_hit(patch, parser, magic):
+    """
+    Ensures Parser.lark uses the cached parser tables
+    """
+    patch.init(Lark)
+    patch.many(Parser, ['indenter', 'grammar'])
+    patch.object(ParserCache, 'key')
+    parser.cache = magic()
+    result = parser._lark()
+    ParserCache.key.assert_called_with(parser.grammar(), 'lalr', 'start')
+    parser.cache.load.assert_called_with(ParserCache.key(),
+                                         postlex=Parser.indenter())
+    assert Lark.__init__.call_count == 0
+    assert parser.cache.save.call_count == 0
+    assert result == parser.cache.load()
+
+
+def test_parser_lark_cache_miss(patch, parser, magic):
+    """
+    Ensures Parser.lark stores newly built parser tables
+    """
+    patch.init(Lark)
+    patch.many(Parser, ['indenter', 'grammar'])
+    patch.object(ParserCache, 'key')
+    parser.cache = magic()
+    parser.cache.load.return_value = None
+    result = parser._lark()
+    kwargs = {'parser': parser.algo, 'start': 'start',
+              'postlex': Parser.indenter()}
     Lark.__init__.assert_called_with(parser.grammar(), **kwargs)
+    parser.cache.save.assert_called_with(ParserCache.key(), result)
     assert isinstance(result, Lark)
 
 
@@ -88,6 +176,20 @@ def test_parser_parse(patch, parser):
     assert result == Parser.transformer().transform()
 
 
+def test_parser_parse_stats(patch, parser):
+    """
+    Ensures the parser records its time, tokens and nodes in the stats
+    """
+    patch.many(Parser, ['transformer'])
+    Parser.transformer().transform.return_value = Tree('start', [
+        Tree('block', [])])
+    parser.lark.options.postlex.tokens = 3
+    stats = Stats()
+    parser.parse('source', stats=stats)
+    assert list(stats.timings) == ['Parser', 'Transformer']
+    assert stats.counters == {'tokens': 3, 'nodes': 2}
+
+
 def test_parser_parse_empty(patch, parser, magic):
     """
     Ensures that empty stories are parsed correctly
@@ -95,6 +197,59 @@ def test_parser_parse_empty(patch, parser, magic):
     assert parser.parse('', allow_single_quotes=False) == Tree('empty', [])
 
 
+def test_parser_parse_template(patch, parser, magic):
+    """
+    Ensures template code is parsed with the template parser and memoized
+    """
+    patch.many(Parser, ['_lark', 'transformer'])
+    result = parser.parse_template('code', 2)
+    Parser._lark.assert_called_with(start='template')
+    Parser._lark().parse.assert_called_with('  code\n')
+    Parser.transformer.assert_called_with(allow_single_quotes=True)
+    tree = Parser.transformer().transform()
+    tree.clone.assert_called_with(0)
+    assert parser.templates == {'code': (2, tree)}
+    assert parser.template_parses == 1
+    assert result == tree.clone()
+
+
+def test_parser_parse_template_memo(patch, parser, magic):
+    patch.many(Parser, ['_lark', 'transformer'])
+    tree = magic()
+    parser.templates = {'code': (2, tree)}
+    result = parser.parse_template('code', 5)
+    assert Parser._lark.call_count == 0
+    assert parser.template_parses == 0
+    tree.clone.assert_called_with(3)
+    assert result == tree.clone()
+
+
+def test_parser_parse_template_invalid(patch, parser, magic):
+    """
+    Ensures invalid template code is memoized too
+    """
+    patch.many(Parser, ['_lark', 'transformer'])
+    error = UnexpectedInput()
+    Parser._lark().parse.side_effect = error
+    assert parser.parse_template('a = 1', 2) is None
+    assert parser.templates == {'a = 1': (2, None)}
+    assert parser.parse_template('a = 1', 2) is None
+    assert Parser._lark().parse.call_count == 1
+
+
+def test_parser_parse_template_memo_size(patch, parser):
+    patch.many(Parser, ['_lark', 'transformer'])
+    patch.object(Parser, 'template_memo_size', 2)
+    for code in ('a', 'b', 'c'):
+        parser.parse_template(code, 0)
+    assert list(parser.templates) == ['b', 'c']
+
+
+def test_parser_parse_template_ebnf(parser):
+    parser.ebnf = 'grammar.ebnf'
+    assert parser.parse_template('code', 0) is None
+
+
 def test_parser_lex(patch, parser):
     patch.many(Parser, ['indenter'])
     result = parser.lex('source')
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+
+from lark import Lark
+
+from pytest import fixture, raises
+
+from storyscript.parser import ParserCache
+
+
+grammar = 'start: NAME\nNAME: /[a-z]+/\n'
+
+
+@fixture
+def cache(tmpdir):
+    return ParserCache(directory=str(tmpdir))
+
+
+def test_parsercache_init(patch):
+    patch.object(ParserCache, 'default_directory')
+    assert ParserCache().directory == ParserCache.default_directory()
+
+
+def test_parsercache_init_directory():
+    assert ParserCache(directory='dir').directory == 'dir'
+
+
+def test_parsercache_default_directory_env(patch):
+    patch.dict(os.environ, {'STORYSCRIPT_CACHE_DIR': '/cache'})
+    assert ParserCache.default_directory() == '/cache'
+
+
+def test_parsercache_default_directory_xdg(patch):
+    patch.dict(os.environ, {'STORYSCRIPT_CACHE_DIR': '',
+                            'XDG_CACHE_HOME': '/xdg'})
+    assert ParserCache.default_directory() == '/xdg/storyscript'
+
+
+def test_parsercache_default_directory_home(patch):
+    patch.dict(os.environ, {'STORYSCRIPT_CACHE_DIR': '',
+                            'XDG_CACHE_HOME': ''})
+    patch.object(os.path, 'expanduser', return_value='/home')
+    assert ParserCache.default_directory() == '/home/.cache/storyscript'
+
+
+def test_parsercache_key():
+    assert ParserCache.key('a', 'lalr') == ParserCache.key('a', 'lalr')
+    assert ParserCache.key('a', 'lalr') != ParserCache.key('b', 'lalr')
+    assert ParserCache.key('a', 'lalr') != ParserCache.key('a', 'earley')
+    assert ParserCache.key('a', 'lalr') != ParserCache.key('a', 'lalr', 'b')
+
+
+def test_parsercache_path(cache):
+    path = os.path.join(cache.directory, 'parser', 'key.pickle')
+    assert cache.path('key') == path
+
+
+def test_parsercache_load_missing(cache):
+    assert cache.load('key', postlex=None) is None
+
+
+def test_parsercache_load_corrupted(cache):
+    os.makedirs(os.path.dirname(cache.path('key')))
+    with open(cache.path('key'), 'wb') as f:
+        f.write(b'corrupted')
+    assert cache.load('key', postlex=None) is None
+
+
+def test_parsercache_save_load(cache):
+    """
+    Ensures that a stored parser can be loaded and parses the same trees
+    """
+    lark = Lark(grammar, parser='lalr')
+    cache.save('key', lark)
+    result = cache.load('key', postlex=None)
+    assert result.parse('abc') == lark.parse('abc')
+    assert list(result.lex('abc')) == list(lark.lex('abc'))
+
+
+def test_parsercache_save_options(cache):
+    """
+    Ensures that runtime objects aren't stored
+    """
+    cache.save('key', Lark(grammar, parser='lalr'))
+    with open(cache.path('key'), 'rb') as f:
+        data, memo = pickle.load(f)
+    assert 'postlex' not in data['options']
+    assert 'transformer' not in data['options']
+
+
+def test_parsercache_save_unwritable(patch, cache):
+    patch.object(os, 'makedirs', side_effect=PermissionError())
+    cache.save('key', Lark(grammar, parser='lalr'))
+    assert cache.load('key', postlex=None) is None
+
+
+def test_parsercache_write(tmpdir):
+    path = str(tmpdir.join('entries', 'key'))
+    ParserCache.write(path, lambda f: f.write(b'data'))
+    with open(path, 'rb') as f:
+        assert f.read() == b'data'
+    assert tmpdir.join('entries').listdir() == [tmpdir.join('entries', 'key')]
+
+
+def test_parsercache_write_failed(tmpdir):
+    """
+    Ensures that a failed write neither replaces the entry nor leaves a
+    temporary file
+    """
+    path = str(tmpdir.join('key'))
+    ParserCache.write(path, lambda f: f.write(b'old'))
+
+    def dump(f):
+        f.write(b'new')
+        raise OSError()
+
+    ParserCache.write(path, dump)
+    with open(path, 'rb') as f:
+        assert f.read() == b'old'
+    assert tmpdir.listdir() == [tmpdir.join('key')]
+
+
+def test_parsercache_write_error(tmpdir):
+    """
+    Ensures that errors of dump are raised without leaving a temporary file
+    """
+    path = str(tmpdir.join('key'))
+
+    def dump(f):
+        f.write(b'new')
+        raise pickle.PicklingError()
+
+    with raises(pickle.PicklingError):
+        ParserCache.write(path, dump)
+    assert tmpdir.listdir() == []
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from lark import Transformer as LarkTransformer
+from lark.exceptions import VisitError
 from lark.lexer import Token
+from lark.tree import Tree as LarkTree
 
 from pytest import fixture, mark, raises
 
@@ -100,7 +102,7 @@ def test_transformer_service_block_indented_args(tree, magic, patch):
     block = magic()
     matches = [block, tree]
     result = Transformer.service_block(matches)
-    block.service_fragment.children.append.assert_called_with('argument')
+    block.service_fragment.append.assert_called_with('argument')
     assert result == Tree('service_block', [block])
 
 
@@ -145,12 +147,81 @@ def test_transformer_when_block_no_command(patch, tree):
 
 @mark.parametrize('rule', ['start', 'line', 'block', 'statement'])
 def test_transformer_rules(rule):
-    result = getattr(Transformer(), rule)(['matches'])
+    result = Transformer()._call_userfunc(LarkTree(rule, ['matches']))
     assert isinstance(result, Tree)
     assert result.data == rule
     assert result.children == ['matches']
 
 
+def test_transformer_init_in_place():
+    assert Transformer().in_place is False
+    assert Transformer(in_place=True).in_place is True
+
+
+@mark.parametrize('rule', ['start', 'line', 'block', 'statement'])
+def test_transformer_rules_in_place(rule):
+    tree = LarkTree(rule, ['matches'])
+    result = Transformer(in_place=True)._call_userfunc(tree)
+    assert result is tree
+    assert isinstance(result, Tree)
+    assert result.data == rule
+    assert result.children == ['matches']
+
+
+def test_transformer_relabel():
+    children = [Token('NAME', 'a')]
+    tree = LarkTree('line', [])
+    result = Transformer.relabel(tree, children)
+    assert result is tree
+    assert type(result) is Tree
+    assert result.data == 'line'
+    assert result.children is children
+
+
+def test_transformer_transform_in_place():
+    """
+    Ensures trees without transformation are kept and the others are
+    replaced
+    """
+    name = Token('NAME', 'a')
+    path = LarkTree('path', [name])
+    block = LarkTree('block', [path])
+    tree = LarkTree('start', [block])
+    result = Transformer(in_place=True).transform(tree)
+    assert result is tree
+    assert result.child(0) is block
+    assert result == Tree('start', [Tree('block', [Tree('path', [name])])])
+
+
+def test_transformer_transform_copy():
+    tree = LarkTree('start', [LarkTree('block', [])])
+    result = Transformer().transform(tree)
+    assert result is not tree
+    assert type(tree) is LarkTree
+    assert result == Tree('start', [Tree('block', [])])
+
+
+def test_transformer_call_userfunc(patch):
+    patch.object(Transformer, 'path')
+    tree = Tree('path', [])
+    transformer = Transformer()
+    result = transformer._call_userfunc(tree, new_children=['matches'])
+    Transformer.path.assert_called_with(['matches'])
+    assert result == Transformer.path()
+
+
+def test_transformer_call_userfunc_unknown():
+    tree = Tree('line', ['matches'])
+    assert Transformer()._call_userfunc(tree) == Tree('line', ['matches'])
+
+
+def test_transformer_call_userfunc_error(patch):
+    patch.object(Transformer, 'path', side_effect=ValueError())
+    with raises(VisitError) as e:
+        Transformer()._call_userfunc(Tree('path', []))
+    assert isinstance(e.value.orig_exc, ValueError)
+
+
 def test_transformer_absolute_expression(patch, tree):
     """
     Ensures absolute_expression are untouched when they don't contain
@@ -202,7 +273,7 @@ def test_transformer_function_block(patch, tree, magic):
     m.find_data.return_value = ['.indented.node.']
     r = Transformer.function_block([function_block, m, block])
     m.find_data.assert_called_with('typed_argument')
-    function_block.children.append.assert_called_with('.indented.node.')
+    function_block.append.assert_called_with('.indented.node.')
     assert r.data == 'function_block'
     assert r.children == [
         function_block,
@@ -41,6 +41,111 @@ def test_tree_walk_token():
     assert result == inner_tree
 
 
+def test_tree_walk_missing():
+    tree = Tree('rule', [Token('test', 'test')])
+    assert Tree.walk(tree, 'inner') is None
+
+
+def test_tree_walk_first():
+    """
+    Ensures that the first child with a matching name is found
+    """
+    first = Tree('inner', ['first'])
+    tree = Tree('rule', [first, Tree('inner', ['second'])])
+    assert Tree.walk(tree, 'inner') is first
+
+
+def test_tree_traverse():
+    """
+    Ensures Tree.traverse calls enter before and exit after the children
+    """
+    inner = Tree('inner', [Token('X', 'x')])
+    tree = Tree('outer', [Token('Y', 'y'), inner, Tree('empty', [])])
+    calls = []
+    Tree.traverse(tree, enter=lambda t: calls.append(('enter', t.data)),
+                  exit=lambda t: calls.append(('exit', t.data)))
+    assert calls == [('enter', 'outer'), ('enter', 'inner'),
+                     ('exit', 'inner'), ('enter', 'empty'), ('exit', 'empty'),
+                     ('exit', 'outer')]
+
+
+def test_tree_traverse_skip():
+    """
+    Ensures the children and exit of a tree are skipped if enter returns
+    False
+    """
+    inner = Tree('inner', [Tree('skipped', [])])
+    tree = Tree('outer', [inner])
+    calls = []
+
+    def enter(t):
+        calls.append(('enter', t.data))
+        return t.data != 'inner'
+
+    Tree.traverse(tree, enter=enter,
+                  exit=lambda t: calls.append(('exit', t.data)))
+    assert calls == [('enter', 'outer'), ('enter', 'inner'),
+                     ('exit', 'outer')]
+
+
+def test_tree_traverse_replace():
+    """
+    Ensures a tree is replaced by the result of exit
+    """
+    tree = Tree('outer', [Tree('inner', []), Token('X', 'x')])
+
+    def exit(t):
+        if t.data == 'inner':
+            return Token('Y', 'y')
+
+    assert Tree.traverse(tree, exit=exit) is tree
+    assert tree.children == [Token('Y', 'y'), Token('X', 'x')]
+    assert Tree.traverse(tree, exit=lambda t: 'new') == 'new'
+
+
+def test_tree_traverse_replace_lookup():
+    """
+    Ensures replaced trees are found by their new names only
+    """
+    inner = Token('X', 'x', line=1, column=2)
+    inner.end_column = 3
+    tree = Tree('outer', [Tree('old', [inner])])
+    assert tree.old is not None
+    assert tree.position().column == '2'
+    token = Token('Y', 'y', line=1, column=5)
+    token.end_column = 6
+
+    def exit(t):
+        if t.data == 'old':
+            return Tree('new', [token])
+
+    Tree.traverse(tree, exit=exit)
+    assert tree.old is None
+    assert tree.new.children == [token]
+    assert tree.find_first_token() is token
+    assert tree.position().column == '5'
+
+
+def test_tree_traverse_lark():
+    tree = LarkTree('outer', [LarkTree('inner', [])])
+    calls = []
+    Tree.traverse(tree, enter=lambda t: calls.append(t.data))
+    assert calls == ['outer', 'inner']
+
+
+def test_tree_traverse_deep():
+    """
+    Ensures Tree.traverse visits trees deeper than the recursion limit
+    """
+    tree = Tree('leaf', [])
+    for i in range(5000):
+        tree = Tree('node', [tree])
+    calls = []
+    Tree.traverse(tree, exit=lambda t: calls.append(t.data))
+    assert len(calls) == 5001
+    assert calls[0] == 'leaf'
+
+
 def test_tree_node(patch):
     patch.object(Tree, 'walk')
     tree = Tree('rule', [])
@@ -131,6 +236,12 @@ def test_tree_insert():
     assert tree.children == ['child']
 
 
+def test_tree_append():
+    tree = Tree('tree', ['first'])
+    tree.append('child')
+    assert tree.children == ['first', 'child']
+
+
 def test_tree_rename():
     """
     Ensures Tree.rename can rename the current tree
@@ -146,6 +257,35 @@ def test_tree_replace():
     assert tree.children == ['new']
 
 
+def test_tree_clone():
+    token = Token('NAME', 'a', 5, 1, 6, 1, 7)
+    token.value = 'b'
+    inner = Tree('inner', [token])
+    tree = Tree('tree', [inner])
+    tree.kind = 'kind'
+    result = tree.clone(column=2)
+    assert result == tree
+    assert result.kind == 'kind'
+    assert result.inner is not inner
+    clone = result.inner.child(0)
+    assert clone is not token
+    assert (clone.pos_in_stream, clone.column, clone.end_column) == (7, 8, 9)
+    assert (str(clone), clone.value) == ('a', 'b')
+
+
+def test_tree_clone_created_token():
+    """
+    Ensures tokens from create_token are moved, although they have string
+    columns and no position in the stream
+    """
+    token = Token('NAME', 'a', 5, 1, 6, 1, 7)
+    created = Tree('tree', [token]).create_token('FLOAT_MUT', 1.0)
+    clone = Tree('tree', [created]).clone(column=2).child(0)
+    assert (clone.pos_in_stream, clone.column, clone.end_column) == \
+        (None, 8, 9)
+    assert clone.value == 1.0
+
+
 def test_tree_extract_path():
     tree = Tree('path', [Token('NAME', 'one')])
     assert tree.extract_path() == 'one'
@@ -215,6 +355,55 @@ def test_tree_find_first_token_none():
     assert tree.find_first_token() is None
 
 
+def test_tree_find_first_token_reverse():
+    """
+    Ensures Tree.find_first_token finds the first token of the last child
+    """
+    t1 = Token('X1', 'x1')
+    t2 = Token('X2', 'x2')
+    t3 = Token('X3', 'x3')
+    tree = Tree('start', [t1, Tree('line', [t2, t3]), Tree('empty', [])])
+    assert tree.find_first_token(reverse=True) == t2
+
+
+def test_tree_find_first_token_deep():
+    """
+    Ensures Tree.find_first_token finds tokens deeper than the recursion
+    limit
+    """
+    token = Token('X', 'x')
+    tree = Tree('expression', [token])
+    for i in range(5000):
+        tree = Tree('expression', [tree, Token('PLUS', '+')])
+    assert tree.find_first_token() == token
+    tree = Tree('start', [Token('Y', 'y'), tree])
+    assert tree.find_first_token(reverse=True) == token
+
+
+def test_tree_position():
+    t1 = Token('X1', 'x1', line=1, column=2)
+    t2 = Token('X2', 'x2', line=1, column=4)
+    t2.end_column = 6
+    tree = Tree('start', [t1, Tree('line', [t2])])
+    position = tree.position()
+    assert (position.line, position.column, position.end_column) == \
+        ('1', '2', '6')
+
+
+def test_tree_position_empty():
+    position = Tree('start', []).position()
+    assert (position.line, position.column, position.end_column) == \
+        (None, None, None)
+
+
+def test_tree_create_token():
+    token = Token('X', 'x', line=1, column=2)
+    token.end_column = 3
+    new = Tree('start', [Tree('line', [token])]).create_token('Y', 'y')
+    assert (new.type, new.value) == ('Y', 'y')
+    assert (new.line, new.column, new.end_column) == ('1', '2', '3')
+
+
 def test_tree_extract():
     target = Tree('target', [])
     tree = Tree('tree', [target, Tree('more', [target])])
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from storyscript.parser import TreeVisitor
+
+
+class Visitor(TreeVisitor):
+
+    def node(self, tree):
+        return tree
+
+
+def test_treevisitor_handler():
+    visitor = Visitor()
+    assert visitor.handler('node') == visitor.node
+
+
+def test_treevisitor_handler_unknown():
+    assert Visitor().handler('unknown') is None
+
+
+def test_treevisitor_handler_table(patch):
+    """
+    Ensures that handlers are looked up once per visitor
+    """
+    visitor = Visitor()
+    handler = visitor.handler('node')
+    patch.object(Visitor, 'node')
+    assert visitor.handler('node') == handler
+    assert Visitor().handler('node') == Visitor.node